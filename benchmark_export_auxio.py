@@ -0,0 +1,132 @@
+"""Benchmark the Auxio export: serial vs parallel copy-and-tag, plus a no-op sync.
+
+Builds a synthetic library (`--tracks` MP3 files of `--track-kib` KiB spread
+over `--playlists` playlists) in a scratch directory and exports it once per
+mode into a fresh output directory:
+- `serial`: one worker;
+- `parallel`: `--workers` threads;
+- `sync`: a second `--sync`-style pass over the parallel export (nothing to do).
+Serial and parallel exports must produce the same files; a mismatch exits
+with status 1. Pass `--workdir` on the export target's filesystem to include
+reflink (`FICLONE`) behaviour in the numbers.
+
+Usage:
+    uv run benchmark_export_auxio.py [--tracks 5000] [--workers 4] [--workdir /mnt/phone-sync]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import export_auxio
+from tests.helpers import MP3_FRAME, write_tagged_mp3
+
+DEFAULT_TRACK_COUNT = 5000
+DEFAULT_TRACK_KIB = 32
+DEFAULT_PLAYLIST_COUNT = 25
+
+
+def build_synthetic_library(
+    music_root: Path, track_count: int, track_kib: int, playlist_count: int
+) -> tuple[list[dict[str, object]], OrderedDict[str, list[str]]]:
+    """Write tagged MP3s and return `(tracks, playlists)` as `fetch_playlist_export_data` does."""
+    frames = max(1, track_kib * 1024 // len(MP3_FRAME))
+    tracks: list[dict[str, object]] = []
+    playlists: OrderedDict[str, list[str]] = OrderedDict(
+        (f"Playlist {index:02d}", []) for index in range(playlist_count)
+    )
+    for index in range(track_count):
+        track_id = f"track-{index:05d}"
+        relative = f"{index % 100:02d}/{track_id}.mp3"
+        write_tagged_mp3(music_root / relative, title=f"Original {index}", frames=frames)
+        tracks.append({"track_id": track_id, "filepath": relative, "title": f"Song {index}"})
+        # Most tracks sit on one playlist, every seventh on a second one.
+        playlists[f"Playlist {index % playlist_count:02d}"].append(track_id)
+        if index % 7 == 0:
+            playlists[f"Playlist {(index + 3) % playlist_count:02d}"].append(track_id)
+    return tracks, playlists
+
+
+def run_export(
+    tracks: list[dict[str, object]],
+    playlists: OrderedDict[str, list[str]],
+    music_root: Path,
+    output_dir: Path,
+    workers: int,
+    manifest: dict[str, dict[str, object]] | None = None,
+) -> tuple[float, dict[str, dict[str, object]]]:
+    manifest = manifest if manifest is not None else {"tracks": {}, "playlists": {}}
+    tracks_dir, playlists_dir = export_auxio.prepare_output_dirs(output_dir, sync=True)
+    started = time.perf_counter()
+    export_auxio.export_tracks(tracks, tracks_dir, music_root, manifest["tracks"], workers)
+    export_auxio.export_playlists(playlists, playlists_dir, manifest["playlists"])
+    return time.perf_counter() - started, manifest
+
+
+def exported_files(output_dir: Path) -> dict[str, int]:
+    return {
+        str(path.relative_to(output_dir)): path.stat().st_size
+        for path in sorted(output_dir.rglob("*"))
+        if path.is_file()
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=DEFAULT_TRACK_COUNT)
+    parser.add_argument("--track-kib", type=int, default=DEFAULT_TRACK_KIB)
+    parser.add_argument("--playlists", type=int, default=DEFAULT_PLAYLIST_COUNT)
+    parser.add_argument("--workers", type=int, default=export_auxio.DEFAULT_EXPORT_WORKERS)
+    parser.add_argument("--workdir", type=Path, default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as scratch:
+        scratch_root = Path(scratch)
+        music_root = scratch_root / "music"
+        output_dir = scratch_root / "export_music"
+        tracks, playlists = build_synthetic_library(
+            music_root, args.tracks, args.track_kib, args.playlists
+        )
+
+        serial_seconds, _ = run_export(tracks, playlists, music_root, output_dir, 1)
+        serial_files = exported_files(output_dir)
+        shutil.rmtree(output_dir)
+
+        parallel_seconds, manifest = run_export(
+            tracks, playlists, music_root, output_dir, args.workers
+        )
+        parallel_files = exported_files(output_dir)
+        sync_seconds, _ = run_export(
+            tracks, playlists, music_root, output_dir, args.workers, manifest
+        )
+
+    report = {
+        "serial": {"workers": 1, "seconds": serial_seconds},
+        "parallel": {"workers": args.workers, "seconds": parallel_seconds},
+        "sync": {"workers": args.workers, "seconds": sync_seconds},
+    }
+    header = f"{'mode':<10} {'workers':>8} {'seconds':>10} {'tracks/s':>10}"
+    print(f"{args.tracks} tracks x {args.track_kib} KiB, {args.playlists} playlists")
+    print(header)
+    print("-" * len(header))
+    for mode, numbers in report.items():
+        rate = args.tracks / numbers["seconds"] if numbers["seconds"] else float("inf")
+        print(f"{mode:<10} {numbers['workers']:>8} {numbers['seconds']:>10.3f} {rate:>10.0f}")
+
+    mismatch = serial_files != parallel_files
+    if mismatch:
+        print("MISMATCH: serial and parallel exports produced different files")
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 1 if mismatch else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
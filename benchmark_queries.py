@@ -0,0 +1,390 @@
+"""Benchmark and explain the hot SQL of the repository layer and export scripts.
+
+Seeds a synthetic database (100k tracks by default), runs every repository
+query in `dekho/db.py` plus the export script queries, and prints timings and
+`EXPLAIN QUERY PLAN` output. `tests/test_query_plans.py` reuses the seeding and
+plan checks to guard the indexes these queries rely on.
+
+Usage:
+    uv run benchmark_queries.py [--tracks 100000] [--repeat 5] [--output timings.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import dekho.db as db
+import export_auxio
+import export_db
+from dekho.db_schema import CHANGE_TRACKED_TABLES
+
+SYNTHETIC_TRACK_COUNT = 100_000
+DEFAULT_REPEAT = 5
+# Tables that grow with the library; a plain SCAN of these is a regression.
+LARGE_TABLES = frozenset(
+    {
+        "tracks_file_data",
+        "track_user_data",
+        "track_remote_data",
+        "track_user_data_labels",
+        "track_audio_paths",
+        "track_artifacts",
+        "track_events",
+        "remote_page_cache",
+        "row_changes",
+    }
+)
+_TABLE_ALIAS_PATTERN = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+AS\s+(\w+))?", re.IGNORECASE)
+_SCAN_PATTERN = re.compile(r"^SCAN (\w+)")
+_EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+@dataclass(frozen=True)
+class QueryCall:
+    """One repository call; its SQL is captured through the statement observer."""
+
+    name: str
+    run: Callable[[], object]
+    # Reads every row by design (list page, table dump): SCAN is expected.
+    full_read: bool = False
+    # Sorts a small, bounded row set (one track's labels, offending rows).
+    allow_temp_btree: bool = False
+
+
+@dataclass
+class CapturedStatement:
+    sql: str
+    parameters: object
+    elapsed: float
+    plan: list[str] = field(default_factory=list)
+
+
+def seed_synthetic_db(db_path: Path, track_count: int = SYNTHETIC_TRACK_COUNT) -> list[str]:
+    """Create a DB with `track_count` tracks, user/remote data and labels; return track IDs."""
+    original_db_path = db.DB_PATH
+    db.DB_PATH = db_path
+    try:
+        db.init_db()
+    finally:
+        db.DB_PATH = original_db_path
+
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    track_ids = [f"{index:08x}-0000-4000-8000-synthetic" for index in range(track_count)]
+    connection = sqlite3.connect(db_path)
+    try:
+        label_ids = [row[0] for row in connection.execute("SELECT id FROM label_definitions")]
+        with connection:
+            connection.executemany(
+                """
+                INSERT INTO tracks_file_data (
+                    track_id, filepath, title, artist, duration, url, date_created, date_added
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    (
+                        track_id,
+                        f"{index % 512:03d}/Track {index}.mp3",
+                        f"Track {index}",
+                        "Synthetic",
+                        120.0 + index % 240,
+                        f"https://suno.com/song/{track_id}",
+                        (start + timedelta(minutes=index * 7 % 525_600)).isoformat(),
+                        start.isoformat(),
+                    )
+                    for index, track_id in enumerate(track_ids)
+                ),
+            )
+            connection.executemany(
+                """
+                INSERT INTO track_user_data (track_id, title_new, notes, remix_of)
+                VALUES (?, ?, ?, '')
+                """,
+                (
+                    (track_id, f"Renamed {index}", "synthetic notes")
+                    for index, track_id in enumerate(track_ids)
+                    if index % 2 == 0
+                ),
+            )
+            connection.executemany(
+                """
+                INSERT INTO track_remote_data (track_id, prompt, tags, has_cover_clip_id)
+                VALUES (?, ?, ?, 0)
+                """,
+                (
+                    (track_id, "synthetic prompt", "synthwave, retro")
+                    for index, track_id in enumerate(track_ids)
+                    if index % 10 < 7
+                ),
+            )
+            connection.executemany(
+                """
+                INSERT INTO track_user_data_labels (track_id, label_id)
+                VALUES (?, ?)
+                """,
+                (
+                    (track_id, label_ids[(index + offset * 7) % len(label_ids)])
+                    for index, track_id in enumerate(track_ids)
+                    if index % 2 == 0
+                    for offset in range(index % 4)
+                ),
+            )
+            connection.executemany(
+                """
+                INSERT INTO track_audio_paths (track_id, path, size, mtime_ns)
+                VALUES (?, ?, 4000000, 0)
+                """,
+                ((track_id, f"/music/{track_id}.mp3") for track_id in track_ids),
+            )
+    finally:
+        connection.close()
+    return track_ids
+
+
+def build_query_calls(track_id: str) -> list[QueryCall]:
+    """Every repository query in `dekho/db.py` plus the export script queries."""
+
+    def run_export_auxio_query() -> object:
+        with db.get_connection() as connection:
+            return export_auxio.fetch_playlist_export_data(connection)
+
+    def run_export_db(table_name: str, **filters: object) -> Callable[[], object]:
+        def run() -> object:
+            with db.get_connection() as connection:
+                return export_db._select_rows(connection, table_name, **filters).fetchall()
+
+        return run
+
+    def run_export_db_tables() -> object:
+        with db.get_connection() as connection:
+            return export_db._get_user_tables(connection)
+
+    # A delta export watermark a hundred changes behind the head of the log.
+    watermark = max(db.get_row_change_bounds()[1] - 100, 0)
+    export_db_calls = [
+        # Sorts the schema's table names, not library rows.
+        QueryCall("export_db._get_user_tables", run_export_db_tables, allow_temp_btree=True),
+        QueryCall(
+            "export_db.full:tracks_file_data", run_export_db("tracks_file_data"), full_read=True
+        ),
+        *(
+            QueryCall(f"export_db.since:{table}", run_export_db(table, since="2026-01-01"))
+            for table in (*CHANGE_TRACKED_TABLES, *export_db.SINCE_COLUMNS)
+        ),
+        *(
+            QueryCall(f"export_db.delta:{table}", run_export_db(table, after_seq=watermark))
+            for table in (*CHANGE_TRACKED_TABLES, export_db.CHANGE_LOG_TABLE)
+        ),
+    ]
+
+    return [
+        QueryCall("get_all_tracks_file_data", db.get_all_tracks_file_data, full_read=True),
+        QueryCall("get_track_details", lambda: db.get_track_details(track_id), allow_temp_btree=True),
+        QueryCall(
+            "get_tracks_details",
+            lambda: db.get_tracks_details([track_id, "missing-track"]),
+            allow_temp_btree=True,
+        ),
+        QueryCall("get_track_remote_data", lambda: db.get_track_remote_data(track_id)),
+        QueryCall(
+            "get_tracks_missing_remote_data", db.get_tracks_missing_remote_data, full_read=True
+        ),
+        QueryCall(
+            "upsert_remote_page_cache_entry",
+            lambda: db.upsert_remote_page_cache_entry(
+                "https://suno.com/song/0", "hash", 1024, "2024-01-01T00:00:00+00:00"
+            ),
+        ),
+        QueryCall(
+            "touch_remote_page_cache_entry",
+            lambda: db.touch_remote_page_cache_entry(
+                "https://suno.com/song/0", "2024-01-02T00:00:00+00:00"
+            ),
+        ),
+        QueryCall(
+            "get_remote_page_cache_entry",
+            lambda: db.get_remote_page_cache_entry("https://suno.com/song/0"),
+        ),
+        QueryCall(
+            "get_tracks_with_cached_remote_pages",
+            db.get_tracks_with_cached_remote_pages,
+            full_read=True,
+        ),
+        QueryCall(
+            "get_remote_data_refresh_candidates",
+            lambda: db.get_remote_data_refresh_candidates(datetime.now(UTC).isoformat(), 100),
+        ),
+        QueryCall(
+            "record_remote_data_failures",
+            lambda: db.record_remote_data_failures([(track_id, "HTTP Error 503")]),
+        ),
+        QueryCall(
+            "try_acquire_job_lease",
+            lambda: db.try_acquire_job_lease("benchmark", "owner", 60),
+        ),
+        QueryCall("get_track_label_keys", lambda: db.get_track_label_keys(track_id), allow_temp_btree=True),
+        QueryCall("get_track_audio_path", lambda: db.get_track_audio_path(track_id)),
+        QueryCall(
+            "get_unknown_label_assignments",
+            db.get_unknown_label_assignments,
+            allow_temp_btree=True,
+        ),
+        QueryCall(
+            "upsert_track",
+            lambda: db.upsert_track(track_id=track_id, filepath="000/Track 0.mp3", title="Track 0"),
+        ),
+        QueryCall(
+            "upsert_track_user_data",
+            lambda: db.upsert_track_user_data(
+                track_id, "Renamed 0", "notes", labels=["playlist.rock", "like.like1"]
+            ),
+        ),
+        QueryCall(
+            "upsert_track_remote_data",
+            lambda: db.upsert_track_remote_data(
+                track_id, "prompt", "tags", None, False, "v4", "chirp", None
+            ),
+        ),
+        QueryCall(
+            "upsert_track_audio_path",
+            lambda: db.upsert_track_audio_path(track_id, Path("/music/a.mp3"), 1, 0),
+        ),
+        QueryCall("delete_track_audio_paths", lambda: db.delete_track_audio_paths([track_id])),
+        QueryCall(
+            "upsert_track_artifact",
+            lambda: db.upsert_track_artifact(track_id, db.ARTIFACT_TYPE_IMAGE, 1024, "hash", 1),
+        ),
+        QueryCall(
+            "get_track_artifact",
+            lambda: db.get_track_artifact(track_id, db.ARTIFACT_TYPE_IMAGE),
+        ),
+        QueryCall(
+            "record_track_event",
+            lambda: db.record_track_event(db.TRACK_EVENT_UPSERTED, track_id),
+        ),
+        QueryCall("get_track_events_after", lambda: db.get_track_events_after(0, 200)),
+        QueryCall("get_track_event_bounds", db.get_track_event_bounds),
+        QueryCall("get_row_changes_after", lambda: db.get_row_changes_after(0, 500)),
+        QueryCall("get_row_change_bounds", db.get_row_change_bounds),
+        QueryCall("get_changed_track_ids_after", lambda: db.get_changed_track_ids_after(0)),
+        QueryCall(
+            "export_auxio.fetch_playlist_export_data",
+            run_export_auxio_query,
+            allow_temp_btree=True,
+        ),
+        *export_db_calls,
+    ]
+
+
+def explain_query_plan(connection: sqlite3.Connection, sql: str, parameters: object) -> list[str]:
+    rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters or ()).fetchall()
+    return [str(row[3]) for row in rows]
+
+
+def capture_statements(call: QueryCall) -> list[CapturedStatement]:
+    """Run `call` and return its explainable statements with plans.
+
+    Schema setup from `init_db()` (DDL, PRAGMA, label seeding batches) is skipped.
+    """
+    captured: list[CapturedStatement] = []
+
+    def observe(sql: str, parameters: object, elapsed: float) -> None:
+        if sql.lstrip().upper().startswith(_EXPLAINABLE_PREFIXES) and parameters is not None:
+            captured.append(CapturedStatement(sql, parameters, elapsed))
+
+    db.add_statement_observer(observe)
+    try:
+        call.run()
+    finally:
+        db.remove_statement_observer(observe)
+
+    connection = sqlite3.connect(db.DB_PATH)
+    try:
+        for statement in captured:
+            statement.plan = explain_query_plan(connection, statement.sql, statement.parameters)
+    finally:
+        connection.close()
+    return captured
+
+
+def find_plan_problems(call: QueryCall, statement: CapturedStatement) -> list[str]:
+    aliases = {
+        (alias or table): table for table, alias in _TABLE_ALIAS_PATTERN.findall(statement.sql)
+    }
+    problems = []
+    for detail in statement.plan:
+        scan = _SCAN_PATTERN.match(detail)
+        if scan and not call.full_read and aliases.get(scan.group(1), scan.group(1)) in LARGE_TABLES:
+            problems.append(f"{call.name}: full scan of a large table: {detail}")
+        if "USE TEMP B-TREE" in detail and not call.allow_temp_btree:
+            problems.append(f"{call.name}: sort without an index: {detail}")
+    return problems
+
+
+def benchmark(call: QueryCall, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        call.run()
+        timings.append(time.perf_counter() - started_at)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=SYNTHETIC_TRACK_COUNT)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", type=Path, help="Write timings and plans as JSON.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        db.DB_PATH = Path(tempdir) / "benchmark.sqlite3"
+        started_at = time.perf_counter()
+        track_ids = seed_synthetic_db(db.DB_PATH, args.tracks)
+        print(f"Seeded {args.tracks:,} tracks in {time.perf_counter() - started_at:.2f}s")
+
+        results = []
+        for call in build_query_calls(track_ids[0]):
+            statements = capture_statements(call)
+            timings = benchmark(call, args.repeat)
+            problems = [
+                problem for statement in statements for problem in find_plan_problems(call, statement)
+            ]
+            median_ms = statistics.median(timings) * 1000
+            print(f"\n{call.name}: median {median_ms:.2f} ms over {args.repeat} runs")
+            for statement in statements:
+                print(f"  {' '.join(statement.sql.split())[:100]}")
+                for detail in statement.plan:
+                    print(f"    {detail}")
+            for problem in problems:
+                print(f"  PROBLEM {problem}")
+            results.append(
+                {
+                    "name": call.name,
+                    "median_ms": median_ms,
+                    "timings_ms": [timing * 1000 for timing in timings],
+                    "plans": [
+                        {"sql": " ".join(statement.sql.split()), "plan": statement.plan}
+                        for statement in statements
+                    ],
+                    "problems": problems,
+                }
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps({"tracks": args.tracks, "queries": results}, indent=2))
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
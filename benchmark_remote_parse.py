@@ -0,0 +1,141 @@
+"""Benchmark Suno page parsing: whole-page baseline vs streaming with early stop.
+
+Parses each page from gzip bytes (as stored by `dekho/page_cache.py`) in three
+modes and reports median CPU time and tracemalloc peak per mode:
+- `baseline`: decompress the whole page, `json.loads` every payload, no early
+  stop (the parser before streaming);
+- `prefilter`: whole page, payloads without signal keys skipped;
+- `streaming`: decompress in chunks, prefilter, stop once the result is final.
+All modes must return identical metadata; a mismatch exits with status 1.
+
+Pages default to saved fixtures (`tests/testdata/*.html`), then cached pages
+(`remote_pages/**/*.html.gz`), then a synthetic Flight page.
+
+Usage:
+    uv run benchmark_remote_parse.py [PAGE ...] [--repeat 20] [--output parse_timings.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import json
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from unittest import mock
+
+import dekho.remote_metadata as rm
+from dekho.page_cache import PAGE_CACHE_ROOT, STREAM_CHUNK_CHARS
+from tests.helpers import build_synthetic_page
+
+REPO_ROOT = Path(__file__).resolve().parent
+FIXTURE_ROOT = REPO_ROOT / "tests" / "testdata"
+DEFAULT_REPEAT = 20
+
+
+def load_pages(paths: list[Path]) -> dict[str, bytes]:
+    """Return `{name: gzip bytes}` for the given pages or the default page set."""
+    if not paths:
+        paths = sorted(FIXTURE_ROOT.glob("*.html")) + sorted(PAGE_CACHE_ROOT.glob("*/*.html.gz"))
+    if not paths:
+        return {"synthetic": gzip.compress(build_synthetic_page().encode())}
+    pages = {}
+    for path in paths:
+        data = path.read_bytes()
+        pages[path.name] = data if path.suffix == ".gz" else gzip.compress(data)
+    return pages
+
+
+def _parse_whole(compressed: bytes) -> dict[str, object]:
+    html = gzip.decompress(compressed).decode("utf-8", errors="replace")
+    parser = rm.FlightPageParser(stop_early=False)
+    parser.feed(html)
+    return parser.result()
+
+
+def parse_baseline(compressed: bytes) -> dict[str, object]:
+    # An empty token is in every payload, so nothing is skipped before json.loads.
+    with mock.patch.object(rm, "SIGNAL_KEY_TOKENS", ("",)):
+        return _parse_whole(compressed)
+
+
+def parse_prefilter(compressed: bytes) -> dict[str, object]:
+    return _parse_whole(compressed)
+
+
+def parse_streaming(compressed: bytes) -> dict[str, object]:
+    with gzip.open(io.BytesIO(compressed), "rt", encoding="utf-8", errors="replace") as stream:
+        return rm.parse_suno_track_chunks(iter(lambda: stream.read(STREAM_CHUNK_CHARS), ""))
+
+
+MODES: dict[str, Callable[[bytes], dict[str, object]]] = {
+    "baseline": parse_baseline,
+    "prefilter": parse_prefilter,
+    "streaming": parse_streaming,
+}
+
+
+def _outcome(parse: Callable[[bytes], dict[str, object]], compressed: bytes) -> object:
+    try:
+        return parse(compressed)
+    except ValueError as error:
+        return f"ValueError: {error}"
+
+
+def measure(compressed: bytes, repeat: int) -> dict[str, dict[str, float]]:
+    results = {}
+    for mode, parse in MODES.items():
+        cpu_ms = []
+        for _ in range(repeat):
+            start = time.process_time()
+            _outcome(parse, compressed)
+            cpu_ms.append((time.process_time() - start) * 1000)
+        tracemalloc.start()
+        _outcome(parse, compressed)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[mode] = {
+            "cpu_ms": round(statistics.median(cpu_ms), 3),
+            "peak_kib": round(peak_bytes / 1024, 1),
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    report = {}
+    mismatches = []
+    for name, compressed in load_pages(args.pages).items():
+        outcomes = {mode: _outcome(parse, compressed) for mode, parse in MODES.items()}
+        if any(outcome != outcomes["baseline"] for outcome in outcomes.values()):
+            mismatches.append(name)
+        report[name] = measure(compressed, args.repeat)
+
+    header = f"{'page':<40} {'mode':<10} {'cpu ms':>10} {'peak KiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, modes in report.items():
+        for mode, numbers in modes.items():
+            print(
+                f"{name[:40]:<40} {mode:<10}"
+                f" {numbers['cpu_ms']:>10.3f} {numbers['peak_kib']:>10.1f}"
+            )
+    for name in mismatches:
+        print(f"MISMATCH: {name}: modes returned different metadata")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
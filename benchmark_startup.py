@@ -0,0 +1,110 @@
+"""Measure app startup import time with `python -X importtime`.
+
+Imports `dekho.app` (or `--module`) in fresh interpreters, reports the median
+cumulative import time and the slowest imported modules, and flags heavy
+modules (scan, spectrogram and analysis stacks) that must stay lazy.
+`tests/test_startup_imports.py` reuses the measurement to guard startup.
+
+Usage:
+    uv run benchmark_startup.py [--module dekho.app] [--repeat 5] [--top 15] [--budget-ms 600]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+DEFAULT_MODULE = "dekho.app"
+DEFAULT_REPEAT = 5
+DEFAULT_TOP = 15
+# About twice the measured startup once the heavy stacks became lazy.
+STARTUP_IMPORT_BUDGET_MS = 600.0
+# Loaded on first scan or first spectrogram, never at app startup.
+LAZY_MODULES = ("dekho.scan", "dekho.spectrograms", "matplotlib", "numpy", "mutagen")
+_IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure_imports(module: str = DEFAULT_MODULE) -> list[ImportTiming]:
+    """Import `module` in a fresh interpreter and return its `-X importtime` rows."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(
+                ImportTiming(name, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return timings
+
+
+def total_import_ms(timings: list[ImportTiming], module: str = DEFAULT_MODULE) -> float:
+    # The top-level row of the requested module closes the report.
+    return next(
+        timing.cumulative_us / 1000
+        for timing in reversed(timings)
+        if timing.module == module and timing.depth == 0
+    )
+
+
+def find_eager_lazy_modules(
+    timings: list[ImportTiming], lazy_modules: tuple[str, ...] = LAZY_MODULES
+) -> list[str]:
+    imported = {timing.module for timing in timings}
+    return [
+        name
+        for name in lazy_modules
+        if any(module == name or module.startswith(f"{name}.") for module in imported)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    runs = [measure_imports(args.module) for _ in range(args.repeat)]
+    totals = [total_import_ms(timings, args.module) for timings in runs]
+    median_ms = statistics.median(totals)
+    print(f"import {args.module}: median {median_ms:.1f} ms over {args.repeat} runs")
+
+    print(f"\nSlowest modules by own import time (last run, top {args.top}):")
+    for timing in sorted(runs[-1], key=lambda timing: timing.self_us, reverse=True)[: args.top]:
+        print(f"  {timing.self_us / 1000:8.1f} ms  {timing.module}")
+
+    failures = []
+    eager = find_eager_lazy_modules(runs[-1])
+    if eager:
+        failures.append(f"lazy modules imported at startup: {', '.join(eager)}")
+    if median_ms > args.budget_ms:
+        failures.append(f"median {median_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"\nPROBLEM {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,13 @@
-from .app import create_app
+def __getattr__(name: str):
+    # `flask --app dekho` looks up `app`; creating it on first access keeps
+    # `dekho.cli` and other submodules from importing the whole app.
+    if name == "create_app":
+        from .app import create_app
 
-app = create_app()
+        return create_app
+    if name == "app":
+        from .app import create_app
+
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,30 +8,153 @@ Outputs:
 
 Side effects:
 - Initializes DB schema on startup.
+- Optionally logs slow SQL statements with their query plans.
+- Records per-route latency, SQL and template metrics (`/api/metrics`).
+- Streams track change events to open clients (`/api/events`).
+- Serves the trigger-captured row change log to external consumers (`/api/changes`).
+- Compresses HTML/JSON responses and serves fingerprinted, immutable static assets.
+- Validates label assignments against LABEL_CATALOG on startup and after scans.
 - Persists user and remote metadata through DB repository calls.
-- Serves files from app-controlled media paths.
+- Optionally refreshes stale or failed remote metadata in a background thread.
+- Serves files from app-controlled media paths, including cover sprite sheets.
+- Answers artifact requests from the artifact manifest and backfills it on disk hits.
+- Transcodes low-bitrate audio previews with ffmpeg on demand.
 """
 
+import subprocess
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
 
-from flask import Flask, jsonify, render_template, request, send_file
+from flask import Flask, jsonify, render_template, request, send_file, url_for
 
+from .artifacts import record_track_artifact
+from .compression import compress_response
 from .db import (
+    ARTIFACT_TYPE_IMAGE,
+    ARTIFACT_TYPE_SPECTROGRAM,
+    TRACK_EVENT_REMOTE_DATA_FETCHED,
+    TRACK_EVENT_USER_DATA_CHANGED,
+    delete_track_audio_paths,
     get_all_tracks_file_data,
+    get_row_change_bounds,
+    get_row_changes_after,
+    get_track_artifact,
+    get_track_audio_path,
     get_track_details,
+    get_tracks_details,
     get_unknown_label_assignments,
     init_db,
+    record_remote_data_failures,
+    record_track_event,
+    upsert_track_audio_path,
     upsert_track_remote_data,
     upsert_track_user_data,
 )
 from .labels import get_label_catalog, normalize_label_keys
+from .live_events import register_live_events
+from .metrics import register_metrics
+from .previews import PreviewTranscoder
 from .remote_metadata import fetch_suno_track_metadata
-from .scan import run_scan
+from .remote_refresh import DEFAULT_REFRESH_BUDGET, register_remote_refresh
+from .sprites import (
+    cover_sprite_sheet_path,
+    get_cover_sprite_tile,
+    load_cover_sprite_manifest,
+)
+from .sql_trace import enable_sql_trace
+from .static_assets import register_static_assets
+
+
+TRACK_LIST_MODES = ("dom", "virtual")
+# Covers and spectrograms are derived from the track itself and keyed by
+# track_id; ETags cover the rare regeneration.
+TRACK_ARTIFACT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+# Sprite sheet names carry a content hash.
+SPRITE_SHEET_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
+AUDIO_QUALITIES = ("original", "preview")
+# The queue prefetches a handful of tracks; the cap bounds the IN (...) list.
+TRACK_BATCH_MAX_IDS = 50
+CHANGES_DEFAULT_LIMIT = 500
+CHANGES_MAX_LIMIT = 5000
+TRACK_BOOTSTRAP_COLUMNS = (
+    "track_id",
+    "display_title",
+    "title",
+    "notes",
+    "tags",
+    "labels",
+    "label_keys",
+    "has_remote_tags",
+    "has_image",
+    "cover_sprite",
+)
+
+
+def _build_tracks_bootstrap(tracks: list[dict[str, object]]) -> dict[str, object]:
+    """Project index rows into one array per column for the virtual track list."""
+    columns: dict[str, list[object]] = {name: [] for name in TRACK_BOOTSTRAP_COLUMNS}
+    for track in tracks:
+        for name in TRACK_BOOTSTRAP_COLUMNS:
+            value = track[name]
+            columns[name].append(int(value) if isinstance(value, bool) else value)
+    return {"count": len(tracks), "columns": columns}
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    app.config.from_mapping(
+        TRACK_LIST_MODE="dom",
+        METRICS_ENABLED=True,
+        SQL_TRACE_LOG_PATH="",
+        SQL_TRACE_THRESHOLD_MS=50,
+        EVENTS_POLL_INTERVAL_SECONDS=1.0,
+        EVENTS_STREAM_MAX_SECONDS=300,
+        REMOTE_REFRESH_INTERVAL_SECONDS=0,
+        REMOTE_REFRESH_BUDGET=DEFAULT_REFRESH_BUDGET,
+    )
+    # e.g. FLASK_TRACK_LIST_MODE=virtual, FLASK_METRICS_ENABLED=false,
+    # FLASK_SQL_TRACE_LOG_PATH=logs/slow_sql.log,
+    # FLASK_REMOTE_REFRESH_INTERVAL_SECONDS=3600
+    app.config.from_prefixed_env()
+    if app.config["SQL_TRACE_LOG_PATH"]:
+        enable_sql_trace(
+            Path(app.config["SQL_TRACE_LOG_PATH"]),
+            float(app.config["SQL_TRACE_THRESHOLD_MS"]),
+        )
     init_db()
+    register_static_assets(app)
+    if app.config["METRICS_ENABLED"]:
+        # Registered before compression: after_request hooks run in reverse,
+        # so recorded sizes and latencies include compression.
+        register_metrics(app)
+    register_live_events(app)
+    register_remote_refresh(app)
+    preview_transcoder = PreviewTranscoder()
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, request.accept_encodings)
+
+    # Label integrity only changes with LABEL_CATALOG edits (app restart) or
+    # scans; user-data saves are validated by `normalize_label_keys`.
+    label_integrity: dict[str, list[dict[str, str]]] = {
+        "unknown_label_assignments": get_unknown_label_assignments(),
+    }
+
+    def _refresh_label_integrity() -> None:
+        label_integrity["unknown_label_assignments"] = get_unknown_label_assignments()
+
+    def _build_cover_sprites_bootstrap(manifest: dict[str, object] | None):
+        if manifest is None:
+            return None
+        return {
+            "sheet_urls": [
+                url_for("cover_sprite_sheet", sheet_name=sheet_name)
+                for sheet_name in manifest["sheets"]
+            ],
+            "columns": manifest["columns"],
+            "rows": manifest["rows"],
+        }
 
     def _track_not_found_response():
         return jsonify({"error": "Track not found"}), 404
@@ -91,13 +214,43 @@ def create_app() -> Flask:
             return None, jsonify({"error": missing_message}), 404
         return artifact_path, None, None
 
+    def _send_track_artifact(
+        track_id: str,
+        artifact_type: str,
+        artifact_root: str,
+        extension: str,
+        missing_message: str,
+        outside_root_message: str,
+    ):
+        manifest_entry = get_track_artifact(track_id.strip(), artifact_type)
+        if manifest_entry is not None and not manifest_entry["exists"]:
+            # Known missing (e.g. no embedded cover): no filesystem probe.
+            return jsonify({"error": missing_message}), 404
+
+        artifact_path, response, status = _resolve_track_artifact_path(
+            track_id=track_id,
+            artifact_root=artifact_root,
+            extension=extension,
+            missing_message=missing_message,
+            outside_root_message=outside_root_message,
+        )
+        if response is not None:
+            if status == 404 and manifest_entry is not None:
+                # The file was deleted behind the manifest's back.
+                record_track_artifact(track_id.strip(), artifact_type, None)
+            return response, status
+        if manifest_entry is None:
+            # Artifact generated before the manifest existed.
+            record_track_artifact(track_id.strip(), artifact_type, artifact_path)
+        return send_file(artifact_path, max_age=TRACK_ARTIFACT_MAX_AGE_SECONDS)
+
     @app.get("/favicon.ico")
     def favicon():
         return app.send_static_file("favicon.ico")
 
     @app.get("/")
     def index() -> str:
-        unknown_labels = get_unknown_label_assignments()
+        unknown_labels = label_integrity["unknown_label_assignments"]
         if unknown_labels:
             lines = [
                 "ERROR: database contains label assignments that are missing from LABEL_CATALOG.",
@@ -109,6 +262,7 @@ def create_app() -> Flask:
 
         music_root = Path("./music").resolve()
         label_catalog = get_label_catalog()
+        sprite_manifest = load_cover_sprite_manifest()
         tracks_in_music: list[dict[str, object]] = []
 
         for row in get_all_tracks_file_data():
@@ -143,13 +297,34 @@ def create_app() -> Flask:
                     "labels": labels,
                     "label_keys": label_keys,
                     "has_remote_tags": bool(tags.strip()),
+                    "has_image": row.get("has_image"),
+                    "cover_sprite": (
+                        get_cover_sprite_tile(sprite_manifest, track_id)
+                        if sprite_manifest is not None
+                        else None
+                    ),
                 }
             )
 
+        cover_sprites = _build_cover_sprites_bootstrap(sprite_manifest)
+        list_mode = request.args.get("list", app.config["TRACK_LIST_MODE"])
+        if list_mode not in TRACK_LIST_MODES:
+            list_mode = "dom"
+        if list_mode == "virtual":
+            return render_template(
+                "index.html",
+                list_mode=list_mode,
+                tracks=[],
+                tracks_bootstrap=_build_tracks_bootstrap(tracks_in_music),
+                label_catalog=label_catalog,
+                cover_sprites=cover_sprites,
+            )
         return render_template(
             "index.html",
+            list_mode=list_mode,
             tracks=tracks_in_music,
             label_catalog=label_catalog,
+            cover_sprites=cover_sprites,
         )
 
     @app.get("/overview")
@@ -221,9 +396,23 @@ def create_app() -> Flask:
 
     @app.get("/scan")
     def scan() -> str:
+        # Imported on first scan: keeps mutagen (and, via spectrograms, NumPy
+        # and matplotlib) out of app startup.
+        from .scan import run_scan
+
         scan_result = run_scan(Path("./music"))
+        _refresh_label_integrity()
         return render_template("scan_result.html", **scan_result)
 
+    @app.get("/api/health")
+    def health():
+        unknown_labels = label_integrity["unknown_label_assignments"]
+        payload = {
+            "status": "error" if unknown_labels else "ok",
+            "unknown_label_assignments": unknown_labels,
+        }
+        return jsonify(payload), 503 if unknown_labels else 200
+
     @app.get("/api/tracks/<track_id>")
     def track_details(track_id: str):
         details, error_response = _get_track_details_or_404(track_id)
@@ -231,50 +420,145 @@ def create_app() -> Flask:
             return error_response
         return jsonify(_with_label_catalog(details))
 
+    @app.get("/api/tracks:batch")
+    def tracks_details_batch():
+        raw_ids = request.args.get("ids", "")
+        track_ids = list(dict.fromkeys(
+            track_id.strip() for track_id in raw_ids.split(",") if track_id.strip()
+        ))
+        if not track_ids:
+            return jsonify({"error": "ids query parameter is required."}), 400
+        if len(track_ids) > TRACK_BATCH_MAX_IDS:
+            return jsonify(
+                {"error": f"At most {TRACK_BATCH_MAX_IDS} track IDs per batch."}
+            ), 400
+
+        details_by_id = get_tracks_details(track_ids)
+        return jsonify(
+            {
+                "tracks": [
+                    details_by_id[track_id]
+                    for track_id in track_ids
+                    if track_id in details_by_id
+                ],
+                "missing": [track_id for track_id in track_ids if track_id not in details_by_id],
+                "label_catalog": get_label_catalog(),
+            }
+        )
+
     @app.get("/api/labels")
     def label_catalog():
         return jsonify({"label_catalog": get_label_catalog()})
 
-    @app.get("/api/tracks/<track_id>/audio")
-    def track_audio(track_id: str):
+    def _resolve_track_audio_path_from_db(track_id: str):
         details, error_response = _get_track_details_or_404(track_id)
         if error_response is not None:
-            return error_response
+            return None, error_response
 
         filepath = details.get("filepath")
         if not isinstance(filepath, str) or not filepath:
-            return jsonify({"error": "Track filepath is missing."}), 400
+            return None, (jsonify({"error": "Track filepath is missing."}), 400)
 
-        resolved_path, response, _status = _resolve_track_audio_path(filepath)
+        resolved_path, response, status = _resolve_track_audio_path(filepath)
         if response is not None:
-            return response, _status
-        return send_file(resolved_path)
+            return None, (response, status)
+        stat = resolved_path.stat()
+        upsert_track_audio_path(track_id, resolved_path, stat.st_size, stat.st_mtime_ns)
+        return resolved_path, None
+
+    def _send_track_audio(track_id: str, audio_path: Path, quality: str):
+        if quality == "preview":
+            try:
+                preview_path = preview_transcoder.get_preview(track_id, audio_path)
+            except (OSError, subprocess.CalledProcessError, FutureTimeoutError):
+                # Missing ffmpeg or a failed transcode should not block playback.
+                app.logger.warning("Preview transcode failed for %s", track_id, exc_info=True)
+            else:
+                return send_file(preview_path, mimetype="audio/mpeg")
+        return send_file(audio_path)
+
+    @app.get("/api/tracks/<track_id>/audio")
+    def track_audio(track_id: str):
+        quality = request.args.get("quality", "original")
+        if quality not in AUDIO_QUALITIES:
+            return jsonify({"error": "quality must be 'original' or 'preview'."}), 400
+
+        # Fast path: scan-built path index, no joins or path resolution. The
+        # recorded size and mtime catch a file replaced since it was indexed.
+        indexed = get_track_audio_path(track_id)
+        if indexed is not None:
+            try:
+                stat = indexed["path"].stat()
+                if (stat.st_size, stat.st_mtime_ns) == (indexed["size"], indexed["mtime_ns"]):
+                    return _send_track_audio(track_id, indexed["path"], quality)
+            except FileNotFoundError:
+                pass
+            # File moved or replaced since it was indexed; rebuild the entry below.
+            delete_track_audio_paths([track_id])
+
+        resolved_path, error_response = _resolve_track_audio_path_from_db(track_id)
+        if error_response is not None:
+            return error_response
+        return _send_track_audio(track_id, resolved_path, quality)
+
+    @app.get("/api/sprites/<sheet_name>")
+    def cover_sprite_sheet(sheet_name: str):
+        manifest = load_cover_sprite_manifest()
+        if manifest is None or sheet_name not in manifest["sheets"]:
+            return jsonify({"error": "Sprite sheet not found."}), 404
+        response = send_file(
+            cover_sprite_sheet_path(sheet_name),
+            mimetype="image/jpeg",
+            max_age=SPRITE_SHEET_MAX_AGE_SECONDS,
+        )
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
 
     @app.get("/api/tracks/<track_id>/image")
     def track_image(track_id: str):
-        image_path, response, status = _resolve_track_artifact_path(
+        return _send_track_artifact(
             track_id=track_id,
+            artifact_type=ARTIFACT_TYPE_IMAGE,
             artifact_root="images",
             extension="jpg",
             missing_message="Track image not found.",
             outside_root_message="Track image path is outside images root.",
         )
-        if response is not None:
-            return response, status
-        return send_file(image_path)
 
     @app.get("/api/tracks/<track_id>/spectrogram")
     def track_spectrogram(track_id: str):
-        spectrogram_path, response, status = _resolve_track_artifact_path(
+        return _send_track_artifact(
             track_id=track_id,
+            artifact_type=ARTIFACT_TYPE_SPECTROGRAM,
             artifact_root="spectrograms",
             extension="png",
             missing_message="Track spectrogram not found.",
             outside_root_message="Track spectrogram path is outside spectrograms root.",
         )
-        if response is not None:
-            return response, status
-        return send_file(spectrogram_path)
+
+    @app.get("/api/changes")
+    def row_changes():
+        try:
+            since = int(request.args.get("since", 0))
+            limit = int(request.args.get("limit", CHANGES_DEFAULT_LIMIT))
+        except ValueError:
+            return jsonify({"error": "since and limit must be integers."}), 400
+        limit = max(1, min(limit, CHANGES_MAX_LIMIT))
+
+        oldest_seq, latest_seq = get_row_change_bounds()
+        changes = get_row_changes_after(since, limit)
+        return jsonify(
+            {
+                "changes": changes,
+                "next_since": changes[-1]["seq"] if changes else max(since, 0),
+                "latest_seq": latest_seq,
+                "has_more": bool(changes) and changes[-1]["seq"] < latest_seq,
+                # Changes after `since` were pruned: re-read the tables, then
+                # continue from `latest_seq`.
+                "reset": oldest_seq > since + 1,
+            }
+        )
 
     @app.post("/api/tracks/<track_id>/remote-data")
     def fetch_track_remote_data(track_id: str):
@@ -287,10 +571,13 @@ def create_app() -> Flask:
             return jsonify({"error": "Track URL is missing."}), 400
 
         try:
-            remote_data = fetch_suno_track_metadata(track_url)
+            # An explicit fetch always revalidates; an unchanged page costs a 304.
+            remote_data = fetch_suno_track_metadata(track_url, max_cache_age_seconds=0)
         except ValueError as error:
+            record_remote_data_failures([(track_id, str(error))])
             return jsonify({"error": str(error)}), 400
-        except Exception:
+        except Exception as error:
+            record_remote_data_failures([(track_id, str(error) or type(error).__name__)])
             return jsonify({"error": "Failed to fetch data from Suno."}), 502
 
         upsert_track_remote_data(
@@ -303,6 +590,7 @@ def create_app() -> Flask:
             model_name=remote_data.get("model_name"),
             persona_name=remote_data.get("persona_name"),
         )
+        record_track_event(TRACK_EVENT_REMOTE_DATA_FETCHED, track_id)
 
         updated_details, updated_error_response = _get_track_details_or_404(track_id)
         if updated_error_response is not None:
@@ -344,6 +632,7 @@ def create_app() -> Flask:
             remix_of=remix_of,
             labels=labels,
         )
+        record_track_event(TRACK_EVENT_USER_DATA_CHANGED, track_id)
 
         updated_details, updated_error_response = _get_track_details_or_404(track_id)
         if updated_error_response is not None:
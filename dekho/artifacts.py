@@ -0,0 +1,39 @@
+"""Artifact manifest bookkeeping shared by the scan and the artifact routes.
+
+Inputs:
+- Generated artifact files (covers, spectrograms) or their known absence.
+
+Outputs:
+- `track_artifacts` rows with size, SHA-256 and generator version.
+
+Side effects:
+- Reads the artifact file to hash it.
+"""
+
+import hashlib
+from pathlib import Path
+
+from .db import ARTIFACT_TYPE_IMAGE, ARTIFACT_TYPE_SPECTROGRAM, upsert_track_artifact
+
+# Bump when a generator's output changes; spectrograms with an older version
+# in the artifact manifest are regenerated on the next scan.
+ARTIFACT_GENERATOR_VERSIONS = {
+    ARTIFACT_TYPE_IMAGE: 1,
+    ARTIFACT_TYPE_SPECTROGRAM: 1,
+}
+
+
+def record_track_artifact(track_id: str, artifact_type: str, path: Path | None) -> None:
+    """Write the manifest row for an artifact file, or its absence when `path` is None."""
+    generator_version = ARTIFACT_GENERATOR_VERSIONS[artifact_type]
+    if path is None:
+        upsert_track_artifact(track_id, artifact_type, None, None, generator_version)
+        return
+    data = path.read_bytes()
+    upsert_track_artifact(
+        track_id,
+        artifact_type,
+        len(data),
+        hashlib.sha256(data).hexdigest(),
+        generator_version,
+    )
@@ -0,0 +1,248 @@
+"""`dekho` command line entry point.
+
+Inputs:
+- Subcommand and options from argv (`dekho serve --workers 4 ...`).
+
+Outputs:
+- Process exit status.
+
+Side effects:
+- `serve` runs a preloaded, multi-worker gunicorn server around `create_app()`.
+- `backfill-remote` fetches Suno metadata for tracks without remote data.
+- `reparse-remote` re-extracts remote data from cached Suno pages (offline).
+- `refresh-remote` refetches stale or failed remote data within a request
+  budget, once or `--every` N seconds.
+
+The remote commands import their modules (and the HTTP client) when they run,
+so `dekho serve` and `--help` do not load them. Their options default to None,
+meaning the library default.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .remote_backfill import BackfillSummary
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5000
+DEFAULT_WORKERS = 2
+# Each open browser tab holds one thread for its `/api/events` stream.
+DEFAULT_THREADS = 8
+DEFAULT_MAX_REQUESTS = 1000
+DEFAULT_MAX_REQUESTS_JITTER = 100
+# `/scan` runs inside a request; recycling and shutdown wait this long for it.
+DEFAULT_GRACEFUL_TIMEOUT_SECONDS = 3600
+
+
+def build_gunicorn_options(args: argparse.Namespace) -> dict[str, object]:
+    return {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        # gthread keeps the worker heartbeat alive while a thread runs a long
+        # scan, so the arbiter does not kill the worker mid-scan.
+        "worker_class": "gthread",
+        "threads": args.threads,
+        "preload_app": True,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter,
+        "graceful_timeout": args.graceful_timeout,
+        "accesslog": "-",
+    }
+
+
+def serve(args: argparse.Namespace) -> int:
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print(
+            "`dekho serve` needs gunicorn: install the `serve` extra (uv sync --extra serve).",
+            file=sys.stderr,
+        )
+        return 1
+
+    from .app import create_app
+
+    class DekhoApplication(BaseApplication):
+        def __init__(self, options: dict[str, object]) -> None:
+            self.options = options
+            super().__init__()
+
+        def load_config(self) -> None:
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # With preload_app this runs once in the arbiter, before forking,
+            # so imports and schema setup are shared by all workers.
+            return create_app()
+
+    DekhoApplication(build_gunicorn_options(args)).run()
+    return 0
+
+
+def _report_backfill_progress(summary: BackfillSummary) -> None:
+    print(
+        f"{summary.done}/{summary.total} tracks"
+        f" ({summary.stored} stored, {len(summary.failed)} failed)",
+        file=sys.stderr,
+    )
+
+
+def _finish_backfill(summary: BackfillSummary) -> int:
+    for track_id, error in sorted(summary.failed.items()):
+        print(f"{track_id}: {error}", file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+def _given_options(**options: object) -> dict[str, object]:
+    """The options set on the command line; the others keep the library defaults."""
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def backfill_remote(args: argparse.Namespace) -> int:
+    from .remote_backfill import backfill_remote_data
+
+    summary = backfill_remote_data(
+        limit=args.limit,
+        on_progress=_report_backfill_progress,
+        **_given_options(
+            concurrency=args.concurrency,
+            requests_per_second=args.rate,
+            max_attempts=args.max_attempts,
+            batch_size=args.batch_size,
+        ),
+    )
+    return _finish_backfill(summary)
+
+
+def reparse_remote(args: argparse.Namespace) -> int:
+    from .remote_backfill import reparse_cached_remote_data
+
+    summary = reparse_cached_remote_data(
+        on_progress=_report_backfill_progress, **_given_options(batch_size=args.batch_size)
+    )
+    return _finish_backfill(summary)
+
+
+def refresh_remote(args: argparse.Namespace) -> int:
+    from .remote_refresh import DEFAULT_REFRESH_BUDGET, RemoteRefreshJob, refresh_remote_data
+
+    budget = args.budget if args.budget is not None else DEFAULT_REFRESH_BUDGET
+
+    def refresh(budget: int) -> BackfillSummary:
+        return refresh_remote_data(
+            budget=budget,
+            on_progress=_report_backfill_progress,
+            **_given_options(concurrency=args.concurrency, requests_per_second=args.rate),
+        )
+
+    if args.every is None:
+        return _finish_backfill(refresh(budget))
+
+    # Shares the lease with the app's background job, so the two never overlap.
+    job = RemoteRefreshJob(args.every, budget, refresh=refresh)
+    try:
+        while True:
+            if job.run_once() is None:
+                print("Another process holds the refresh lease; waiting.", file=sys.stderr)
+            time.sleep(args.every)
+    except KeyboardInterrupt:
+        return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="dekho")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the production WSGI server.")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    serve_parser.add_argument("--threads", type=int, default=DEFAULT_THREADS)
+    serve_parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=DEFAULT_MAX_REQUESTS,
+        help="Recycle a worker after this many requests (0 disables).",
+    )
+    serve_parser.add_argument(
+        "--max-requests-jitter", type=int, default=DEFAULT_MAX_REQUESTS_JITTER
+    )
+    serve_parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=DEFAULT_GRACEFUL_TIMEOUT_SECONDS,
+        help="Seconds a worker may take to finish in-flight requests (e.g. a scan).",
+    )
+    serve_parser.set_defaults(handler=serve)
+
+    backfill_parser = subparsers.add_parser(
+        "backfill-remote", help="Fetch Suno metadata for tracks that have none."
+    )
+    backfill_parser.add_argument("--concurrency", type=int, default=None)
+    backfill_parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Requests per second per host.",
+    )
+    backfill_parser.add_argument("--max-attempts", type=int, default=None)
+    backfill_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Tracks per database write.",
+    )
+    backfill_parser.add_argument("--limit", type=int, default=None)
+    backfill_parser.set_defaults(handler=backfill_remote)
+
+    reparse_parser = subparsers.add_parser(
+        "reparse-remote", help="Re-extract remote data from cached Suno pages (no network)."
+    )
+    reparse_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Tracks per database write.",
+    )
+    reparse_parser.set_defaults(handler=reparse_remote)
+
+    refresh_parser = subparsers.add_parser(
+        "refresh-remote", help="Refetch stale or failed Suno metadata within a request budget."
+    )
+    refresh_parser.add_argument(
+        "--budget",
+        type=int,
+        default=None,
+        help="Maximum track pages fetched per run.",
+    )
+    refresh_parser.add_argument("--concurrency", type=int, default=None)
+    refresh_parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Requests per second per host.",
+    )
+    refresh_parser.add_argument(
+        "--every",
+        type=float,
+        default=None,
+        help="Keep running and refresh every this many seconds.",
+    )
+    refresh_parser.set_defaults(handler=refresh_remote)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+"""Response compression for HTML and JSON payloads.
+
+Inputs:
+- Finished Flask responses and the request `Accept-Encoding` header.
+
+Outputs:
+- The same response with a brotli or gzip encoded body when worthwhile.
+
+Side effects:
+- None. Brotli is used only when the optional `brotli` package is installed.
+"""
+
+import gzip
+
+from flask import Response
+from werkzeug.datastructures import Accept
+
+try:
+    import brotli
+except ImportError:  # Optional dependency: fall back to gzip only.
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "text/html",
+        "text/plain",
+        "application/json",
+    }
+)
+MIN_COMPRESS_BYTES = 1024
+GZIP_COMPRESS_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def supported_content_encodings() -> list[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+
+
+def compress_response(response: Response, accept_encodings: Accept) -> Response:
+    """Encode eligible response bodies with the best encoding the client accepts."""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = accept_encodings.best_match(supported_content_encodings())
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_BYTES:
+        return response
+
+    response.set_data(_compress_body(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
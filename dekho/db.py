@@ -9,20 +9,145 @@ Outputs:
 Side effects:
 - Creates/updates schema in `init_db()`.
 - Upserts rows in track and label tables.
+- Appends change events to `track_events` (pruned to the newest rows).
+- Reads the trigger-maintained `row_changes` log (see `db_schema.py`).
+- Reports statement timings to registered statement observers.
 """
 
+import json
 import sqlite3
-from datetime import UTC, datetime
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-from .db_schema import ensure_schema
+from .db_schema import ensure_schema, next_attempt_at_sql
 from .labels import get_allowed_label_keys, iter_label_definitions
 
 DB_PATH = Path("dekho.sqlite3")
+ARTIFACT_TYPE_IMAGE = "image"
+ARTIFACT_TYPE_SPECTROGRAM = "spectrogram"
+# `track_remote_data.status`: fetched fine, fetched but no usable prompt
+# (`prompt` is the literal "failed"), or the fetch itself failed.
+REMOTE_STATUS_OK = "ok"
+REMOTE_STATUS_PROMPT_FAILED = "prompt_failed"
+REMOTE_STATUS_ERROR = "error"
+TRACK_EVENT_UPSERTED = "track_upserted"
+TRACK_EVENT_USER_DATA_CHANGED = "track_user_data_changed"
+TRACK_EVENT_REMOTE_DATA_FETCHED = "track_remote_data_fetched"
+TRACK_EVENT_SCAN_PROGRESS = "scan_progress"
+TRACK_EVENT_SCAN_FINISHED = "scan_finished"
+# Older events are pruned on write; clients further behind reload instead.
+TRACK_EVENTS_RETAINED = 10_000
+
+# Called as observer(sql, parameters, elapsed_seconds) once per statement.
+StatementObserver = Callable[[str, object, float], None]
+_statement_observers: list[StatementObserver] = []
+
+
+def add_statement_observer(observer: StatementObserver) -> None:
+    if observer not in _statement_observers:
+        _statement_observers.append(observer)
+
+
+def remove_statement_observer(observer: StatementObserver) -> None:
+    if observer in _statement_observers:
+        _statement_observers.remove(observer)
+
+
+class _ObservedCursor(sqlite3.Cursor):
+    """Times execute plus fetch calls and reports once the statement is done.
+
+    A statement is done when it returns no rows, when its rows are exhausted
+    through fetch*(), or when the cursor is closed or released.
+    """
+
+    _statement: tuple[str, object] | None = None
+    _elapsed = 0.0
+
+    def execute(self, sql, parameters=()):
+        if not _statement_observers:
+            return super().execute(sql, parameters)
+        self._finish_statement()
+        self._statement = (sql, parameters)
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except BaseException:
+            self._elapsed = time.perf_counter() - start
+            self._finish_statement()
+            raise
+        self._elapsed = time.perf_counter() - start
+        if self.description is None:
+            self._finish_statement()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        if not _statement_observers:
+            return super().executemany(sql, seq_of_parameters)
+        self._finish_statement()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._statement = (sql, None)
+            self._elapsed = time.perf_counter() - start
+            self._finish_statement()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - start
+        if row is None:
+            self._finish_statement()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._elapsed += time.perf_counter() - start
+        if len(rows) < size:
+            self._finish_statement()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - start
+        self._finish_statement()
+        return rows
+
+    def close(self):
+        self._finish_statement()
+        super().close()
+
+    def __del__(self):
+        self._finish_statement()
+
+    def _finish_statement(self) -> None:
+        statement = self._statement
+        if statement is None:
+            return
+        self._statement = None
+        elapsed, self._elapsed = self._elapsed, 0.0
+        for observer in tuple(_statement_observers):
+            observer(statement[0], statement[1], elapsed)
+
+
+class _ObservedConnection(sqlite3.Connection):
+    def cursor(self, factory=_ObservedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
 
 
 def get_connection() -> sqlite3.Connection:
-    connection = sqlite3.connect(DB_PATH)
+    connection = sqlite3.connect(DB_PATH, factory=_ObservedConnection)
     connection.execute("PRAGMA foreign_keys = ON")
     return connection
 
@@ -102,16 +227,139 @@ def upsert_track(
             )
 
 
+def upsert_track_audio_path(track_id: str, path: Path, size: int, mtime_ns: int) -> None:
+    """Record the validated absolute audio path for a track (written by scan)."""
+    init_db()
+    with get_connection() as connection:
+        connection.execute(
+            """
+            INSERT INTO track_audio_paths (track_id, path, size, mtime_ns)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(track_id) DO UPDATE SET
+                path = excluded.path,
+                size = excluded.size,
+                mtime_ns = excluded.mtime_ns
+            """,
+            (track_id, str(path), size, mtime_ns),
+        )
+
+
+def get_track_audio_path(track_id: str) -> dict[str, object] | None:
+    # Hot path for audio and Range requests: a single primary-key lookup
+    # without `init_db()`. Callers fall back to full resolution on None.
+    try:
+        with get_connection() as connection:
+            row = connection.execute(
+                """
+                SELECT path, size, mtime_ns
+                FROM track_audio_paths
+                WHERE track_id = ?
+                """,
+                (track_id,),
+            ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+
+    if row is None:
+        return None
+    return {"path": Path(row[0]), "size": row[1], "mtime_ns": row[2]}
+
+
+def delete_track_audio_paths(track_ids: list[str]) -> None:
+    if not track_ids:
+        return
+    init_db()
+    with get_connection() as connection:
+        connection.executemany(
+            """
+            DELETE FROM track_audio_paths
+            WHERE track_id = ?
+            """,
+            [(track_id,) for track_id in track_ids],
+        )
+
+
+def upsert_track_artifact(
+    track_id: str,
+    artifact_type: str,
+    size: int | None,
+    content_hash: str | None,
+    generator_version: int,
+) -> None:
+    """Record a generated artifact; `size=None` records that none was produced.
+
+    Artifacts of tracks that are not in `tracks_file_data` are ignored.
+    """
+    init_db()
+    with get_connection() as connection:
+        connection.execute(
+            """
+            INSERT INTO track_artifacts (
+                track_id, artifact_type, size, content_hash, generator_version
+            )
+            SELECT track_id, ?, ?, ?, ?
+            FROM tracks_file_data
+            WHERE track_id = ?
+            ON CONFLICT(track_id, artifact_type) DO UPDATE SET
+                size = excluded.size,
+                content_hash = excluded.content_hash,
+                generator_version = excluded.generator_version
+            """,
+            (artifact_type, size, content_hash, generator_version, track_id),
+        )
+
+
+def get_track_artifact(track_id: str, artifact_type: str) -> dict[str, object] | None:
+    # Hot path for artifact routes, like `get_track_audio_path()`: no `init_db()`.
+    # None means the manifest has no answer yet; callers check the disk.
+    try:
+        with get_connection() as connection:
+            row = connection.execute(
+                """
+                SELECT size, content_hash, generator_version
+                FROM track_artifacts
+                WHERE track_id = ? AND artifact_type = ?
+                """,
+                (track_id, artifact_type),
+            ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+
+    if row is None:
+        return None
+    return {
+        "exists": row[0] is not None,
+        "size": row[0],
+        "content_hash": row[1],
+        "generator_version": row[2],
+    }
+
+
+def _artifact_flag(value: object) -> bool | None:
+    # NULL from the LEFT JOIN: no manifest row yet (unknown, e.g. not rescanned).
+    return None if value is None else bool(value)
+
+
 def get_all_tracks_file_data() -> list[dict[str, object]]:
     init_db()
     with get_connection() as connection:
         rows = connection.execute(
             """
             SELECT tfd.track_id, tfd.filepath, tfd.title, tud.title_new, tud.notes,
-                   tud.remix_of, trd.tags
+                   tud.remix_of, trd.tags,
+                   CASE WHEN image.track_id IS NOT NULL THEN image.size IS NOT NULL END,
+                   CASE
+                       WHEN spectrogram.track_id IS NOT NULL
+                       THEN spectrogram.size IS NOT NULL
+                   END
             FROM tracks_file_data AS tfd
             LEFT JOIN track_user_data AS tud ON tud.track_id = tfd.track_id
             LEFT JOIN track_remote_data AS trd ON trd.track_id = tfd.track_id
+            LEFT JOIN track_artifacts AS image
+                ON image.track_id = tfd.track_id AND image.artifact_type = 'image'
+            LEFT JOIN track_artifacts AS spectrogram
+                ON spectrogram.track_id = tfd.track_id
+                AND spectrogram.artifact_type = 'spectrogram'
             ORDER BY tfd.date_created DESC, tfd.filepath COLLATE NOCASE ASC
             """
         ).fetchall()
@@ -142,6 +390,8 @@ def get_all_tracks_file_data() -> list[dict[str, object]]:
             "notes": row[4],
             "remix_of": row[5],
             "tags": row[6],
+            "has_image": _artifact_flag(row[7]),
+            "has_spectrogram": _artifact_flag(row[8]),
             "label_keys": label_keys_by_track_id.get(str(row[0]), []),
             "labels": labels_by_track_id.get(str(row[0]), []),
         }
@@ -150,10 +400,20 @@ def get_all_tracks_file_data() -> list[dict[str, object]]:
 
 
 def get_track_details(track_id: str) -> dict[str, object] | None:
+    return get_tracks_details([track_id]).get(track_id)
+
+
+def get_tracks_details(track_ids: list[str]) -> dict[str, dict[str, object]]:
+    """Return details keyed by track ID using two queries; unknown IDs are omitted."""
+    unique_track_ids = list(dict.fromkeys(track_ids))
+    if not unique_track_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in unique_track_ids)
+
     init_db()
     with get_connection() as connection:
-        row = connection.execute(
-            """
+        rows = connection.execute(
+            f"""
             SELECT
                 tfd.track_id,
                 tfd.title,
@@ -170,36 +430,62 @@ def get_track_details(track_id: str) -> dict[str, object] | None:
                 trd.persona_name,
                 tud.title_new,
                 tud.notes,
-                tud.remix_of
+                tud.remix_of,
+                CASE WHEN image.track_id IS NOT NULL THEN image.size IS NOT NULL END,
+                CASE
+                    WHEN spectrogram.track_id IS NOT NULL
+                    THEN spectrogram.size IS NOT NULL
+                END
             FROM tracks_file_data AS tfd
             LEFT JOIN track_remote_data AS trd ON trd.track_id = tfd.track_id
             LEFT JOIN track_user_data AS tud ON tud.track_id = tfd.track_id
-            WHERE tfd.track_id = ?
+            LEFT JOIN track_artifacts AS image
+                ON image.track_id = tfd.track_id AND image.artifact_type = 'image'
+            LEFT JOIN track_artifacts AS spectrogram
+                ON spectrogram.track_id = tfd.track_id
+                AND spectrogram.artifact_type = 'spectrogram'
+            WHERE tfd.track_id IN ({placeholders})
             """,
-            (track_id,),
-        ).fetchone()
+            unique_track_ids,
+        ).fetchall()
+        label_rows = connection.execute(
+            f"""
+            SELECT tul.track_id, ld.key
+            FROM track_user_data_labels AS tul
+            JOIN label_definitions AS ld ON ld.id = tul.label_id
+            WHERE tul.track_id IN ({placeholders})
+            ORDER BY ld.key
+            """,
+            unique_track_ids,
+        ).fetchall()
 
-    if row is None:
-        return None
+    label_keys_by_track_id: dict[str, list[str]] = {}
+    for label_row in label_rows:
+        label_keys_by_track_id.setdefault(str(label_row[0]), []).append(str(label_row[1]))
 
     return {
-        "track_id": row[0],
-        "title": row[1],
-        "url": row[2],
-        "filepath": row[3],
-        "duration": row[4],
-        "date_created": row[5],
-        "prompt": row[6],
-        "tags": row[7],
-        "negative_tags": row[8],
-        "has_cover_clip_id": bool(row[9]),
-        "major_model_version": row[10],
-        "model_name": row[11],
-        "persona_name": row[12],
-        "title_new": row[13],
-        "notes": row[14],
-        "remix_of": row[15],
-        "labels": get_track_label_keys(track_id),
+        str(row[0]): {
+            "track_id": row[0],
+            "title": row[1],
+            "url": row[2],
+            "filepath": row[3],
+            "duration": row[4],
+            "date_created": row[5],
+            "prompt": row[6],
+            "tags": row[7],
+            "negative_tags": row[8],
+            "has_cover_clip_id": bool(row[9]),
+            "major_model_version": row[10],
+            "model_name": row[11],
+            "persona_name": row[12],
+            "title_new": row[13],
+            "notes": row[14],
+            "remix_of": row[15],
+            "has_image": _artifact_flag(row[16]),
+            "has_spectrogram": _artifact_flag(row[17]),
+            "labels": label_keys_by_track_id.get(str(row[0]), []),
+        }
+        for row in rows
     }
 
 
@@ -216,7 +502,12 @@ def get_track_remote_data(track_id: str) -> dict[str, str | bool | None] | None:
                 has_cover_clip_id,
                 major_model_version,
                 model_name,
-                persona_name
+                persona_name,
+                status,
+                fetched_at,
+                attempts,
+                last_error,
+                next_attempt_at
             FROM track_remote_data
             WHERE track_id = ?
             """,
@@ -235,23 +526,87 @@ def get_track_remote_data(track_id: str) -> dict[str, str | bool | None] | None:
         "major_model_version": row[5],
         "model_name": row[6],
         "persona_name": row[7],
+        "status": row[8],
+        "fetched_at": row[9],
+        "attempts": row[10],
+        "last_error": row[11],
+        "next_attempt_at": row[12],
     }
 
 
-def upsert_track_remote_data(
-    track_id: str,
-    prompt: str | None,
-    tags: str | None,
-    negative_tags: str | None,
-    has_cover_clip_id: bool | None,
-    major_model_version: str | None,
-    model_name: str | None,
-    persona_name: str | None,
-) -> None:
+REMOTE_DATA_COLUMNS = (
+    "prompt",
+    "tags",
+    "negative_tags",
+    "has_cover_clip_id",
+    "major_model_version",
+    "model_name",
+    "persona_name",
+)
+
+
+def get_tracks_missing_remote_data(
+    limit: int | None = None, now: str | None = None
+) -> list[dict[str, str]]:
+    """Return `{track_id, url}` for Suno tracks to backfill.
+
+    Tracks with no remote data row come first, then tracks whose last fetch
+    failed and whose retry backoff (`next_attempt_at`) has elapsed by `now`.
+    """
     init_db()
+    now = now or datetime.now(UTC).isoformat()
     with get_connection() as connection:
-        connection.execute(
+        rows = connection.execute(
             """
+            SELECT tfd.track_id, tfd.url
+            FROM tracks_file_data AS tfd
+            WHERE tfd.url LIKE '%/song/%'
+              AND NOT EXISTS (
+                  SELECT 1 FROM track_remote_data AS trd WHERE trd.track_id = tfd.track_id
+              )
+            ORDER BY tfd.track_id
+            LIMIT ?
+            """,
+            (-1 if limit is None else limit,),
+        ).fetchall()
+        if limit is None or len(rows) < limit:
+            rows += connection.execute(
+                """
+                SELECT trd.track_id, tfd.url
+                FROM track_remote_data AS trd
+                JOIN tracks_file_data AS tfd ON tfd.track_id = trd.track_id
+                WHERE trd.next_attempt_at <= ?
+                  AND trd.status = ?
+                  AND tfd.url LIKE '%/song/%'
+                ORDER BY trd.next_attempt_at
+                LIMIT ?
+                """,
+                (now, REMOTE_STATUS_ERROR, -1 if limit is None else limit - len(rows)),
+            ).fetchall()
+    return [{"track_id": track_id, "url": url} for track_id, url in rows]
+
+
+def _remote_data_status(prompt: object) -> str:
+    return REMOTE_STATUS_PROMPT_FAILED if prompt == "failed" else REMOTE_STATUS_OK
+
+
+def upsert_tracks_remote_data(rows: list[dict[str, object]]) -> None:
+    """Write several `{track_id, <REMOTE_DATA_COLUMNS>...}` rows in one transaction.
+
+    Rows may carry `fetched_at` (defaults to now). A literal "failed" prompt
+    is stored with `prompt_failed` status and counts as a failed attempt.
+    `next_attempt_at` is scheduled from the new status and attempt count.
+    """
+    if not rows:
+        return
+    now = datetime.now(UTC).isoformat()
+    next_attempts = (
+        "CASE WHEN excluded.status = 'ok' THEN 0 ELSE track_remote_data.attempts + 1 END"
+    )
+    init_db()
+    with get_connection() as connection:
+        connection.executemany(
+            f"""
             INSERT INTO track_remote_data (
                 track_id,
                 prompt,
@@ -260,9 +615,28 @@ def upsert_track_remote_data(
                 has_cover_clip_id,
                 major_model_version,
                 model_name,
-                persona_name
+                persona_name,
+                status,
+                fetched_at,
+                attempts,
+                last_error,
+                next_attempt_at
+            )
+            VALUES (
+                :track_id,
+                :prompt,
+                :tags,
+                :negative_tags,
+                :has_cover_clip_id,
+                :major_model_version,
+                :model_name,
+                :persona_name,
+                :status,
+                :fetched_at,
+                :attempts,
+                NULL,
+                {next_attempt_at_sql(":fetched_at", ":status", ":attempts")}
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(track_id) DO UPDATE SET
                 prompt = excluded.prompt,
                 tags = excluded.tags,
@@ -270,21 +644,237 @@ def upsert_track_remote_data(
                 has_cover_clip_id = excluded.has_cover_clip_id,
                 major_model_version = excluded.major_model_version,
                 model_name = excluded.model_name,
-                persona_name = excluded.persona_name
+                persona_name = excluded.persona_name,
+                status = excluded.status,
+                fetched_at = excluded.fetched_at,
+                attempts = {next_attempts},
+                last_error = NULL,
+                next_attempt_at = {
+                    next_attempt_at_sql("excluded.fetched_at", "excluded.status", next_attempts)
+                }
             """,
-            (
-                track_id,
-                prompt,
-                tags,
-                negative_tags,
-                1 if has_cover_clip_id else 0,
-                major_model_version,
-                model_name,
-                persona_name,
-            ),
+            [
+                {
+                    "track_id": row["track_id"],
+                    "prompt": row.get("prompt"),
+                    "tags": row.get("tags"),
+                    "negative_tags": row.get("negative_tags"),
+                    "has_cover_clip_id": 1 if row.get("has_cover_clip_id") else 0,
+                    "major_model_version": row.get("major_model_version"),
+                    "model_name": row.get("model_name"),
+                    "persona_name": row.get("persona_name"),
+                    "status": _remote_data_status(row.get("prompt")),
+                    "fetched_at": row.get("fetched_at") or now,
+                    "attempts": (
+                        0 if _remote_data_status(row.get("prompt")) == REMOTE_STATUS_OK else 1
+                    ),
+                }
+                for row in rows
+            ],
         )
 
 
+def record_remote_data_failures(failures: list[tuple[str, str]]) -> None:
+    """Mark `(track_id, error)` fetch failures, keeping previously fetched values."""
+    if not failures:
+        return
+    now = datetime.now(UTC).isoformat()
+    init_db()
+    with get_connection() as connection:
+        connection.executemany(
+            f"""
+            INSERT INTO track_remote_data (
+                track_id, status, fetched_at, attempts, last_error, next_attempt_at
+            )
+            SELECT track_id, 'error', :now, 1, :error, {
+                next_attempt_at_sql(":now", "'error'", "1")
+            }
+            FROM tracks_file_data
+            WHERE track_id = :track_id
+            ON CONFLICT(track_id) DO UPDATE SET
+                status = 'error',
+                fetched_at = excluded.fetched_at,
+                attempts = track_remote_data.attempts + 1,
+                last_error = excluded.last_error,
+                next_attempt_at = {
+                    next_attempt_at_sql(
+                        "excluded.fetched_at", "'error'", "track_remote_data.attempts + 1"
+                    )
+                }
+            """,
+            [
+                {"now": now, "error": error, "track_id": track_id}
+                for track_id, error in failures
+            ],
+        )
+
+
+def get_remote_data_refresh_candidates(now: str, limit: int) -> list[dict[str, object]]:
+    """Up to `limit` rows whose `next_attempt_at` is at or before `now`, most overdue first.
+
+    Stale `ok` rows and failed rows past their backoff are both due; rows never
+    fetched come first.
+    """
+    init_db()
+    with get_connection() as connection:
+        rows = connection.execute(
+            """
+            SELECT trd.track_id, tfd.url, trd.status, trd.attempts, trd.fetched_at
+            FROM track_remote_data AS trd
+            JOIN tracks_file_data AS tfd ON tfd.track_id = trd.track_id
+            WHERE trd.next_attempt_at <= ?
+              AND tfd.url LIKE '%/song/%'
+            ORDER BY trd.next_attempt_at
+            LIMIT ?
+            """,
+            (now, limit),
+        ).fetchall()
+    return [
+        {
+            "track_id": track_id,
+            "url": url,
+            "status": status,
+            "attempts": attempts,
+            "fetched_at": fetched_at,
+        }
+        for track_id, url, status, attempts, fetched_at in rows
+    ]
+
+
+def try_acquire_job_lease(name: str, owner: str, ttl_seconds: float) -> bool:
+    """Take or extend the `name` lease for `owner` unless another owner holds it."""
+    now = datetime.now(UTC)
+    init_db()
+    with get_connection() as connection:
+        connection.execute(
+            """
+            INSERT INTO job_leases (name, owner, expires_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                owner = excluded.owner,
+                expires_at = excluded.expires_at
+            WHERE job_leases.owner = excluded.owner OR job_leases.expires_at < ?
+            """,
+            (name, owner, (now + timedelta(seconds=ttl_seconds)).isoformat(), now.isoformat()),
+        )
+        row = connection.execute(
+            "SELECT owner FROM job_leases WHERE name = ?", (name,)
+        ).fetchone()
+    return row is not None and row[0] == owner
+
+
+def upsert_track_remote_data(
+    track_id: str,
+    prompt: str | None,
+    tags: str | None,
+    negative_tags: str | None,
+    has_cover_clip_id: bool | None,
+    major_model_version: str | None,
+    model_name: str | None,
+    persona_name: str | None,
+) -> None:
+    upsert_tracks_remote_data(
+        [
+            {
+                "track_id": track_id,
+                "prompt": prompt,
+                "tags": tags,
+                "negative_tags": negative_tags,
+                "has_cover_clip_id": has_cover_clip_id,
+                "major_model_version": major_model_version,
+                "model_name": model_name,
+                "persona_name": persona_name,
+            }
+        ]
+    )
+
+
+def get_remote_page_cache_entry(url: str) -> dict[str, object] | None:
+    init_db()
+    with get_connection() as connection:
+        row = connection.execute(
+            """
+            SELECT content_hash, size, fetched_at, etag, last_modified
+            FROM remote_page_cache
+            WHERE url = ?
+            """,
+            (url,),
+        ).fetchone()
+    if row is None:
+        return None
+    return {
+        "content_hash": row[0],
+        "size": row[1],
+        "fetched_at": row[2],
+        "etag": row[3],
+        "last_modified": row[4],
+    }
+
+
+def upsert_remote_page_cache_entry(
+    url: str,
+    content_hash: str,
+    size: int,
+    fetched_at: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> str | None:
+    """Point `url` at a cached page and return the replaced hash if nothing uses it now."""
+    init_db()
+    with get_connection() as connection:
+        previous = connection.execute(
+            "SELECT content_hash FROM remote_page_cache WHERE url = ?", (url,)
+        ).fetchone()
+        connection.execute(
+            """
+            INSERT INTO remote_page_cache (
+                url, content_hash, size, fetched_at, etag, last_modified
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                size = excluded.size,
+                fetched_at = excluded.fetched_at,
+                etag = excluded.etag,
+                last_modified = excluded.last_modified
+            """,
+            (url, content_hash, size, fetched_at, etag, last_modified),
+        )
+        if previous is None or previous[0] == content_hash:
+            return None
+        still_used = connection.execute(
+            "SELECT 1 FROM remote_page_cache WHERE content_hash = ? LIMIT 1", (previous[0],)
+        ).fetchone()
+    return None if still_used else previous[0]
+
+
+def touch_remote_page_cache_entry(url: str, fetched_at: str) -> None:
+    """Restart the TTL of a cached page the server confirmed unchanged (304)."""
+    init_db()
+    with get_connection() as connection:
+        connection.execute(
+            "UPDATE remote_page_cache SET fetched_at = ? WHERE url = ?", (fetched_at, url)
+        )
+
+
+def get_tracks_with_cached_remote_pages() -> list[dict[str, str]]:
+    """Return `{track_id, url, content_hash}` for tracks whose page is cached."""
+    init_db()
+    with get_connection() as connection:
+        rows = connection.execute(
+            """
+            SELECT tfd.track_id, tfd.url, rpc.content_hash
+            FROM tracks_file_data AS tfd
+            JOIN remote_page_cache AS rpc ON rpc.url = tfd.url
+            ORDER BY tfd.track_id
+            """
+        ).fetchall()
+    return [
+        {"track_id": track_id, "url": url, "content_hash": content_hash}
+        for track_id, url, content_hash in rows
+    ]
+
+
 def upsert_track_user_data(
     track_id: str,
     title_new: str,
@@ -358,19 +948,153 @@ def replace_track_labels(
 
 
 def get_unknown_label_assignments() -> list[dict[str, str]]:
+    """Return label assignments whose key is missing from LABEL_CATALOG.
+
+    Only offending rows are returned: stale `label_definitions` keys are
+    filtered first and their assignments are looked up through
+    `idx_track_user_data_labels_label_id_track_id`. `CROSS JOIN` pins that
+    join order; without statistics SQLite would otherwise scan every
+    assignment.
+    """
     init_db()
-    allowed = get_allowed_label_keys()
+    allowed = sorted(get_allowed_label_keys())
+    placeholders = ", ".join("?" for _ in allowed)
     with get_connection() as connection:
         rows = connection.execute(
-            """
+            f"""
             SELECT tul.track_id, ld.key
-            FROM track_user_data_labels AS tul
-            JOIN label_definitions AS ld ON ld.id = tul.label_id
+            FROM label_definitions AS ld
+            CROSS JOIN track_user_data_labels AS tul ON tul.label_id = ld.id
+            WHERE ld.key NOT IN ({placeholders})
             ORDER BY tul.track_id, ld.key
+            """,
+            allowed,
+        ).fetchall()
+    return [{"track_id": str(row[0]), "label_key": str(row[1])} for row in rows]
+
+
+def record_track_events(events: list[tuple[str, str | None, dict[str, object]]]) -> None:
+    """Append `(event_type, track_id, data)` events and prune the oldest ones."""
+    if not events:
+        return
+    created_at = datetime.now(UTC).isoformat()
+    init_db()
+    with get_connection() as connection:
+        connection.executemany(
+            """
+            INSERT INTO track_events (event_type, track_id, data, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (event_type, track_id, json.dumps(data, separators=(",", ":")), created_at)
+                for event_type, track_id, data in events
+            ],
+        )
+        connection.execute(
+            """
+            DELETE FROM track_events
+            WHERE id <= (SELECT MAX(id) FROM track_events) - ?
+            """,
+            (TRACK_EVENTS_RETAINED,),
+        )
+
+
+def record_track_event(
+    event_type: str, track_id: str | None = None, data: dict[str, object] | None = None
+) -> None:
+    record_track_events([(event_type, track_id, data or {})])
+
+
+def get_track_event_bounds() -> tuple[int, int]:
+    """Return `(oldest_id, latest_id)` of retained events, `(0, 0)` when empty."""
+    init_db()
+    with get_connection() as connection:
+        # Separate subqueries: each is a single B-tree seek, MIN and MAX together scan.
+        row = connection.execute(
+            """
+            SELECT
+                (SELECT MIN(id) FROM track_events),
+                (SELECT MAX(id) FROM track_events)
             """
+        ).fetchone()
+    return int(row[0] or 0), int(row[1] or 0)
+
+
+def get_track_events_after(event_id: int, limit: int) -> list[dict[str, object]]:
+    # Polled by every open `/api/events` stream: one primary-key range read
+    # without `init_db()`.
+    try:
+        with get_connection() as connection:
+            rows = connection.execute(
+                """
+                SELECT id, event_type, track_id, data
+                FROM track_events
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (event_id, limit),
+            ).fetchall()
+    except sqlite3.OperationalError:
+        return []
+
+    return [
+        {"id": row[0], "event_type": row[1], "track_id": row[2], "data": json.loads(row[3])}
+        for row in rows
+    ]
+
+
+def get_row_change_bounds() -> tuple[int, int]:
+    """Return `(oldest_seq, latest_seq)` of the retained change log, `(0, 0)` when empty."""
+    init_db()
+    with get_connection() as connection:
+        row = connection.execute(
+            """
+            SELECT
+                (SELECT MIN(seq) FROM row_changes),
+                (SELECT MAX(seq) FROM row_changes)
+            """
+        ).fetchone()
+    return int(row[0] or 0), int(row[1] or 0)
+
+
+def get_changed_track_ids_after(seq: int) -> tuple[set[str], int]:
+    """Track IDs with captured row changes after `seq`, and the latest `seq` seen."""
+    init_db()
+    with get_connection() as connection:
+        rows = connection.execute(
+            """
+            SELECT track_id, seq
+            FROM row_changes
+            WHERE seq > ?
+            """,
+            (seq,),
+        ).fetchall()
+    return {str(row[0]) for row in rows if row[0]}, max((row[1] for row in rows), default=seq)
+
+
+def get_row_changes_after(seq: int, limit: int) -> list[dict[str, object]]:
+    """Captured row changes with `seq` greater than the given one, oldest first."""
+    init_db()
+    with get_connection() as connection:
+        rows = connection.execute(
+            """
+            SELECT seq, table_name, track_id, row_key, op, changed_at
+            FROM row_changes
+            WHERE seq > ?
+            ORDER BY seq
+            LIMIT ?
+            """,
+            (seq, limit),
         ).fetchall()
     return [
-        {"track_id": str(row[0]), "label_key": str(row[1])}
+        {
+            "seq": row[0],
+            "table": row[1],
+            "track_id": row[2],
+            "key": json.loads(row[3]),
+            "op": row[4],
+            "changed_at": row[5],
+        }
         for row in rows
-        if str(row[1]) not in allowed
     ]
@@ -1,19 +1,67 @@
+import hashlib
 import sqlite3
 
+# Track tables whose writes are captured by triggers, with each row's key
+# columns. Captured rows carry `updated_at`, `row_version` (bumped per change)
+# and `change_seq` (the `row_changes.seq` of their latest change).
+CHANGE_TRACKED_TABLES = {
+    "tracks_file_data": ("track_id",),
+    "track_user_data": ("track_id",),
+    "track_remote_data": ("track_id",),
+    "track_user_data_labels": ("track_id", "label_id"),
+    "track_audio_paths": ("track_id",),
+    "track_artifacts": ("track_id", "artifact_type"),
+}
+CHANGE_COLUMNS = ("updated_at", "row_version", "change_seq")
+# The log keeps deletes and the `/api/changes` backlog; consumers further
+# behind resync in full. Pruned every ROW_CHANGES_PRUNE_EVERY inserts.
+ROW_CHANGES_RETAINED = 100_000
+ROW_CHANGES_PRUNE_EVERY = 1000
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')"
+# Remote data refresh policy: `ok` rows are refetched after the max age; failed
+# rows retry after 1h, 2h, 4h, ... per consecutive failure, capped at the max age.
+REMOTE_DATA_MAX_AGE_SECONDS = 30 * 24 * 3600
+REMOTE_RETRY_BASE_SECONDS = 3600
+# Timestamp columns `export_db.py --since` filters on in tables without change
+# capture (its `SINCE_COLUMNS`); change-tracked tables use `updated_at`.
+SINCE_INDEXED_COLUMNS = {
+    "track_events": "created_at",
+    "remote_page_cache": "fetched_at",
+}
+
+
+def next_attempt_at_sql(fetched_at: str, status: str, attempts: str) -> str:
+    """SQL for `track_remote_data.next_attempt_at` from the given column expressions.
+
+    Rows never fetched get '' and sort first, i.e. are due immediately.
+    """
+    delay = (
+        f"CASE WHEN {status} = 'ok' THEN {REMOTE_DATA_MAX_AGE_SECONDS} ELSE min("
+        f"{REMOTE_RETRY_BASE_SECONDS} << min(max({attempts} - 1, 0), 30), "
+        f"{REMOTE_DATA_MAX_AGE_SECONDS}) END"
+    )
+    return (
+        f"COALESCE(strftime('%Y-%m-%dT%H:%M:%f+00:00', {fetched_at}, "
+        f"'+' || ({delay}) || ' seconds'), '')"
+    )
+
 
 def _ensure_column(
     connection: sqlite3.Connection,
     table: str,
     column: str,
     definition: str,
-) -> None:
+) -> bool:
+    """Add `column` if missing; returns True when it was just added."""
     existing = {
         row[1] for row in connection.execute(f"PRAGMA table_info({table})")
     }
-    if column not in existing:
-        connection.execute(
-            f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
-        )
+    if column in existing:
+        return False
+    connection.execute(
+        f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+    )
+    return True
 
 
 def ensure_schema(connection: sqlite3.Connection) -> None:
@@ -57,6 +105,34 @@ def ensure_schema(connection: sqlite3.Connection) -> None:
         )
         """
     )
+    # Refresh state: `fetched_at` is the last fetch attempt, `attempts` counts
+    # consecutive failed ones (reset on success).
+    if _ensure_column(
+        connection, "track_remote_data", "status", "TEXT NOT NULL DEFAULT 'ok'"
+    ):
+        connection.execute(
+            "UPDATE track_remote_data SET status = 'prompt_failed' WHERE prompt = 'failed'"
+        )
+    _ensure_column(connection, "track_remote_data", "fetched_at", "TEXT")
+    _ensure_column(
+        connection, "track_remote_data", "attempts", "INTEGER NOT NULL DEFAULT 0"
+    )
+    _ensure_column(connection, "track_remote_data", "last_error", "TEXT")
+    # When the refresh scheduler should fetch the row next; written with every
+    # success or failure so the scheduler reads only due rows off the index.
+    if _ensure_column(
+        connection, "track_remote_data", "next_attempt_at", "TEXT NOT NULL DEFAULT ''"
+    ):
+        connection.execute(
+            "UPDATE track_remote_data SET next_attempt_at = "
+            + next_attempt_at_sql("fetched_at", "status", "attempts")
+        )
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_track_remote_data_next_attempt_at
+        ON track_remote_data(next_attempt_at)
+        """
+    )
     _ensure_column(connection, "track_user_data", "remix_of", "TEXT")
     connection.execute(
         """
@@ -85,3 +161,180 @@ def ensure_schema(connection: sqlite3.Connection) -> None:
         ON track_user_data_labels (label_id, track_id)
         """
     )
+    # Serves the track list ORDER BY directly, without a temp B-tree sort.
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_tracks_file_data_date_created_filepath
+        ON tracks_file_data (date_created DESC, filepath COLLATE NOCASE)
+        """
+    )
+    # Label lists are ordered by (category, label); playlist exports filter on category.
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_label_definitions_category_label
+        ON label_definitions (category, label)
+        """
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS track_audio_paths (
+            track_id TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            FOREIGN KEY (track_id) REFERENCES tracks_file_data(track_id)
+        )
+        """
+    )
+    # One row per generated artifact kind and track. NULL size/hash records that
+    # the generator ran and produced nothing (e.g. no embedded cover).
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS track_artifacts (
+            track_id TEXT NOT NULL,
+            artifact_type TEXT NOT NULL,
+            size INTEGER,
+            content_hash TEXT,
+            generator_version INTEGER NOT NULL,
+            PRIMARY KEY (track_id, artifact_type),
+            FOREIGN KEY (track_id) REFERENCES tracks_file_data(track_id)
+        )
+        """
+    )
+    # Append-only feed for `/api/events`; readers poll by primary key.
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS track_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_type TEXT NOT NULL,
+            track_id TEXT,
+            data TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS remote_page_cache (
+            url TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at TEXT NOT NULL
+        )
+        """
+    )
+    _ensure_column(connection, "remote_page_cache", "etag", "TEXT")
+    _ensure_column(connection, "remote_page_cache", "last_modified", "TEXT")
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_remote_page_cache_content_hash
+        ON remote_page_cache(content_hash)
+        """
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_leases (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at TEXT NOT NULL
+        )
+        """
+    )
+    for table, column in SINCE_INDEXED_COLUMNS.items():
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})"
+        )
+    _ensure_change_capture(connection)
+
+
+def _capture_trigger_sql(
+    table: str, key_columns: tuple[str, ...], columns: list[str], name: str, event: str
+) -> str:
+    row = "OLD" if event == "DELETE" else "NEW"
+    log_change = f"""
+        INSERT INTO row_changes (table_name, track_id, row_key, op, changed_at)
+        VALUES (
+            '{table}',
+            {row}.track_id,
+            json_array({", ".join(f"{row}.{column}" for column in key_columns)}),
+            '{"delete" if event == "DELETE" else "upsert"}',
+            {_NOW_SQL}
+        );"""
+    if event == "DELETE":
+        return f"CREATE TRIGGER {name} AFTER DELETE ON {table} BEGIN {log_change} END"
+
+    stamp_row = f"""
+        UPDATE {table}
+        SET updated_at = {_NOW_SQL},
+            row_version = NEW.row_version + 1,
+            change_seq = last_insert_rowid()
+        WHERE rowid = NEW.rowid;"""
+    when = ""
+    if event == "UPDATE":
+        # The stamping UPDATE bumps `row_version` and so never re-fires this;
+        # upserts that rewrite identical values are not changes.
+        changed = " OR ".join(f"NEW.{column} IS NOT OLD.{column}" for column in columns)
+        when = f"WHEN NEW.row_version IS OLD.row_version AND ({changed})"
+    return (
+        f"CREATE TRIGGER {name} AFTER {event} ON {table} {when} "
+        f"BEGIN {log_change} {stamp_row} END"
+    )
+
+
+def _ensure_change_capture(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS row_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            track_id TEXT,
+            row_key TEXT NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TEXT NOT NULL
+        )
+        """
+    )
+    connection.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS row_changes_prune
+        AFTER INSERT ON row_changes
+        WHEN NEW.seq % {ROW_CHANGES_PRUNE_EVERY} = 0
+        BEGIN
+            DELETE FROM row_changes WHERE seq <= NEW.seq - {ROW_CHANGES_RETAINED};
+        END
+        """
+    )
+    triggers = {
+        row[0]
+        for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'cdc_%'"
+        )
+    }
+    for table, key_columns in CHANGE_TRACKED_TABLES.items():
+        # Rows from before change capture count as changed when it was added.
+        if _ensure_column(connection, table, "updated_at", "TEXT"):
+            connection.execute(f"UPDATE {table} SET updated_at = {_NOW_SQL}")
+        _ensure_column(connection, table, "row_version", "INTEGER NOT NULL DEFAULT 0")
+        _ensure_column(connection, table, "change_seq", "INTEGER")
+        # Delta exports read `change_seq > watermark` and `--since` exports read
+        # `updated_at >= since` instead of scanning.
+        for column in ("change_seq", "updated_at"):
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})"
+            )
+        columns = [
+            row[1]
+            for row in connection.execute(f"PRAGMA table_info({table})")
+            if row[1] not in CHANGE_COLUMNS
+        ]
+        # Trigger names carry a hash of the column list, so a later
+        # `_ensure_column` migration replaces the triggers that compare columns.
+        version = hashlib.sha1(",".join(columns).encode()).hexdigest()[:8]
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            name = f"cdc_{table}_{event.lower()}_{version}"
+            if name in triggers:
+                continue
+            for stale in sorted(triggers):
+                if stale.startswith(f"cdc_{table}_{event.lower()}_"):
+                    connection.execute(f"DROP TRIGGER {stale}")
+            connection.execute(_capture_trigger_sql(table, key_columns, columns, name, event))
@@ -0,0 +1,227 @@
+"""Pooled keep-alive HTTP client for remote metadata fetches.
+
+Inputs:
+- GET requests (absolute http/https URLs plus extra headers).
+
+Outputs:
+- `HttpResponse` with status, headers and the decoded body.
+- Optionally the text of a 2xx body, passed to a callback piece by piece as
+  it is read (so callers can parse while the page downloads).
+- `urllib.error.HTTPError` for 4xx/5xx statuses, `TimeoutError` when the
+  connect or read timeout expires.
+
+Side effects:
+- Keeps idle persistent connections per scheme, host and port for reuse
+  (shared by the backfill threads).
+"""
+
+import codecs
+import http.client
+import socket
+import threading
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from email.message import Message
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import brotli
+except ImportError:  # Optional dependency: only gzip/deflate are requested.
+    brotli = None
+
+CONNECT_TIMEOUT_SECONDS = 5.0
+READ_TIMEOUT_SECONDS = 20.0
+# At least the backfill concurrency, so every worker finds a warm connection.
+MAX_IDLE_CONNECTIONS_PER_HOST = 8
+MAX_REDIRECTS = 5
+READ_CHUNK_BYTES = 64 * 1024
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+# A reused connection the server already closed fails on first use.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+def accepted_content_encodings() -> str:
+    return "br, gzip, deflate" if brotli is not None else "gzip, deflate"
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    url: str
+    status: int
+    reason: str
+    headers: Message
+    body: bytes
+
+    def text(self) -> str:
+        charset = self.headers.get_content_charset() or "utf-8"
+        return self.body.decode(charset, errors="replace")
+
+
+def _body_decompressor(content_encoding: str | None) -> Callable[[bytes], bytes]:
+    """Incremental decoder for a body in `content_encoding`, fed one read at a time."""
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == "deflate":
+        return zlib.decompressobj().decompress
+    if encoding == "br" and brotli is not None:
+        return brotli.Decompressor().process
+    return lambda data: data
+
+
+def _read_body(
+    response: http.client.HTTPResponse, on_text: Callable[[str], None] | None
+) -> bytes:
+    """Read and decode the whole body, passing 2xx text to `on_text` as it arrives."""
+    decompress = _body_decompressor(response.getheader("Content-Encoding"))
+    text_decoder = None
+    if on_text is not None and 200 <= response.status < 300:
+        charset = response.msg.get_content_charset() or "utf-8"
+        text_decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    parts = []
+    while chunk := response.read(READ_CHUNK_BYTES):
+        data = decompress(chunk)
+        parts.append(data)
+        if text_decoder is not None:
+            on_text(text_decoder.decode(data))
+    if text_decoder is not None:
+        on_text(text_decoder.decode(b"", final=True))
+    return b"".join(parts)
+
+
+class HttpConnectionPool:
+    """Thread-safe pool of idle `http.client` connections keyed by origin."""
+
+    def __init__(
+        self,
+        connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = READ_TIMEOUT_SECONDS,
+        max_idle_per_host: int = MAX_IDLE_CONNECTIONS_PER_HOST,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self, origin: tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = origin
+        connection_class = (
+            http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        )
+        connection = connection_class(host, port, timeout=self.connect_timeout)
+        try:
+            connection.connect()
+        except socket.timeout as error:
+            connection.close()
+            raise TimeoutError(f"Connecting to {host}:{port} timed out.") from error
+        connection.sock.settimeout(self.read_timeout)
+        return connection
+
+    def _checkout(
+        self, origin: tuple[str, str, int]
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(origin)
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(origin), False
+
+    def _checkin(
+        self, origin: tuple[str, str, int], connection: http.client.HTTPConnection
+    ) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _request_once(
+        self,
+        url: str,
+        headers: dict[str, str],
+        on_text: Callable[[str], None] | None = None,
+    ) -> HttpResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        origin = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        request_headers = {"Accept-Encoding": accepted_content_encodings(), **headers}
+
+        connection, reused = self._checkout(origin)
+        try:
+            try:
+                connection.request("GET", target, headers=request_headers)
+                response = connection.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                connection.close()
+                connection, reused = self._new_connection(origin), False
+                connection.request("GET", target, headers=request_headers)
+                response = connection.getresponse()
+            body = _read_body(response, on_text)
+        except socket.timeout as error:
+            connection.close()
+            raise TimeoutError(f"Reading {url} timed out.") from error
+        except BaseException:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(origin, connection)
+        return HttpResponse(url, response.status, response.reason, response.msg, body)
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        on_text: Callable[[str], None] | None = None,
+    ) -> HttpResponse:
+        """GET `url`, following redirects; 2xx and 304 return, other statuses raise.
+
+        `on_text` receives the final 2xx body's text in pieces while it is read;
+        the returned response still carries the whole body.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._request_once(url, headers or {}, on_text)
+            location = response.headers.get("Location")
+            if response.status in REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                raise HTTPError(url, response.status, response.reason, response.headers, None)
+            return response
+        raise HTTPError(url, response.status, "Too many redirects.", response.headers, None)
+
+
+_default_pool = HttpConnectionPool()
+
+
+def http_get(
+    url: str,
+    headers: dict[str, str] | None = None,
+    on_text: Callable[[str], None] | None = None,
+) -> HttpResponse:
+    return _default_pool.get(url, headers, on_text)
@@ -0,0 +1,93 @@
+"""Server-Sent Events stream of track changes for open browser tabs.
+
+Inputs:
+- Rows appended to `track_events` by API routes and the scan (from any worker).
+- `Last-Event-ID` header (browser reconnects) or `?after=<id>`.
+
+Outputs:
+- `GET /api/events` as `text/event-stream`: one `id`/`event`/`data` block per
+  change and heartbeat comments while idle.
+
+Side effects:
+- Polls SQLite by primary key once per interval for each open stream.
+- Holds one worker thread per open stream; streams end after
+  `EVENTS_STREAM_MAX_SECONDS` and the browser reconnects from its last ID.
+"""
+
+import json
+import time
+from collections.abc import Callable, Iterator
+
+from flask import Flask, Response, jsonify, request
+
+from .db import get_track_event_bounds, get_track_events_after
+
+# Change event types (TRACK_EVENT_*) live next to `record_track_events()` in
+# `dekho/db.py`, so the scan can publish them without importing Flask.
+# Sent instead of a backlog the DB no longer holds; the client must reload.
+STREAM_RESET = "reset"
+
+EVENTS_BATCH_LIMIT = 200
+HEARTBEAT_INTERVAL_SECONDS = 15.0
+RECONNECT_DELAY_MS = 2000
+
+
+def format_event(event: dict[str, object]) -> str:
+    data = dict(event["data"])
+    if event["track_id"] is not None:
+        data["track_id"] = event["track_id"]
+    payload = json.dumps(data, separators=(",", ":"))
+    return f"id: {event['id']}\nevent: {event['event_type']}\ndata: {payload}\n\n"
+
+
+def stream_track_events(
+    last_event_id: int,
+    poll_interval_seconds: float,
+    max_seconds: float,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> Iterator[str]:
+    yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+    oldest_event_id, latest_event_id = get_track_event_bounds()
+    if last_event_id < oldest_event_id - 1:
+        yield f"id: {latest_event_id}\nevent: {STREAM_RESET}\ndata: {{}}\n\n"
+        last_event_id = latest_event_id
+
+    started_at = last_write_at = clock()
+    while clock() - started_at < max_seconds:
+        events = get_track_events_after(last_event_id, EVENTS_BATCH_LIMIT)
+        for event in events:
+            yield format_event(event)
+            last_event_id = int(event["id"])
+        if events:
+            last_write_at = clock()
+            if len(events) == EVENTS_BATCH_LIMIT:
+                continue
+        elif clock() - last_write_at >= HEARTBEAT_INTERVAL_SECONDS:
+            yield ": keepalive\n\n"
+            last_write_at = clock()
+        sleep(poll_interval_seconds)
+
+
+def register_live_events(app: Flask) -> None:
+    @app.get("/api/events")
+    def track_events():
+        raw_last_event_id = request.headers.get("Last-Event-ID") or request.args.get("after")
+        if raw_last_event_id is None:
+            # New tabs rendered the list from current data; start at the tip.
+            last_event_id = get_track_event_bounds()[1]
+        else:
+            try:
+                last_event_id = int(raw_last_event_id)
+            except ValueError:
+                return jsonify({"error": "Last event ID must be an integer."}), 400
+
+        return Response(
+            stream_track_events(
+                last_event_id,
+                float(app.config["EVENTS_POLL_INTERVAL_SECONDS"]),
+                float(app.config["EVENTS_STREAM_MAX_SECONDS"]),
+            ),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
@@ -0,0 +1,215 @@
+"""In-process request metrics exposed in Prometheus text format.
+
+Inputs:
+- Flask request lifecycle hooks and template render signals.
+- SQL statement timings from the DB statement observer hook.
+
+Outputs:
+- `GET /api/metrics` in Prometheus text exposition format (version 0.0.4).
+
+Side effects:
+- Registers a process-wide DB statement observer.
+- Keeps histograms in memory; each gunicorn worker reports its own process.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from flask import Flask, Response, before_render_template, g, request, template_rendered
+
+from .db import add_statement_observer
+
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250)
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class _RequestSqlStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+_request_sql_stats: ContextVar[_RequestSqlStats | None] = ContextVar(
+    "dekho_request_sql_stats", default=None
+)
+
+
+def _record_statement(sql: str, parameters: object, elapsed: float) -> None:
+    stats = _request_sql_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+
+
+@dataclass
+class _HistogramSeries:
+    bucket_counts: list[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: tuple[str, ...], value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = _HistogramSeries(bucket_counts=[0] * len(self.buckets))
+                self._series[label_values] = series
+            if index < len(self.buckets):
+                series.bucket_counts[index] += 1
+            series.count += 1
+            series.total += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {
+                labels: (list(series.bucket_counts), series.count, series.total)
+                for labels, series in self._series.items()
+            }
+        for label_values, (bucket_counts, count, total) in sorted(snapshot.items()):
+            labels = list(zip(self.label_names, label_values))
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels([*labels, ("le", _format_number(upper_bound))])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f'{self.name}_bucket{_format_labels([*labels, ("le", "+Inf")])} {count}')
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: list[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.request_duration = Histogram(
+            "dekho_http_request_duration_seconds",
+            "Request latency by route template, method and status.",
+            ("route", "method", "status"),
+            LATENCY_BUCKETS_SECONDS,
+        )
+        self.response_size = Histogram(
+            "dekho_http_response_size_bytes",
+            "Response body size (after compression) by route template.",
+            ("route",),
+            SIZE_BUCKETS_BYTES,
+        )
+        self.request_sql_statements = Histogram(
+            "dekho_http_request_sql_statements",
+            "SQL statements executed per request by route template.",
+            ("route",),
+            SQL_COUNT_BUCKETS,
+        )
+        self.request_sql_duration = Histogram(
+            "dekho_http_request_sql_duration_seconds",
+            "Total SQL execute and fetch time per request by route template.",
+            ("route",),
+            LATENCY_BUCKETS_SECONDS,
+        )
+        self.template_render_duration = Histogram(
+            "dekho_template_render_duration_seconds",
+            "Jinja template render time by template name.",
+            ("template",),
+            LATENCY_BUCKETS_SECONDS,
+        )
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for histogram in (
+            self.request_duration,
+            self.response_size,
+            self.request_sql_statements,
+            self.request_sql_duration,
+            self.template_render_duration,
+        ):
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+
+def register_metrics(app: Flask) -> MetricsRegistry:
+    registry = MetricsRegistry()
+    app.extensions["dekho_metrics"] = registry
+    add_statement_observer(_record_statement)
+
+    @app.before_request
+    def _start_request_metrics() -> None:
+        g.metrics_started_at = time.perf_counter()
+        g.metrics_sql_stats = _RequestSqlStats()
+        g.metrics_sql_token = _request_sql_stats.set(g.metrics_sql_stats)
+
+    @app.after_request
+    def _record_request_metrics(response: Response) -> Response:
+        started_at = g.pop("metrics_started_at", None)
+        sql_stats = g.pop("metrics_sql_stats", None)
+        if started_at is None or sql_stats is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+        registry.request_duration.observe(
+            (route, request.method, str(response.status_code)),
+            time.perf_counter() - started_at,
+        )
+        registry.request_sql_statements.observe((route,), sql_stats.statements)
+        registry.request_sql_duration.observe((route,), sql_stats.seconds)
+        if response.content_length is not None:
+            registry.response_size.observe((route,), response.content_length)
+        return response
+
+    @app.teardown_request
+    def _reset_request_metrics(_error: BaseException | None) -> None:
+        token = g.pop("metrics_sql_token", None)
+        if token is not None:
+            _request_sql_stats.reset(token)
+
+    def _template_started(sender, template, context, **_extra) -> None:
+        g.metrics_template_started_at = time.perf_counter()
+
+    def _template_finished(sender, template, context, **_extra) -> None:
+        started_at = g.pop("metrics_template_started_at", None)
+        if started_at is not None:
+            registry.template_render_duration.observe(
+                (template.name or "<string>",), time.perf_counter() - started_at
+            )
+
+    before_render_template.connect(_template_started, app, weak=False)
+    template_rendered.connect(_template_finished, app, weak=False)
+
+    @app.get("/api/metrics")
+    def metrics() -> Response:
+        return Response(registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+    return registry
@@ -0,0 +1,150 @@
+"""Compressed, content-addressed cache of fetched Suno track pages.
+
+Inputs:
+- Track page URLs and the raw HTML fetched for them.
+
+Outputs:
+- Cached HTML for a URL while it is younger than the requested max age.
+- The page's `ETag` / `Last-Modified` validators for conditional refetches.
+
+Side effects:
+- Writes gzip blobs to `./remote_pages/<hash[:2]>/<sha256>.html.gz`.
+- Records `url -> content_hash, size, fetched_at, etag, last_modified` in
+  `remote_page_cache`.
+- Deletes a blob once no URL points at it anymore.
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from .db import (
+    get_remote_page_cache_entry,
+    touch_remote_page_cache_entry,
+    upsert_remote_page_cache_entry,
+)
+
+PAGE_CACHE_ROOT = Path("./remote_pages")
+# Suno pages rarely change once a song is published; a week keeps repeated
+# backfills and refetch clicks off the network while still picking up edits.
+PAGE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+GZIP_COMPRESS_LEVEL = 9
+STREAM_CHUNK_CHARS = 64 * 1024
+
+
+def _blob_path(content_hash: str, cache_root: Path) -> Path:
+    return cache_root / content_hash[:2] / f"{content_hash}.html.gz"
+
+
+def read_cached_blob(content_hash: str, cache_root: Path = PAGE_CACHE_ROOT) -> str | None:
+    try:
+        compressed = _blob_path(content_hash, cache_root).read_bytes()
+    except FileNotFoundError:
+        return None
+    return gzip.decompress(compressed).decode("utf-8", errors="replace")
+
+
+def iter_cached_blob(
+    content_hash: str,
+    cache_root: Path = PAGE_CACHE_ROOT,
+    chunk_chars: int = STREAM_CHUNK_CHARS,
+) -> Iterator[str] | None:
+    """Decompress a cached page piece by piece; closing the iterator stops early."""
+    blob_path = _blob_path(content_hash, cache_root)
+    if not blob_path.is_file():
+        return None
+
+    def chunks() -> Iterator[str]:
+        with gzip.open(blob_path, "rt", encoding="utf-8", errors="replace") as stream:
+            while text := stream.read(chunk_chars):
+                yield text
+
+    return chunks()
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    html: str
+    fetched_at: datetime
+    etag: str | None
+    last_modified: str | None
+
+    def age_seconds(self) -> float:
+        return (datetime.now(UTC) - self.fetched_at).total_seconds()
+
+    def revalidation_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def get_cached_page(url: str, cache_root: Path = PAGE_CACHE_ROOT) -> CachedPage | None:
+    """Return the cached page for `url` whatever its age, or None if not cached."""
+    entry = get_remote_page_cache_entry(url)
+    if entry is None:
+        return None
+    html = read_cached_blob(str(entry["content_hash"]), cache_root)
+    if html is None:
+        return None
+    return CachedPage(
+        html=html,
+        fetched_at=datetime.fromisoformat(str(entry["fetched_at"])),
+        etag=entry["etag"],
+        last_modified=entry["last_modified"],
+    )
+
+
+def load_cached_page(
+    url: str, max_age_seconds: float | None, cache_root: Path = PAGE_CACHE_ROOT
+) -> str | None:
+    """Return the cached page for `url`, or None if missing or older than `max_age_seconds`.
+
+    `max_age_seconds=None` accepts any age.
+    """
+    cached = get_cached_page(url, cache_root)
+    if cached is None:
+        return None
+    if max_age_seconds is not None and cached.age_seconds() > max_age_seconds:
+        return None
+    return cached.html
+
+
+def mark_page_revalidated(url: str) -> None:
+    touch_remote_page_cache_entry(url, datetime.now(UTC).isoformat())
+
+
+def store_page(
+    url: str,
+    html: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    cache_root: Path = PAGE_CACHE_ROOT,
+) -> str:
+    """Cache `html` for `url` with its validators and return its content hash."""
+    body = html.encode("utf-8")
+    content_hash = hashlib.sha256(body).hexdigest()
+    blob_path = _blob_path(content_hash, cache_root)
+    if not blob_path.is_file():
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        # Backfill threads may store the same page at once; replace is atomic.
+        descriptor, temporary_name = tempfile.mkstemp(
+            dir=blob_path.parent, prefix=".", suffix=".part"
+        )
+        with os.fdopen(descriptor, "wb") as temporary_file:
+            temporary_file.write(gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0))
+        os.replace(temporary_name, blob_path)
+
+    orphaned_hash = upsert_remote_page_cache_entry(
+        url, content_hash, len(body), datetime.now(UTC).isoformat(), etag, last_modified
+    )
+    if orphaned_hash is not None:
+        _blob_path(orphaned_hash, cache_root).unlink(missing_ok=True)
+    return content_hash
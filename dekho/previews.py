@@ -0,0 +1,111 @@
+"""Low-bitrate preview transcodes for fast playback start.
+
+Inputs:
+- Track ID and the resolved source audio path.
+
+Outputs:
+- Path to a cached preview MP3 under `./previews/<first-char>/<track_id>.mp3`.
+
+Side effects:
+- Runs ffmpeg in a bounded worker pool; concurrent requests for the same track
+  share one transcode.
+- Writes preview files (atomically, via a temporary file).
+"""
+
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+PREVIEWS_ROOT = Path("./previews")
+PREVIEW_AUDIO_BITRATE = "96k"
+PREVIEW_EXTENSION = "mp3"
+PREVIEW_MAX_WORKERS = 2
+PREVIEW_WAIT_TIMEOUT_SECONDS = 120
+
+
+def preview_path_for(track_id: str, previews_root: Path = PREVIEWS_ROOT) -> Path:
+    return previews_root / track_id[0] / f"{track_id}.{PREVIEW_EXTENSION}"
+
+
+def is_preview_fresh(preview_path: Path, source_path: Path) -> bool:
+    try:
+        return preview_path.stat().st_mtime_ns >= source_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def transcode_preview(source_path: Path, output_path: Path) -> Path:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = output_path.with_name(f".{output_path.name}.part")
+    command = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-y",
+        "-i",
+        str(source_path),
+        "-vn",
+        "-map_metadata",
+        "-1",
+        "-codec:a",
+        "libmp3lame",
+        "-b:a",
+        PREVIEW_AUDIO_BITRATE,
+        "-f",
+        "mp3",
+        str(temporary_path),
+    ]
+    try:
+        subprocess.run(command, capture_output=True, check=True)
+        temporary_path.replace(output_path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+    return output_path
+
+
+class PreviewTranscoder:
+    """Bounded, single-flight preview transcode cache."""
+
+    def __init__(
+        self,
+        previews_root: Path = PREVIEWS_ROOT,
+        max_workers: int = PREVIEW_MAX_WORKERS,
+    ) -> None:
+        self.previews_root = previews_root
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="dekho-preview"
+        )
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future[Path]] = {}
+
+    def get_preview(
+        self,
+        track_id: str,
+        source_path: Path,
+        timeout: float | None = PREVIEW_WAIT_TIMEOUT_SECONDS,
+    ) -> Path:
+        preview_path = preview_path_for(track_id, self.previews_root.resolve())
+        if is_preview_fresh(preview_path, source_path):
+            return preview_path
+
+        with self._lock:
+            future = self._in_flight.get(track_id)
+            if future is None:
+                future = self._executor.submit(
+                    self._transcode, track_id, source_path, preview_path
+                )
+                self._in_flight[track_id] = future
+        return future.result(timeout=timeout)
+
+    def _transcode(self, track_id: str, source_path: Path, preview_path: Path) -> Path:
+        try:
+            if is_preview_fresh(preview_path, source_path):
+                return preview_path
+            return transcode_preview(source_path, preview_path)
+        finally:
+            with self._lock:
+                self._in_flight.pop(track_id, None)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,242 @@
+"""Concurrent backfill of Suno remote metadata for tracks that have none.
+
+Inputs:
+- Tracks with a Suno URL and no `track_remote_data` row, plus failed tracks
+  whose retry backoff has elapsed.
+- Concurrency, per-host request rate, retry and batch limits.
+
+Outputs:
+- `BackfillSummary` with stored and failed tracks.
+
+Side effects:
+- Fetches track pages from a thread pool, spacing requests to the same host.
+- Writes results in batches through `upsert_tracks_remote_data()` and
+  publishes `track_remote_data_fetched` events for open clients.
+- Records fetch failures with `record_remote_data_failures()`; a later
+  backfill (or `remote_refresh`) retries them once their backoff has elapsed.
+- Progress lives in the table itself: an interrupted run keeps every flushed
+  batch and the next run only selects tracks that are still missing.
+- `reparse_cached_remote_data()` re-extracts every track from the page cache
+  without network access, e.g. after a parser improvement.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from http.client import HTTPException
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+
+from .db import (
+    REMOTE_DATA_COLUMNS,
+    TRACK_EVENT_REMOTE_DATA_FETCHED,
+    get_tracks_missing_remote_data,
+    get_tracks_with_cached_remote_pages,
+    record_remote_data_failures,
+    record_track_events,
+    upsert_tracks_remote_data,
+)
+from .page_cache import iter_cached_blob
+from .remote_metadata import fetch_suno_track_metadata, parse_suno_track_chunks
+
+DEFAULT_CONCURRENCY = 4
+# Every track lives on suno.com, so this is effectively the global request rate.
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BATCH_SIZE = 25
+RETRY_BACKOFF_SECONDS = 1.0
+MAX_RETRY_DELAY_SECONDS = 60.0
+RETRYABLE_HTTP_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class BackfillSummary:
+    total: int = 0
+    stored: int = 0
+    failed: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def done(self) -> int:
+        return self.stored + len(self.failed)
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least `1 / requests_per_second` apart."""
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self._interval
+        if slot > now:
+            self._sleep(slot - now)
+
+
+def _retry_delay(error: Exception, attempt: int) -> float | None:
+    """Seconds to wait before the next attempt, or None if `error` is permanent."""
+    if isinstance(error, HTTPError):
+        if error.code not in RETRYABLE_HTTP_STATUSES:
+            return None
+        retry_after = error.headers.get("Retry-After") if error.headers else None
+        if retry_after is not None and retry_after.strip().isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY_SECONDS)
+    elif not isinstance(error, (URLError, HTTPException, TimeoutError, ConnectionError)):
+        # ValueError and friends: the page was read but holds no usable metadata.
+        return None
+    return min(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1), MAX_RETRY_DELAY_SECONDS)
+
+
+def fetch_with_retries(
+    url: str,
+    limiter: HostRateLimiter,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    fetch: Callable[[str], dict[str, object]] = fetch_suno_track_metadata,
+    sleep: Callable[[float], None] = time.sleep,
+) -> dict[str, object]:
+    attempt = 1
+    while True:
+        limiter.wait(url)
+        try:
+            return fetch(url)
+        except Exception as error:
+            delay = _retry_delay(error, attempt)
+            if delay is None or attempt >= max_attempts:
+                raise
+        sleep(delay)
+        attempt += 1
+
+
+def _remote_data_row(track_id: str, metadata: dict[str, object]) -> dict[str, object]:
+    return {"track_id": track_id, **{key: metadata.get(key) for key in REMOTE_DATA_COLUMNS}}
+
+
+def _store_batch(batch: list[dict[str, object]]) -> None:
+    if batch:
+        upsert_tracks_remote_data(batch)
+        record_track_events(
+            [(TRACK_EVENT_REMOTE_DATA_FETCHED, row["track_id"], {}) for row in batch]
+        )
+        batch.clear()
+
+
+def fetch_and_store_remote_data(
+    pending: list[dict[str, str]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fetch: Callable[[str], dict[str, object]] = fetch_suno_track_metadata,
+    sleep: Callable[[float], None] = time.sleep,
+    on_progress: Callable[[BackfillSummary], None] | None = None,
+) -> BackfillSummary:
+    """Fetch every `{track_id, url}` in `pending` and store results and failures in batches."""
+    summary = BackfillSummary(total=len(pending))
+    if not pending:
+        return summary
+
+    limiter = HostRateLimiter(requests_per_second, sleep=sleep)
+    batch: list[dict[str, object]] = []
+    failures: list[tuple[str, str]] = []
+
+    def flush() -> None:
+        _store_batch(batch)
+        record_remote_data_failures(failures)
+        failures.clear()
+        if on_progress is not None:
+            on_progress(summary)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        futures = {
+            executor.submit(
+                fetch_with_retries, track["url"], limiter, max_attempts, fetch, sleep
+            ): track["track_id"]
+            for track in pending
+        }
+        for future in as_completed(futures):
+            track_id = futures[future]
+            try:
+                metadata = future.result()
+            except Exception as error:
+                summary.failed[track_id] = str(error) or type(error).__name__
+                failures.append((track_id, summary.failed[track_id]))
+                continue
+            batch.append(_remote_data_row(track_id, metadata))
+            summary.stored += 1
+            if len(batch) >= batch_size:
+                flush()
+    finally:
+        # On Ctrl+C drop queued fetches but keep everything already fetched.
+        executor.shutdown(wait=True, cancel_futures=True)
+        flush()
+    return summary
+
+
+def backfill_remote_data(
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    limit: int | None = None,
+    fetch: Callable[[str], dict[str, object]] = fetch_suno_track_metadata,
+    sleep: Callable[[float], None] = time.sleep,
+    on_progress: Callable[[BackfillSummary], None] | None = None,
+) -> BackfillSummary:
+    """Fetch remote metadata for every track that lacks it (or is due a retry) in batches."""
+    return fetch_and_store_remote_data(
+        get_tracks_missing_remote_data(limit),
+        concurrency=concurrency,
+        requests_per_second=requests_per_second,
+        max_attempts=max_attempts,
+        batch_size=batch_size,
+        fetch=fetch,
+        sleep=sleep,
+        on_progress=on_progress,
+    )
+
+
+def reparse_cached_remote_data(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_progress: Callable[[BackfillSummary], None] | None = None,
+) -> BackfillSummary:
+    """Re-run metadata extraction on the cached page of every track; no network access."""
+    cached_tracks = get_tracks_with_cached_remote_pages()
+    summary = BackfillSummary(total=len(cached_tracks))
+    batch: list[dict[str, object]] = []
+    for track in cached_tracks:
+        page_chunks = iter_cached_blob(track["content_hash"])
+        if page_chunks is None:
+            summary.failed[track["track_id"]] = "Cached page file is missing."
+            continue
+        try:
+            metadata = parse_suno_track_chunks(page_chunks)
+        except ValueError as error:
+            summary.failed[track["track_id"]] = str(error)
+            continue
+        finally:
+            page_chunks.close()
+        batch.append(_remote_data_row(track["track_id"], metadata))
+        summary.stored += 1
+        if len(batch) >= batch_size:
+            _store_batch(batch)
+            if on_progress is not None:
+                on_progress(summary)
+    _store_batch(batch)
+    if on_progress is not None:
+        on_progress(summary)
+    return summary
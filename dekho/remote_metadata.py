@@ -1,8 +1,14 @@
 import json
 import re
+from collections.abc import Callable, Iterable
 from typing import Any
-from urllib.request import Request, urlopen
 
+from .http_client import http_get
+from .page_cache import PAGE_CACHE_TTL_SECONDS, get_cached_page, mark_page_revalidated, store_page
+
+USER_AGENT = "Mozilla/5.0"
+
+PUSH_PREFIX = "self.__next_f.push("
 PUSH_RE = re.compile(
     r'self\.__next_f\.push\(\[\d+,\s*"((?:\\.|[^"\\])*)"\]\)</script>',
     re.DOTALL,
@@ -19,10 +25,36 @@ def _walk(node: Any):
             yield from _walk(value)
 
 
-def _read_html(url: str) -> str:
-    request = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    with urlopen(request) as response:
-        return response.read().decode("utf-8", errors="replace")
+def _read_html(
+    url: str,
+    max_cache_age_seconds: float = PAGE_CACHE_TTL_SECONDS,
+    on_text: Callable[[str], None] | None = None,
+) -> str:
+    """Return the page at `url`, from the cache while fresh enough.
+
+    A page fetched from the network is also passed to `on_text` piece by piece
+    while it downloads; cached and revalidated pages are not.
+    """
+    cached = get_cached_page(url)
+    if cached is not None and cached.age_seconds() <= max_cache_age_seconds:
+        return cached.html
+
+    headers = {"User-Agent": USER_AGENT}
+    if cached is not None:
+        headers.update(cached.revalidation_headers())
+    response = http_get(url, headers, on_text)
+    if response.status == 304 and cached is not None:
+        mark_page_revalidated(url)
+        return cached.html
+
+    html = response.text()
+    store_page(
+        url,
+        html,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    return html
 
 
 TEXT_REF_RE = re.compile(r"^([0-9A-Za-z]+):T[0-9a-fA-F]+,$")
@@ -41,6 +73,9 @@ MODEL_SIGNAL_KEYS = {
     "major_model_version",
     "model_name",
 }
+# A payload without any of these quoted keys cannot hold a candidate node, so
+# it is skipped before `json.loads` (most Flight payloads are UI trees).
+SIGNAL_KEY_TOKENS = tuple(f'"{key}"' for key in sorted(CONTENT_SIGNAL_KEYS | MODEL_SIGNAL_KEYS))
 
 
 def _looks_like_flight_control_chunk(decoded: str) -> bool:
@@ -92,6 +127,8 @@ def _extract_from_decoded_chunk(
         payload = payload.strip()
         if not payload or payload[0] not in "[{":
             continue
+        if not any(token in payload for token in SIGNAL_KEY_TOKENS):
+            continue
 
         try:
             obj = json.loads(payload)
@@ -215,42 +252,139 @@ def _get_first_present_value(
     return None
 
 
-def fetch_suno_track_metadata(track_url: str) -> dict[str, str | bool | None]:
+def fetch_suno_track_metadata(
+    track_url: str, max_cache_age_seconds: float = PAGE_CACHE_TTL_SECONDS
+) -> dict[str, str | bool | None]:
     if not track_url.startswith(("http://", "https://")):
         raise ValueError("Track URL is missing or invalid.")
     if "/song/" not in track_url:
         raise ValueError("Track URL is not a Suno track URL.")
 
-    html = _read_html(track_url)
-    text_refs: dict[str, str] = {}
-    pending_text_ref_id: str | None = None
-    best_content_candidate: dict[str, Any] | None = None
-    best_model_candidate: dict[str, Any] | None = None
-    decoded_chunks: list[str] = []
-
-    for match in PUSH_RE.finditer(html):
-        escaped = match.group(1)
-        decoded = json.loads(f'"{escaped}"')
-        decoded_chunks.append(decoded)
-        content_candidate, model_candidate, refs, pending_text_ref_id = _extract_from_decoded_chunk(
-            decoded, pending_text_ref_id
+    # A downloaded page is parsed as it arrives; a cached one arrives whole.
+    parser = FlightPageParser()
+    streamed = False
+
+    def feed(text: str) -> None:
+        nonlocal streamed
+        streamed = True
+        parser.feed(text)
+
+    html = _read_html(track_url, max_cache_age_seconds, feed)
+    if not streamed:
+        parser.feed(html)
+    return parser.result()
+
+
+def parse_suno_track_html(html: str) -> dict[str, str | bool | None]:
+    """Extract remote metadata from a whole track page (fetched or cached)."""
+    return parse_suno_track_chunks([html])
+
+
+def parse_suno_track_chunks(chunks: Iterable[str]) -> dict[str, str | bool | None]:
+    """Extract remote metadata from page text arriving in pieces.
+
+    Stops pulling from `chunks` as soon as later input can no longer change
+    the result (see `FlightPageParser.done`).
+    """
+    parser = FlightPageParser()
+    for text in chunks:
+        parser.feed(text)
+        if parser.done:
+            break
+    return parser.result()
+
+
+class FlightPageParser:
+    """Incremental `self.__next_f.push(...)` parser with early termination.
+
+    Gives the same result as parsing the whole page at once:
+    - candidates still win by signal key count with ties going to the first;
+    - only chunks the lyrics fallback could use are kept (not every chunk);
+    - `done` turns true once the content candidate carries every content
+      signal key, the model candidate every model key, and its prompt
+      resolves to a valid one. No later chunk can beat or change those.
+      `stop_early=False` parses every chunk (benchmark baseline).
+    """
+
+    def __init__(self, stop_early: bool = True) -> None:
+        self._stop_early = stop_early
+        self._buffer = ""
+        self._text_refs: dict[str, str] = {}
+        self._pending_text_ref_id: str | None = None
+        self._best_content_candidate: dict[str, Any] | None = None
+        self._best_model_candidate: dict[str, Any] | None = None
+        self._lyrics_chunks: list[str] = []
+        self.done = False
+
+    def feed(self, text: str) -> None:
+        if self.done:
+            return
+        self._buffer += text
+        consumed = 0
+        for match in PUSH_RE.finditer(self._buffer):
+            consumed = match.end()
+            self._add_chunk(json.loads(f'"{match.group(1)}"'))
+            if self._stop_early and self._is_complete():
+                self.done = True
+                self._buffer = ""
+                return
+        # Keep only what may start a push whose closing tag has not arrived yet.
+        rest = self._buffer[consumed:]
+        start = rest.find(PUSH_PREFIX)
+        self._buffer = rest[start:] if start >= 0 else rest[-(len(PUSH_PREFIX) - 1) :]
+
+    def _add_chunk(self, decoded: str) -> None:
+        if not _looks_like_flight_control_chunk(decoded):
+            self._lyrics_chunks.append(decoded)
+        content_candidate, model_candidate, refs, self._pending_text_ref_id = (
+            _extract_from_decoded_chunk(decoded, self._pending_text_ref_id)
         )
-        text_refs.update(refs)
+        self._text_refs.update(refs)
 
         if content_candidate is not None and (
-            best_content_candidate is None
+            self._best_content_candidate is None
             or len(CONTENT_SIGNAL_KEYS.intersection(content_candidate.keys()))
-            > len(CONTENT_SIGNAL_KEYS.intersection(best_content_candidate.keys()))
+            > len(CONTENT_SIGNAL_KEYS.intersection(self._best_content_candidate.keys()))
         ):
-            best_content_candidate = content_candidate
+            self._best_content_candidate = content_candidate
 
         if model_candidate is not None and (
-            best_model_candidate is None
+            self._best_model_candidate is None
             or len(MODEL_SIGNAL_KEYS.intersection(model_candidate.keys()))
-            > len(MODEL_SIGNAL_KEYS.intersection(best_model_candidate.keys()))
+            > len(MODEL_SIGNAL_KEYS.intersection(self._best_model_candidate.keys()))
         ):
-            best_model_candidate = model_candidate
+            self._best_model_candidate = model_candidate
+
+    def _is_complete(self) -> bool:
+        content = self._best_content_candidate
+        model = self._best_model_candidate
+        if content is None or model is None:
+            return False
+        if not CONTENT_SIGNAL_KEYS.issubset(content.keys()):
+            return False
+        if not MODEL_SIGNAL_KEYS.issubset(model.keys()):
+            return False
+        # An invalid prompt triggers the lyrics fallback, which needs every chunk.
+        prompt = content["prompt"]
+        return not _is_invalid_prompt(
+            _resolve_prompt_reference(str(prompt) if prompt is not None else None, self._text_refs)
+        )
+
+    def result(self) -> dict[str, str | bool | None]:
+        return _build_metadata(
+            self._best_content_candidate,
+            self._best_model_candidate,
+            self._text_refs,
+            self._lyrics_chunks,
+        )
+
 
+def _build_metadata(
+    best_content_candidate: dict[str, Any] | None,
+    best_model_candidate: dict[str, Any] | None,
+    text_refs: dict[str, str],
+    decoded_chunks: list[str],
+) -> dict[str, str | bool | None]:
     if best_content_candidate is None and best_model_candidate is None:
         raise ValueError("Suno metadata not found on track page.")
 
@@ -0,0 +1,159 @@
+"""Periodic refresh of stale or failed Suno remote metadata.
+
+Inputs:
+- `track_remote_data.next_attempt_at` per track, written with every fetch
+  success or failure.
+- A request budget per run and, for the background job, a run interval.
+
+Outputs:
+- `BackfillSummary` of the refreshed and failed tracks of one run.
+
+Side effects:
+- Refetches at most `budget` track pages per run: rows older than
+  `REMOTE_DATA_MAX_AGE_SECONDS`, rows without a fetch time, and failed rows
+  whose exponential backoff has elapsed. Due rows are read off the
+  `next_attempt_at` index, so a run never loads more than `budget` rows.
+- Revalidates cached pages (`If-None-Match`) instead of serving them from the
+  page cache, so unchanged pages cost a 304.
+- The background job runs in a daemon thread per worker process; a
+  `job_leases` row ensures only one worker refreshes at a time.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from flask import Flask
+
+from .db import get_remote_data_refresh_candidates, try_acquire_job_lease
+from .db_schema import REMOTE_DATA_MAX_AGE_SECONDS, REMOTE_RETRY_BASE_SECONDS
+from .remote_backfill import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_REQUESTS_PER_SECOND,
+    BackfillSummary,
+    fetch_and_store_remote_data,
+)
+from .remote_metadata import fetch_suno_track_metadata
+
+DEFAULT_REFRESH_BUDGET = 100
+REFRESH_LEASE_NAME = "remote_refresh"
+
+logger = logging.getLogger(__name__)
+
+
+def retry_backoff_seconds(attempts: int) -> float:
+    """1h, 2h, 4h, ... after consecutive failures, capped at the max data age.
+
+    Mirrors `next_attempt_at_sql()`, which schedules the retry when a failure is stored.
+    """
+    return min(
+        REMOTE_RETRY_BASE_SECONDS * 2 ** min(max(attempts - 1, 0), 30),
+        REMOTE_DATA_MAX_AGE_SECONDS,
+    )
+
+
+def select_due_tracks(
+    budget: int = DEFAULT_REFRESH_BUDGET, now: datetime | None = None
+) -> list[dict[str, object]]:
+    """Tracks to refetch now, most overdue first, at most `budget` of them."""
+    if budget <= 0:
+        return []
+    now = now or datetime.now(UTC)
+    return get_remote_data_refresh_candidates(now.isoformat(), budget)
+
+
+def _revalidating_fetch(url: str) -> dict[str, object]:
+    return fetch_suno_track_metadata(url, max_cache_age_seconds=0)
+
+
+def refresh_remote_data(
+    budget: int = DEFAULT_REFRESH_BUDGET,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fetch: Callable[[str], dict[str, object]] = _revalidating_fetch,
+    sleep: Callable[[float], None] = time.sleep,
+    on_progress: Callable[[BackfillSummary], None] | None = None,
+) -> BackfillSummary:
+    """Refetch due tracks with one request each; failures wait for their backoff."""
+    return fetch_and_store_remote_data(
+        select_due_tracks(budget),
+        concurrency=concurrency,
+        requests_per_second=requests_per_second,
+        max_attempts=1,
+        batch_size=batch_size,
+        fetch=fetch,
+        sleep=sleep,
+        on_progress=on_progress,
+    )
+
+
+class RemoteRefreshJob:
+    """Runs `refresh_remote_data()` every `interval_seconds` while holding the lease."""
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        budget: int = DEFAULT_REFRESH_BUDGET,
+        refresh: Callable[[int], BackfillSummary] = refresh_remote_data,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.budget = budget
+        self._refresh = refresh
+        self._started_pid: int | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    @property
+    def owner(self) -> str:
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def run_once(self) -> BackfillSummary | None:
+        """Refresh up to `budget` tracks; None if another worker holds the lease."""
+        # A run can outlast the interval; the lease survives until the next one.
+        if not try_acquire_job_lease(REFRESH_LEASE_NAME, self.owner, self.interval_seconds * 3):
+            return None
+        return self._refresh(self.budget)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                # Keep the schedule alive; the next run retries with backoff.
+                logger.exception("Remote refresh run failed")
+            self._stop.wait(self.interval_seconds)
+
+    def ensure_started(self) -> None:
+        """Start the thread once per process; forked workers each start their own."""
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+        threading.Thread(target=self._run, name="remote-refresh", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def register_remote_refresh(app: Flask) -> RemoteRefreshJob | None:
+    """Start the refresh job on the first request if `REMOTE_REFRESH_INTERVAL_SECONDS` > 0.
+
+    Starting on first request rather than at import keeps threads out of the
+    preloading gunicorn master, whose forks would inherit them half-copied.
+    """
+    interval_seconds = float(app.config["REMOTE_REFRESH_INTERVAL_SECONDS"])
+    if interval_seconds <= 0:
+        return None
+    job = RemoteRefreshJob(interval_seconds, int(app.config["REMOTE_REFRESH_BUDGET"]))
+
+    @app.before_request
+    def _start_remote_refresh() -> None:
+        job.ensure_started()
+
+    return job
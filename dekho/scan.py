@@ -11,27 +11,43 @@ Outputs:
 Side effects:
 - Moves duplicate files into `./music_duplicates`.
 - Upserts tracks into SQLite.
-- Writes cover and spectrogram artifacts when available.
+- Refreshes the track audio path index used by the audio route.
+- Writes cover and spectrogram artifacts when available and records them
+  (or their absence) in the artifact manifest.
+- Rebuilds the sidebar cover sprite sheets.
+- Publishes scan progress events, and track upsert events for tracks whose
+  rows were inserted or changed, for open clients.
 """
 
 import os
 import shutil
-import subprocess
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 
-import matplotlib
 import mutagen
-import numpy as np
 
-from .db import DB_PATH, get_all_tracks_file_data, upsert_track
+from .artifacts import ARTIFACT_GENERATOR_VERSIONS, record_track_artifact
+from .db import (
+    ARTIFACT_TYPE_IMAGE,
+    ARTIFACT_TYPE_SPECTROGRAM,
+    DB_PATH,
+    TRACK_EVENT_SCAN_FINISHED,
+    TRACK_EVENT_SCAN_PROGRESS,
+    TRACK_EVENT_UPSERTED,
+    delete_track_audio_paths,
+    get_all_tracks_file_data,
+    get_changed_track_ids_after,
+    get_row_change_bounds,
+    get_track_artifact,
+    record_track_event,
+    record_track_events,
+    upsert_track,
+    upsert_track_audio_path,
+)
 from .metadata import extract_file_metadata
-
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from .sprites import build_cover_sprites
 
 
 @dataclass(frozen=True)
@@ -42,12 +58,10 @@ class TrackFile:
     filepath_compare_key: str
 
 
-SPECTROGRAM_OUTPUT_WIDTH_PX = 500
-SPECTROGRAM_OUTPUT_HEIGHT_PX = 256
-SPECTROGRAM_DPI = 100
-SPECTROGRAM_SAMPLE_RATE = 22050
-SPECTROGRAM_MAX_MINUTES = 5
-SPECTROGRAM_MAX_DURATION_SECONDS = SPECTROGRAM_MAX_MINUTES * 60
+# Track upsert events are written in batches, each followed by a progress event.
+# Only tracks with captured row changes (`row_changes`) get one, so a rescan of
+# an unchanged library does not make clients refetch every row.
+SCAN_EVENT_BATCH_SIZE = 50
 
 
 def normalize_compare_key(path: Path | str, base_dir: Path | None = None) -> str:
@@ -87,6 +101,11 @@ def _pick_canonical_file(
     return track_files[0]
 
 
+def index_track_audio_path(track_id: str, resolved_path: Path) -> None:
+    stat = resolved_path.stat()
+    upsert_track_audio_path(track_id, resolved_path, stat.st_size, stat.st_mtime_ns)
+
+
 def backup_database_if_exists() -> str | None:
     source_db = DB_PATH
     if not source_db.exists():
@@ -108,9 +127,10 @@ def export_track_cover_image(track_id: str, file_path: Path) -> None:
     try:
         audio = mutagen.File(file_path)
     except Exception:
-        return
+        audio = None
 
     if audio is None or not audio.tags:
+        record_track_artifact(track_id, ARTIFACT_TYPE_IMAGE, None)
         return
 
     cover_bytes: bytes | None = None
@@ -128,35 +148,14 @@ def export_track_cover_image(track_id: str, file_path: Path) -> None:
             break
 
     if not cover_bytes:
+        record_track_artifact(track_id, ARTIFACT_TYPE_IMAGE, None)
         return
 
     cover_subdir = Path("./images") / track_id[0]
     cover_subdir.mkdir(parents=True, exist_ok=True)
-    (cover_subdir / f"{track_id}.jpg").write_bytes(cover_bytes)
-
-
-def _read_audio_mono_f32(input_path: Path, sample_rate: int) -> np.ndarray:
-    command = [
-        "ffmpeg",
-        "-v",
-        "error",
-        "-i",
-        str(input_path),
-        "-f",
-        "f32le",
-        "-acodec",
-        "pcm_f32le",
-        "-ac",
-        "1",
-        "-ar",
-        str(sample_rate),
-        "pipe:1",
-    ]
-    result = subprocess.run(command, capture_output=True, check=True)
-    samples = np.frombuffer(result.stdout, dtype=np.float32)
-    if samples.size == 0:
-        raise ValueError(f"No audio samples decoded from '{input_path}'.")
-    return samples
+    output_path = cover_subdir / f"{track_id}.jpg"
+    output_path.write_bytes(cover_bytes)
+    record_track_artifact(track_id, ARTIFACT_TYPE_IMAGE, output_path)
 
 
 def export_track_spectrogram_image(track_id: str, file_path: Path) -> None:
@@ -166,37 +165,22 @@ def export_track_spectrogram_image(track_id: str, file_path: Path) -> None:
     spectrogram_subdir = Path("./spectrograms") / track_id[0]
     spectrogram_subdir.mkdir(parents=True, exist_ok=True)
     output_path = spectrogram_subdir / f"{track_id}.png"
-    if output_path.exists():
+    manifest_entry = get_track_artifact(track_id, ARTIFACT_TYPE_SPECTROGRAM)
+    if output_path.exists() and (
+        manifest_entry is None
+        or manifest_entry["generator_version"]
+        == ARTIFACT_GENERATOR_VERSIONS[ARTIFACT_TYPE_SPECTROGRAM]
+    ):
+        if manifest_entry is None or not manifest_entry["exists"]:
+            # Generated before the manifest existed (or by a manual run).
+            record_track_artifact(track_id, ARTIFACT_TYPE_SPECTROGRAM, output_path)
         return
 
-    samples = _read_audio_mono_f32(file_path, SPECTROGRAM_SAMPLE_RATE)
-    max_samples = SPECTROGRAM_SAMPLE_RATE * SPECTROGRAM_MAX_DURATION_SECONDS
-    if samples.size > max_samples:
-        samples = samples[:max_samples]
-    elif samples.size < max_samples:
-        samples = np.pad(samples, (0, max_samples - samples.size))
-
-    figure = plt.figure(
-        figsize=(
-            SPECTROGRAM_OUTPUT_WIDTH_PX / SPECTROGRAM_DPI,
-            SPECTROGRAM_OUTPUT_HEIGHT_PX / SPECTROGRAM_DPI,
-        ),
-        dpi=SPECTROGRAM_DPI,
-        frameon=False,
-    )
-    ax = figure.add_axes([0, 0, 1, 1])
-    with np.errstate(divide="ignore"):
-        ax.specgram(
-            samples,
-            NFFT=2048,
-            Fs=SPECTROGRAM_SAMPLE_RATE,
-            noverlap=1536,
-            cmap="magma",
-        )
-    ax.set_xlim(0, SPECTROGRAM_MAX_DURATION_SECONDS)
-    ax.set_axis_off()
-    figure.savefig(output_path, dpi=SPECTROGRAM_DPI, pad_inches=0)
-    plt.close(figure)
+    # NumPy and matplotlib load here, on the first spectrogram a scan renders.
+    from .spectrograms import render_spectrogram_png
+
+    render_spectrogram_png(file_path, output_path)
+    record_track_artifact(track_id, ARTIFACT_TYPE_SPECTROGRAM, output_path)
 
 
 def _discover_mp3_files(music_dir: Path) -> list[Path]:
@@ -245,6 +229,10 @@ def _process_grouped_tracks(
     duplicate_warnings: list[dict[str, str]] = []
     renamed_path_updates: list[dict[str, str]] = []
     scanned_track_ids: set[str] = set()
+    total_tracks = len(grouped_track_files)
+    batch_track_ids: list[str] = []
+    _, batch_start_seq = get_row_change_bounds()
+    record_track_event(TRACK_EVENT_SCAN_PROGRESS, data={"processed": 0, "total": total_tracks})
 
     for track_id in sorted(grouped_track_files):
         candidates = grouped_track_files[track_id]
@@ -291,6 +279,7 @@ def _process_grouped_tracks(
             url=canonical_metadata.get("url"),
             date_created=canonical_metadata.get("date_created"),
         )
+        index_track_audio_path(track_id, canonical_file.filepath_resolved)
         try:
             export_track_cover_image(track_id, canonical_file.filepath_resolved)
         except Exception:
@@ -309,10 +298,40 @@ def _process_grouped_tracks(
                 "scan_time_utc": datetime.now(UTC).isoformat(),
             }
         )
+        batch_track_ids.append(track_id)
+        if len(batch_track_ids) >= SCAN_EVENT_BATCH_SIZE:
+            batch_start_seq = _publish_scan_progress(
+                batch_track_ids, batch_start_seq, len(scanned_tracks), total_tracks
+            )
+            batch_track_ids = []
+
+    if batch_track_ids:
+        _publish_scan_progress(batch_track_ids, batch_start_seq, len(scanned_tracks), total_tracks)
 
     return scanned_tracks, duplicate_warnings, renamed_path_updates, scanned_track_ids
 
 
+def _publish_scan_progress(
+    track_ids: list[str],
+    batch_start_seq: int,
+    processed: int,
+    total: int,
+) -> int:
+    """Publish upserts for the batch's changed tracks plus progress; return the next start seq."""
+    changed_track_ids, latest_seq = get_changed_track_ids_after(batch_start_seq)
+    record_track_events(
+        [
+            *(
+                (TRACK_EVENT_UPSERTED, track_id, {})
+                for track_id in track_ids
+                if track_id in changed_track_ids
+            ),
+            (TRACK_EVENT_SCAN_PROGRESS, None, {"processed": processed, "total": total}),
+        ]
+    )
+    return latest_seq
+
+
 def _collect_missing_from_folder(
     music_root: Path,
     all_music_path_keys: set[str],
@@ -373,6 +392,27 @@ def run_scan(music_dir: Path) -> dict[str, object]:
         all_music_path_keys=all_music_path_keys,
         scanned_track_ids=scanned_track_ids,
     )
+    delete_track_audio_paths(
+        [
+            row["track_id"]
+            for row in missing_from_folder
+            if row["missing_identifier"] == "yes"
+        ]
+    )
+    try:
+        build_cover_sprites([str(row["track_id"]) for row in get_all_tracks_file_data()])
+    except Exception:
+        # Sprite generation should not break the scan pipeline.
+        pass
+
+    record_track_event(
+        TRACK_EVENT_SCAN_FINISHED,
+        data={
+            "stored": len(scanned_tracks),
+            "skipped": len(missing_identifier_files),
+            "missing_from_folder": len(missing_from_folder),
+        },
+    )
 
     return {
         "database_backup_path": database_backup_path,
@@ -0,0 +1,84 @@
+"""Spectrogram rendering for the track details panel.
+
+Inputs:
+- An audio file path (decoded with ffmpeg to mono float32 PCM).
+
+Outputs:
+- A fixed-size PNG spectrogram of the first five minutes.
+
+Side effects:
+- Runs ffmpeg as a subprocess.
+- Imports NumPy and matplotlib (Agg backend); only the scan loads this module,
+  on the first spectrogram it renders.
+"""
+
+import subprocess
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+SPECTROGRAM_OUTPUT_WIDTH_PX = 500
+SPECTROGRAM_OUTPUT_HEIGHT_PX = 256
+SPECTROGRAM_DPI = 100
+SPECTROGRAM_SAMPLE_RATE = 22050
+SPECTROGRAM_MAX_MINUTES = 5
+SPECTROGRAM_MAX_DURATION_SECONDS = SPECTROGRAM_MAX_MINUTES * 60
+
+
+def read_audio_mono_f32(input_path: Path, sample_rate: int) -> np.ndarray:
+    command = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        str(input_path),
+        "-f",
+        "f32le",
+        "-acodec",
+        "pcm_f32le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "pipe:1",
+    ]
+    result = subprocess.run(command, capture_output=True, check=True)
+    samples = np.frombuffer(result.stdout, dtype=np.float32)
+    if samples.size == 0:
+        raise ValueError(f"No audio samples decoded from '{input_path}'.")
+    return samples
+
+
+def render_spectrogram_png(file_path: Path, output_path: Path) -> None:
+    samples = read_audio_mono_f32(file_path, SPECTROGRAM_SAMPLE_RATE)
+    max_samples = SPECTROGRAM_SAMPLE_RATE * SPECTROGRAM_MAX_DURATION_SECONDS
+    if samples.size > max_samples:
+        samples = samples[:max_samples]
+    elif samples.size < max_samples:
+        samples = np.pad(samples, (0, max_samples - samples.size))
+
+    figure = plt.figure(
+        figsize=(
+            SPECTROGRAM_OUTPUT_WIDTH_PX / SPECTROGRAM_DPI,
+            SPECTROGRAM_OUTPUT_HEIGHT_PX / SPECTROGRAM_DPI,
+        ),
+        dpi=SPECTROGRAM_DPI,
+        frameon=False,
+    )
+    ax = figure.add_axes([0, 0, 1, 1])
+    with np.errstate(divide="ignore"):
+        ax.specgram(
+            samples,
+            NFFT=2048,
+            Fs=SPECTROGRAM_SAMPLE_RATE,
+            noverlap=1536,
+            cmap="magma",
+        )
+    ax.set_xlim(0, SPECTROGRAM_MAX_DURATION_SECONDS)
+    ax.set_axis_off()
+    figure.savefig(output_path, dpi=SPECTROGRAM_DPI, pad_inches=0)
+    plt.close(figure)
@@ -0,0 +1,243 @@
+"""Cover thumbnail sprite sheets for the sidebar track list.
+
+Inputs:
+- Track IDs and the cover images under `./images`.
+
+Outputs:
+- JPEG atlases `./sprites/covers-<n>-<hash>.jpg` with fixed-size tiles.
+- `./sprites/covers.json` manifest: sheet names and signatures, grid size,
+  per-track tile index and a shared placeholder tile for tracks without a cover.
+
+Side effects:
+- Rewrites the sprite directory at scan time; only sheets with changed tiles
+  are re-rendered. `SPRITES_ROOT` and `COVER_IMAGES_ROOT` are read at call
+  time, so they can be redirected like `db.DB_PATH`.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from PIL import Image
+
+SPRITES_ROOT = Path("./sprites")
+COVER_IMAGES_ROOT = Path("./images")
+SPRITE_MANIFEST_NAME = "covers.json"
+SPRITE_MANIFEST_VERSION = 2
+# Tiles are drawn at 50 CSS px in the sidebar; 64 px keeps them sharp enough
+# on HiDPI screens while a 16x16 sheet stays well under 1 MB.
+SPRITE_TILE_SIZE = 64
+SPRITE_COLUMNS = 16
+SPRITE_ROWS = 16
+SPRITE_JPEG_QUALITY = 80
+PLACEHOLDER_TILE_COLOR = (92, 99, 112)
+PLACEHOLDER_TILE_INDEX = 0
+
+
+def _cover_path_for(track_id: str, images_root: Path) -> Path:
+    return images_root / track_id[0] / f"{track_id}.jpg"
+
+
+def _collect_covers(track_ids: list[str], images_root: Path) -> dict[str, tuple[Path, str]]:
+    covers = {}
+    for track_id in track_ids:
+        if not track_id:
+            continue
+        cover_path = _cover_path_for(track_id, images_root)
+        try:
+            stat = cover_path.stat()
+        except FileNotFoundError:
+            continue
+        covers[track_id] = (cover_path, f"{stat.st_size}:{stat.st_mtime_ns}")
+    return covers
+
+
+def _source_signature(covers: dict[str, tuple[Path, str]]) -> str:
+    digest = hashlib.sha256(f"v{SPRITE_MANIFEST_VERSION}:{SPRITE_TILE_SIZE}".encode())
+    for track_id in sorted(covers):
+        digest.update(f"\0{track_id}\0{covers[track_id][1]}".encode())
+    return digest.hexdigest()
+
+
+def _assign_slots(
+    covers: dict[str, tuple[Path, str]], previous_tracks: dict[str, list[int]]
+) -> dict[str, int]:
+    """Give each cover a sheet-wide slot (`sheet * tiles_per_sheet + tile`).
+
+    Covers keep the slot they had in the previous build; new covers fill
+    slots freed by removed tracks, then extend the last sheet, in track ID
+    order. Adding one track therefore changes a single sheet.
+    """
+    tiles_per_sheet = SPRITE_COLUMNS * SPRITE_ROWS
+    slots = {
+        track_id: sheet_index * tiles_per_sheet + tile_index
+        for track_id, (sheet_index, tile_index) in previous_tracks.items()
+        if track_id in covers
+    }
+    taken = set(slots.values())
+    taken.add(PLACEHOLDER_TILE_INDEX)
+    free_slot = 0
+    for track_id in sorted(covers.keys() - slots.keys()):
+        while free_slot in taken:
+            free_slot += 1
+        slots[track_id] = free_slot
+        taken.add(free_slot)
+    return slots
+
+
+def _sheet_signature(sheet_slots: list[tuple[int, str, str]]) -> str:
+    digest = hashlib.sha256(f"v{SPRITE_MANIFEST_VERSION}:{SPRITE_TILE_SIZE}".encode())
+    for slot, track_id, file_signature in sorted(sheet_slots):
+        digest.update(f"\0{slot}\0{track_id}\0{file_signature}".encode())
+    return digest.hexdigest()
+
+
+def _load_tile(cover_path: Path) -> Image.Image | None:
+    try:
+        with Image.open(cover_path) as image:
+            # Lets the JPEG decoder downscale while decoding (much faster).
+            image.draft("RGB", (SPRITE_TILE_SIZE, SPRITE_TILE_SIZE))
+            tile = image.convert("RGB")
+    except (OSError, ValueError):
+        return None
+    # Center-crop to a square, matching `object-fit: cover` of the old <img>.
+    side = min(tile.size)
+    left = (tile.width - side) // 2
+    top = (tile.height - side) // 2
+    tile = tile.crop((left, top, left + side, top + side))
+    return tile.resize((SPRITE_TILE_SIZE, SPRITE_TILE_SIZE), Image.Resampling.LANCZOS)
+
+
+def _new_sheet() -> Image.Image:
+    return Image.new(
+        "RGB",
+        (SPRITE_COLUMNS * SPRITE_TILE_SIZE, SPRITE_ROWS * SPRITE_TILE_SIZE),
+        PLACEHOLDER_TILE_COLOR,
+    )
+
+
+def _save_sheet(sheet: Image.Image, sheet_index: int, output_root: Path) -> str:
+    temporary_path = output_root / f".covers-{sheet_index}.part.jpg"
+    sheet.save(temporary_path, "JPEG", quality=SPRITE_JPEG_QUALITY, optimize=True)
+    content_hash = hashlib.sha256(temporary_path.read_bytes()).hexdigest()[:12]
+    sheet_name = f"covers-{sheet_index}-{content_hash}.jpg"
+    temporary_path.replace(output_root / sheet_name)
+    return sheet_name
+
+
+def build_cover_sprites(
+    track_ids: list[str],
+    images_root: Path | None = None,
+    output_root: Path | None = None,
+) -> dict[str, object]:
+    """Pack the covers of `track_ids` into atlases and write the manifest.
+
+    Tiles are placed by `_assign_slots`, not in sidebar order; the manifest
+    maps each track to its tile. Sheets whose tiles are unchanged since the
+    previous build are kept as they are, so their hashed names (and browser
+    caches) survive a rescan that adds or changes a few covers.
+    """
+    images_root = images_root or COVER_IMAGES_ROOT
+    output_root = output_root or SPRITES_ROOT
+    covers = _collect_covers(track_ids, images_root)
+    signature = _source_signature(covers)
+    existing = load_cover_sprite_manifest(output_root)
+    if existing is not None and not all(
+        (output_root / name).is_file() for name in existing["sheets"]
+    ):
+        existing = None
+    if existing is not None and existing.get("source_signature") == signature:
+        return existing
+
+    output_root.mkdir(parents=True, exist_ok=True)
+    tiles_per_sheet = SPRITE_COLUMNS * SPRITE_ROWS
+    slots = _assign_slots(covers, existing["tracks"] if existing is not None else {})
+    sheet_count = max(slots.values(), default=0) // tiles_per_sheet + 1
+    slots_by_sheet: list[list[tuple[int, str, str]]] = [[] for _ in range(sheet_count)]
+    for track_id, slot in slots.items():
+        slots_by_sheet[slot // tiles_per_sheet].append((slot, track_id, covers[track_id][1]))
+
+    sheet_names: list[str] = []
+    sheet_signatures: list[str] = []
+    track_tiles: dict[str, list[int]] = {}
+    for sheet_index, sheet_slots in enumerate(slots_by_sheet):
+        sheet_signature = _sheet_signature(sheet_slots)
+        if (
+            existing is not None
+            and existing["sheet_signatures"][sheet_index : sheet_index + 1] == [sheet_signature]
+        ):
+            sheet_names.append(existing["sheets"][sheet_index])
+            sheet_signatures.append(sheet_signature)
+            for _slot, track_id, _file_signature in sheet_slots:
+                if track_id in existing["tracks"]:
+                    track_tiles[track_id] = existing["tracks"][track_id]
+            continue
+
+        sheet = _new_sheet()
+        for slot, track_id, _file_signature in sheet_slots:
+            tile = _load_tile(covers[track_id][0])
+            if tile is None:
+                continue
+            tile_index = slot % tiles_per_sheet
+            column, row = tile_index % SPRITE_COLUMNS, tile_index // SPRITE_COLUMNS
+            sheet.paste(tile, (column * SPRITE_TILE_SIZE, row * SPRITE_TILE_SIZE))
+            track_tiles[track_id] = [sheet_index, tile_index]
+        sheet_names.append(_save_sheet(sheet, sheet_index, output_root))
+        sheet_signatures.append(sheet_signature)
+
+    manifest = {
+        "version": SPRITE_MANIFEST_VERSION,
+        "tile_size": SPRITE_TILE_SIZE,
+        "columns": SPRITE_COLUMNS,
+        "rows": SPRITE_ROWS,
+        "sheets": sheet_names,
+        "sheet_signatures": sheet_signatures,
+        "placeholder": [0, PLACEHOLDER_TILE_INDEX],
+        "tracks": track_tiles,
+        "source_signature": signature,
+    }
+    manifest_path = output_root / SPRITE_MANIFEST_NAME
+    temporary_manifest_path = output_root / f".{SPRITE_MANIFEST_NAME}.part"
+    temporary_manifest_path.write_text(json.dumps(manifest, separators=(",", ":")))
+    temporary_manifest_path.replace(manifest_path)
+
+    for stale_sheet in output_root.glob("covers-*.jpg"):
+        if stale_sheet.name not in sheet_names:
+            stale_sheet.unlink(missing_ok=True)
+    _manifest_cache.clear()
+    return manifest
+
+
+_manifest_cache: dict[Path, tuple[int, dict[str, object]]] = {}
+
+
+def load_cover_sprite_manifest(output_root: Path | None = None) -> dict[str, object] | None:
+    """Return the sprite manifest (cached per file mtime) or None if not built yet."""
+    manifest_path = ((output_root or SPRITES_ROOT) / SPRITE_MANIFEST_NAME).resolve()
+    try:
+        mtime_ns = manifest_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _manifest_cache.get(manifest_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != SPRITE_MANIFEST_VERSION:
+        return None
+    _manifest_cache[manifest_path] = (mtime_ns, manifest)
+    return manifest
+
+
+def cover_sprite_sheet_path(sheet_name: str) -> Path:
+    return (SPRITES_ROOT / sheet_name).resolve()
+
+
+def get_cover_sprite_tile(manifest: dict[str, object], track_id: str) -> list[int]:
+    """Return `[sheet_index, column, row]` for a track, falling back to the placeholder."""
+    tracks = manifest["tracks"]
+    sheet_index, tile_index = tracks.get(track_id) or manifest["placeholder"]
+    columns = int(manifest["columns"])
+    return [sheet_index, tile_index % columns, tile_index // columns]
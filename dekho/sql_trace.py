@@ -0,0 +1,129 @@
+"""Opt-in slow-query log for the repository layer.
+
+Inputs:
+- Statement timings from the DB statement observer hook.
+- Log path and threshold (`FLASK_SQL_TRACE_LOG_PATH`, `FLASK_SQL_TRACE_THRESHOLD_MS`).
+
+Outputs:
+- Rotating log file entries with duration, calling repository function, SQL and
+  `EXPLAIN QUERY PLAN` output for statements at or above the threshold.
+
+Side effects:
+- Opens a separate, unobserved SQLite connection per slow statement to explain it.
+"""
+
+import logging
+import sqlite3
+import sys
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from . import db
+
+SQL_TRACE_LOGGER_NAME = "dekho.sql_trace"
+SQL_TRACE_DEFAULT_THRESHOLD_MS = 50.0
+SQL_TRACE_MAX_BYTES = 5 * 1024 * 1024
+SQL_TRACE_BACKUP_COUNT = 3
+# Only these can be explained; DDL and PRAGMA statements are logged without a plan.
+EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_active_tracer: "SqlTracer | None" = None
+
+
+def find_repository_caller(frame=None) -> str:
+    """Return `db_function (from caller)` for the outermost `dekho.db` frame of the statement.
+
+    Nested repository calls (e.g. `init_db()` inside `upsert_track()`) are
+    reported as the public function the caller used.
+    """
+    frame = frame or sys._getframe(1)
+    repository_function = None
+    while frame is not None:
+        module_name = frame.f_globals.get("__name__", "")
+        qualname = frame.f_code.co_qualname
+        if module_name == db.__name__ and not qualname.startswith("_Observed"):
+            repository_function = f"{module_name}.{qualname}"
+        elif repository_function is not None:
+            return f"{repository_function} (from {module_name}.{qualname})"
+        frame = frame.f_back
+    return repository_function or "<unknown>"
+
+
+def explain_query_plan(sql: str, parameters: object) -> list[str]:
+    if not sql.lstrip().upper().startswith(EXPLAINABLE_PREFIXES):
+        return []
+    if parameters is None:
+        # executemany() batches report no single parameter set to bind.
+        return ["<not explained: executemany batch>"]
+    # Plain sqlite3 connection: not observed, so explaining never re-enters the tracer.
+    connection = sqlite3.connect(db.DB_PATH)
+    try:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters or ()).fetchall()
+    except sqlite3.Error as exc:
+        return [f"<plan unavailable: {exc}>"]
+    finally:
+        connection.close()
+
+    depths: dict[int, int] = {0: -1}
+    lines = []
+    for node_id, parent_id, _unused, detail in rows:
+        depth = depths.get(parent_id, -1) + 1
+        depths[node_id] = depth
+        lines.append(f"{'  ' * depth}{detail}")
+    return lines
+
+
+class SqlTracer:
+    def __init__(self, log_path: Path, threshold_ms: float) -> None:
+        self.threshold_seconds = threshold_ms / 1000
+        self.handler = RotatingFileHandler(
+            log_path,
+            maxBytes=SQL_TRACE_MAX_BYTES,
+            backupCount=SQL_TRACE_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        self.handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self.logger = logging.getLogger(SQL_TRACE_LOGGER_NAME)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+
+    def __call__(self, sql: str, parameters: object, elapsed: float) -> None:
+        if elapsed < self.threshold_seconds:
+            return
+        plan = explain_query_plan(sql, parameters)
+        message_lines = [
+            f"slow query {elapsed * 1000:.1f} ms in {find_repository_caller()}",
+            f"  sql: {' '.join(sql.split())}",
+        ]
+        if plan:
+            message_lines.append("  plan:")
+            message_lines.extend(f"    {line}" for line in plan)
+        self.logger.info("\n".join(message_lines))
+
+    def start(self) -> None:
+        self.logger.addHandler(self.handler)
+        db.add_statement_observer(self)
+
+    def stop(self) -> None:
+        db.remove_statement_observer(self)
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+
+def enable_sql_trace(
+    log_path: Path, threshold_ms: float = SQL_TRACE_DEFAULT_THRESHOLD_MS
+) -> SqlTracer:
+    """Start logging statements at or above `threshold_ms`; replaces any active tracer."""
+    global _active_tracer
+    disable_sql_trace()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    _active_tracer = SqlTracer(log_path, threshold_ms)
+    _active_tracer.start()
+    return _active_tracer
+
+
+def disable_sql_trace() -> None:
+    global _active_tracer
+    if _active_tracer is not None:
+        _active_tracer.stop()
+        _active_tracer = None
@@ -16,6 +16,12 @@ export async function fetchTrackDetails(trackId) {
   return parseJsonResponse(response, "Unable to load track details.");
 }
 
+export async function fetchTracksBatch(trackIds) {
+  const ids = trackIds.map((trackId) => encodeURIComponent(trackId)).join(",");
+  const response = await fetch(`/api/tracks:batch?ids=${ids}`);
+  return parseJsonResponse(response, "Unable to load track details.");
+}
+
 export async function fetchTrackRemoteData(trackId) {
   const response = await fetch(`/api/tracks/${encodeURIComponent(trackId)}/remote-data`, {
     method: "POST",
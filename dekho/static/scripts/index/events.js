@@ -53,6 +53,44 @@ export function bindTrackItemEvents(trackItems, state, loadTrackDetails, onStart
   });
 }
 
+export function bindVirtualTrackListEvents(tracksList, state, loadTrackDetails, onStartQueueFromTrack) {
+  if (!(tracksList instanceof HTMLElement)) {
+    return;
+  }
+
+  const handleTrackItemAction = (event) => {
+    const target = event.target;
+    if (!(target instanceof HTMLElement)) {
+      return false;
+    }
+    const item = target.closest(".track-item");
+    const trackId = item instanceof HTMLElement ? item.dataset.trackId : "";
+    if (!trackId) {
+      return false;
+    }
+    if (target.closest(".track-item-queue-btn")) {
+      if (event.type === "click") {
+        onStartQueueFromTrack?.(trackId);
+      }
+      return false;
+    }
+    if (confirmDiscardUnsavedChanges(state, trackId)) {
+      loadTrackDetails(trackId, item);
+    }
+    return true;
+  };
+
+  tracksList.addEventListener("click", handleTrackItemAction);
+  tracksList.addEventListener("keydown", (event) => {
+    if (event.key !== "Enter" && event.key !== " ") {
+      return;
+    }
+    if (handleTrackItemAction(event)) {
+      event.preventDefault();
+    }
+  });
+}
+
 export function bindFilterEvents({
   tracksFilterInput,
   tracksLabelFilterOptions,
@@ -293,7 +331,12 @@ export function bindPersistentQueueControls({
   }
 }
 
-export function showPlayingTrackInContentPanel(state, selectedTrackPlayer, loadTrackDetails) {
+export function showPlayingTrackInContentPanel(
+  state,
+  selectedTrackPlayer,
+  loadTrackDetails,
+  hasTrack = null
+) {
   const trackId = selectedTrackPlayer instanceof HTMLAudioElement
     ? (selectedTrackPlayer.dataset.trackId ?? "")
     : "";
@@ -301,7 +344,10 @@ export function showPlayingTrackInContentPanel(state, selectedTrackPlayer, loadT
     return;
   }
   const trackItem = document.querySelector(`.track-item[data-track-id="${CSS.escape(trackId)}"]`);
-  if (!(trackItem instanceof HTMLElement)) {
+  const isKnownTrack = typeof hasTrack === "function"
+    ? hasTrack(trackId)
+    : trackItem instanceof HTMLElement;
+  if (!isKnownTrack) {
     return;
   }
   if (!confirmDiscardUnsavedChanges(state, trackId)) {
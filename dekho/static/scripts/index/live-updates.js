@@ -0,0 +1,71 @@
+import { fetchTracksBatch } from "./api.js";
+
+const TRACK_EVENT_TYPES = ["track_upserted", "track_user_data_changed", "track_remote_data_fetched"];
+// Coalesces event bursts (a scan writes 50 upserts at a time) into batch reads.
+const FLUSH_DELAY_MS = 250;
+// Matches TRACK_BATCH_MAX_IDS on the server.
+const BATCH_SIZE = 50;
+
+function parseEventData(event) {
+  try {
+    const data = JSON.parse(event.data || "{}");
+    return data && typeof data === "object" ? data : {};
+  } catch (error) {
+    return {};
+  }
+}
+
+export function connectLiveUpdates({
+  hasTrack,
+  onTracksData,
+  onUnknownTracks,
+  onScanProgress,
+  onScanFinished,
+  onReset,
+}) {
+  if (typeof EventSource !== "function") {
+    return null;
+  }
+  const source = new EventSource("/api/events");
+  const pendingTrackIds = new Set();
+  let flushTimer = null;
+
+  async function flush() {
+    flushTimer = null;
+    const trackIds = Array.from(pendingTrackIds);
+    pendingTrackIds.clear();
+    const knownTrackIds = trackIds.filter((trackId) => hasTrack(trackId));
+    const unknownTrackIds = trackIds.filter((trackId) => !hasTrack(trackId));
+    if (unknownTrackIds.length > 0) {
+      onUnknownTracks(unknownTrackIds);
+    }
+    for (let start = 0; start < knownTrackIds.length; start += BATCH_SIZE) {
+      try {
+        const payload = await fetchTracksBatch(knownTrackIds.slice(start, start + BATCH_SIZE));
+        onTracksData(Array.isArray(payload.tracks) ? payload.tracks : []);
+      } catch (error) {
+        // Rows stay as they are; the next change event or a reload catches up.
+      }
+    }
+  }
+
+  function queueTrack(trackId) {
+    pendingTrackIds.add(trackId);
+    if (flushTimer === null) {
+      flushTimer = window.setTimeout(flush, FLUSH_DELAY_MS);
+    }
+  }
+
+  TRACK_EVENT_TYPES.forEach((eventType) => {
+    source.addEventListener(eventType, (event) => {
+      const trackId = parseEventData(event).track_id;
+      if (typeof trackId === "string" && trackId) {
+        queueTrack(trackId);
+      }
+    });
+  });
+  source.addEventListener("scan_progress", (event) => onScanProgress(parseEventData(event)));
+  source.addEventListener("scan_finished", (event) => onScanFinished(parseEventData(event)));
+  source.addEventListener("reset", () => onReset());
+  return source;
+}
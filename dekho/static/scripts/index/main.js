@@ -6,18 +6,22 @@ import {
   bindQueuePanelEvents,
   bindScanLinkEvent,
   bindTrackItemEvents,
+  bindVirtualTrackListEvents,
   collectSelectedTrackLabels,
   showPlayingTrackInContentPanel,
 } from "./events.js";
 import {
   applyTracksFilter,
   getVisibleTrackIds,
+  getVisibleTrackRecordIds,
+  renderTrackItemHtml,
   renderTrackItemTitle,
   renderQueueDrawer,
   renderTrackLabelFilterOptions,
   renderTrackListItem,
 } from "./render-track-list.js";
 import {
+  getTrackAudioSrc,
   renderDetails,
   updatePersistentTrackHeader,
   updatePersistentTrackTitleIfPlaying,
@@ -27,15 +31,23 @@ import {
   hasQueueTracks,
   setQueueSnapshot,
   createTrackLabelMap,
+  createTrackStore,
   createUiState,
   markTrackUserDataSaved,
+  readCoverSprites,
   readLabelCatalog,
+  readTracksBootstrap,
 } from "./state.js";
+import { connectLiveUpdates } from "./live-updates.js";
+import { createTrackPrefetcher, QUEUE_PREFETCH_COUNT } from "./track-prefetch.js";
+import { createVirtualTrackList } from "./virtual-track-list.js";
 import { escapeHtml, parseLabelKeys } from "./dom.js";
 
 const scanLink = document.querySelector(".scan-link");
 const tracksPanel = document.getElementById("tracks-panel");
-const trackItems = Array.from(document.querySelectorAll(".track-item"));
+const tracksList = document.getElementById("tracks-list");
+const isVirtualTrackList = tracksList instanceof HTMLElement && tracksList.dataset.listMode === "virtual";
+const trackItems = isVirtualTrackList ? [] : Array.from(document.querySelectorAll(".track-item"));
 const tracksFilterInput = document.getElementById("tracks-filter-input");
 const tracksFilterCount = document.getElementById("tracks-filter-count");
 const tracksLabelFilter = document.getElementById("tracks-label-filter");
@@ -59,10 +71,29 @@ const previousQueueTrackButton = document.getElementById("prev-queue-track-btn")
 const nextQueueTrackButton = document.getElementById("next-queue-track-btn");
 const selectedTrackPlayer = document.getElementById("selected-track-player");
 const showPlayingTrackButton = document.getElementById("show-playing-track-btn");
+const audioQualitySelect = document.getElementById("audio-quality-select");
+const liveUpdatesNotice = document.getElementById("live-updates-notice");
 
 const tracksLabelCatalog = readLabelCatalog();
 const trackLabelByKey = createTrackLabelMap(tracksLabelCatalog);
 const state = createUiState();
+const trackStore = isVirtualTrackList ? createTrackStore(readTracksBootstrap()) : null;
+const coverSprites = isVirtualTrackList ? readCoverSprites() : null;
+const trackPrefetcher = createTrackPrefetcher();
+const virtualTrackListElement = tracksList?.querySelector(".track-items--virtual");
+const virtualTrackList = trackStore && virtualTrackListElement instanceof HTMLElement
+  ? createVirtualTrackList({
+    scrollContainer: tracksList,
+    listElement: virtualTrackListElement,
+    renderRowHtml: (record, rowOptions) => renderTrackItemHtml(record, {
+      ...rowOptions,
+      isActive: record.trackId === state.activeTrackId,
+      coverSprites,
+    }),
+  })
+  : null;
+
+const AUDIO_QUALITY_STORAGE_KEY = "dekho.audioQuality";
 
 const TRACK_SAVE_STATUS_CLASSES = [
   "track-user-data-save-status--saved",
@@ -100,6 +131,7 @@ function renderFilterOptions() {
 function applyFilter() {
   applyTracksFilter({
     trackItems,
+    trackRecords: trackStore?.records ?? null,
     tracksFilterInput,
     tracksFilterCount,
     selectedTrackFilterLabelKeys: state.selectedTrackFilterLabelKeys,
@@ -110,13 +142,26 @@ function applyFilter() {
     tracksClearFiltersButton,
     trackLabelByKey,
   });
+  if (virtualTrackList && trackStore) {
+    virtualTrackList.setRows(trackStore.records.filter((record) => !record.hidden));
+  }
   renderQueueState();
 }
 
+function getVisibleIds() {
+  return trackStore ? getVisibleTrackRecordIds(trackStore.records) : getVisibleTrackIds(trackItems);
+}
+
+function hasTrack(trackId) {
+  return trackStore ? trackStore.byId.has(trackId) : getTrackItemById(trackId) instanceof HTMLElement;
+}
+
 function renderTrackAndDetails(trackId, data) {
+  trackPrefetcher.invalidate(trackId);
   renderTrackListItem(trackId, data, {
     trackLabelByKey,
     applyFilter,
+    trackStore,
   });
   renderDetails(data, contentPanelBody);
   state.activeTrackData = data;
@@ -130,6 +175,9 @@ function getTrackItemById(trackId) {
 }
 
 function getTrackTitleById(trackId) {
+  if (trackStore) {
+    return trackStore.byId.get(trackId)?.displayTitle || "Unknown";
+  }
   const trackItem = getTrackItemById(trackId);
   if (!(trackItem instanceof HTMLElement)) {
     return "Unknown";
@@ -149,7 +197,7 @@ function updateQueueButtonsState() {
   if (resumeQueueButton instanceof HTMLButtonElement) {
     resumeQueueButton.disabled = !hasQueue;
   }
-  const hasVisibleTracks = getVisibleTrackIds(trackItems).length > 0;
+  const hasVisibleTracks = getVisibleIds().length > 0;
   if (recreateQueueButton instanceof HTMLButtonElement) {
     recreateQueueButton.disabled = !hasVisibleTracks;
   }
@@ -172,6 +220,7 @@ function renderQueueState() {
     queueNoticeText: state.queueNotice,
     selectedTrackPlayer,
     activeTrackId: state.activeTrackId,
+    getTrackTitle: getTrackTitleById,
   });
   updateQueueButtonsState();
 }
@@ -189,7 +238,7 @@ function toggleQueueDrawer(forceOpen = null) {
 }
 
 function setQueueFromVisibleTracks(startTrackId = null) {
-  const visibleTrackIds = getVisibleTrackIds(trackItems);
+  const visibleTrackIds = getVisibleIds();
   if (visibleTrackIds.length === 0) {
     setQueueSnapshot(state, []);
     setQueueNotice("No tracks match current filters.");
@@ -249,8 +298,7 @@ function playQueueAtIndex(queueIndex) {
   state.queueIndex = nextIndex;
   state.queueStatus = "playing";
   setQueueNotice("");
-  const item = getTrackItemById(nextTrackId);
-  if (!(item instanceof HTMLElement)) {
+  if (!hasTrack(nextTrackId)) {
     setQueueNotice("Queue track is missing. Skipped.");
     const canAdvance = nextIndex < state.queueTrackIds.length - 1;
     if (canAdvance) {
@@ -263,6 +311,14 @@ function playQueueAtIndex(queueIndex) {
     return;
   }
   setPlaybackTrack(nextTrackId, "queue");
+  prefetchUpcomingQueueTracks();
+}
+
+function prefetchUpcomingQueueTracks() {
+  const upcomingTrackIds = state.queueTrackIds
+    .slice(state.queueIndex + 1, state.queueIndex + 1 + QUEUE_PREFETCH_COUNT)
+    .filter((trackId) => hasTrack(trackId));
+  trackPrefetcher.prefetchQueue(upcomingTrackIds, selectedTrackPlayer?.dataset.audioQuality);
 }
 
 function startQueueFromTrack(trackId) {
@@ -318,20 +374,32 @@ function onPreviousQueueTrack() {
 }
 
 function showQueueTrackInContentPanel(trackId) {
-  const trackItem = getTrackItemById(trackId);
-  if (!(trackItem instanceof HTMLElement)) {
+  if (!hasTrack(trackId)) {
     return;
   }
   if (!confirmDiscardUnsavedChanges(state, trackId)) {
     return;
   }
-  loadTrackDetails(trackId, trackItem);
+  loadTrackDetails(trackId, getTrackItemById(trackId));
 }
 
-async function loadTrackDetails(trackId, item) {
-  trackItems.forEach((trackItem) => trackItem.classList.remove("is-active"));
-  item.classList.add("is-active");
+function setActiveTrackItem(trackId, item) {
   state.activeTrackId = trackId;
+  if (virtualTrackList) {
+    virtualTrackList.scrollToTrack(trackId);
+    return;
+  }
+  trackItems.forEach((trackItem) => trackItem.classList.remove("is-active"));
+  item?.classList.add("is-active");
+}
+
+async function loadTrackDetails(trackId, item) {
+  setActiveTrackItem(trackId, item);
+  const prefetchedData = trackPrefetcher.takeDetails(trackId);
+  if (prefetchedData) {
+    renderTrackAndDetails(trackId, prefetchedData);
+    return;
+  }
   state.activeTrackData = null;
   if (contentPanelBody instanceof HTMLElement) {
     contentPanelBody.innerHTML = "<p class=\"empty-state\">Loading track details...</p>";
@@ -360,7 +428,8 @@ async function fetchRemoteData(trackId) {
 
   try {
     const payload = await fetchTrackRemoteData(trackId);
-    renderTrackListItem(trackId, payload, { trackLabelByKey, applyFilter });
+    trackPrefetcher.invalidate(trackId);
+    renderTrackListItem(trackId, payload, { trackLabelByKey, applyFilter, trackStore });
     updatePersistentTrackTitleIfPlaying(payload, { persistentTrackTitle, selectedTrackPlayer });
     renderDetails(payload, contentPanelBody);
     state.activeTrackData = payload;
@@ -404,7 +473,8 @@ async function saveUserData(trackId) {
       remix_of: remixOfInput.value,
       labels,
     });
-    renderTrackListItem(trackId, payload, { trackLabelByKey, applyFilter });
+    trackPrefetcher.invalidate(trackId);
+    renderTrackListItem(trackId, payload, { trackLabelByKey, applyFilter, trackStore });
     updatePersistentTrackTitleIfPlaying(payload, { persistentTrackTitle, selectedTrackPlayer });
     renderDetails(payload, contentPanelBody);
     state.activeTrackData = payload;
@@ -420,7 +490,11 @@ async function saveUserData(trackId) {
   }
 }
 
-bindTrackItemEvents(trackItems, state, loadTrackDetails, startQueueFromTrack);
+if (isVirtualTrackList) {
+  bindVirtualTrackListEvents(tracksList, state, loadTrackDetails, startQueueFromTrack);
+} else {
+  bindTrackItemEvents(trackItems, state, loadTrackDetails, startQueueFromTrack);
+}
 bindFilterEvents({
   tracksFilterInput,
   tracksLabelFilterOptions,
@@ -487,11 +561,54 @@ trackItems.forEach((item) => {
 if (showPlayingTrackButton instanceof HTMLButtonElement) {
   showPlayingTrackButton.disabled = true;
   showPlayingTrackButton.addEventListener("click", () => {
-    showPlayingTrackInContentPanel(state, selectedTrackPlayer, loadTrackDetails);
+    showPlayingTrackInContentPanel(state, selectedTrackPlayer, loadTrackDetails, hasTrack);
   });
 }
 
+function readStoredAudioQuality() {
+  try {
+    return window.localStorage.getItem(AUDIO_QUALITY_STORAGE_KEY) === "preview" ? "preview" : "original";
+  } catch (error) {
+    return "original";
+  }
+}
+
+function setAudioQuality(audioQuality) {
+  if (!(selectedTrackPlayer instanceof HTMLAudioElement)) {
+    return;
+  }
+  const nextQuality = audioQuality === "preview" ? "preview" : "original";
+  selectedTrackPlayer.dataset.audioQuality = nextQuality;
+  try {
+    window.localStorage.setItem(AUDIO_QUALITY_STORAGE_KEY, nextQuality);
+  } catch (error) {
+    // Storage may be unavailable (private mode); the choice still applies to this page.
+  }
+
+  const trackId = selectedTrackPlayer.dataset.trackId || "";
+  const nextSrc = trackId ? getTrackAudioSrc(trackId, nextQuality) : "";
+  if (!nextSrc || selectedTrackPlayer.getAttribute("src") === nextSrc) {
+    return;
+  }
+  const resumeAt = selectedTrackPlayer.currentTime;
+  const wasPlaying = !selectedTrackPlayer.paused;
+  selectedTrackPlayer.setAttribute("src", nextSrc);
+  selectedTrackPlayer.load();
+  selectedTrackPlayer.addEventListener("loadedmetadata", () => {
+    selectedTrackPlayer.currentTime = resumeAt;
+    if (wasPlaying) {
+      selectedTrackPlayer.play().catch(() => {});
+    }
+  }, { once: true });
+}
+
 if (selectedTrackPlayer instanceof HTMLAudioElement) {
+  const storedAudioQuality = readStoredAudioQuality();
+  selectedTrackPlayer.dataset.audioQuality = storedAudioQuality;
+  if (audioQualitySelect instanceof HTMLSelectElement) {
+    audioQualitySelect.value = storedAudioQuality;
+    audioQualitySelect.addEventListener("change", () => setAudioQuality(audioQualitySelect.value));
+  }
   selectedTrackPlayer.addEventListener("ended", () => {
     if (state.playbackMode !== "queue") {
       return;
@@ -508,4 +625,50 @@ if (selectedTrackPlayer instanceof HTMLAudioElement) {
   });
 }
 
+const unknownTrackIds = new Set();
+
+function setLiveUpdatesNotice(message) {
+  if (!(liveUpdatesNotice instanceof HTMLElement)) {
+    return;
+  }
+  liveUpdatesNotice.textContent = message;
+  liveUpdatesNotice.hidden = !message;
+}
+
+function getUnknownTracksNotice() {
+  const count = unknownTrackIds.size;
+  if (count === 0) {
+    return "";
+  }
+  return `${count} new or moved track${count === 1 ? "" : "s"}. Reload to show them.`;
+}
+
+connectLiveUpdates({
+  hasTrack,
+  onTracksData: (tracks) => {
+    const deps = { trackLabelByKey, applyFilter: () => {}, trackStore };
+    tracks.forEach((data) => {
+      trackPrefetcher.invalidate(data.track_id);
+      renderTrackListItem(data.track_id, data, deps);
+      updatePersistentTrackTitleIfPlaying(data, { persistentTrackTitle, selectedTrackPlayer });
+    });
+    if (tracks.length > 0) {
+      applyFilter();
+    }
+  },
+  onUnknownTracks: (trackIds) => {
+    trackIds.forEach((trackId) => unknownTrackIds.add(trackId));
+    setLiveUpdatesNotice(getUnknownTracksNotice());
+  },
+  onScanProgress: ({ processed = 0, total = 0 }) => {
+    setLiveUpdatesNotice(`Scanning music folder: ${processed}/${total} tracks.`);
+  },
+  onScanFinished: () => {
+    setLiveUpdatesNotice(getUnknownTracksNotice());
+  },
+  onReset: () => {
+    setLiveUpdatesNotice("Track list is out of date. Reload to refresh it.");
+  },
+});
+
 renderQueueState();
@@ -1,7 +1,7 @@
 import { domSafeValue, escapeHtml } from "./dom.js";
 import { getDisplayTitle, hasRemoteTags } from "./render-track-list.js";
 
-function getTrackImageSrc(trackId) {
+export function getTrackImageSrc(trackId) {
   const id = String(trackId ?? "").trim();
   if (!id) {
     return "";
@@ -9,7 +9,7 @@ function getTrackImageSrc(trackId) {
   return `/api/tracks/${encodeURIComponent(id)}/image`;
 }
 
-function getTrackSpectrogramSrc(trackId) {
+export function getTrackSpectrogramSrc(trackId) {
   const id = String(trackId ?? "").trim();
   if (!id) {
     return "";
@@ -17,6 +17,11 @@ function getTrackSpectrogramSrc(trackId) {
   return `/api/tracks/${encodeURIComponent(id)}/spectrogram`;
 }
 
+export function getTrackAudioSrc(trackId, audioQuality = "original") {
+  const src = `/api/tracks/${encodeURIComponent(trackId)}/audio`;
+  return audioQuality === "preview" ? `${src}?quality=preview` : src;
+}
+
 function renderLabelGroups(labelCatalog, selectedLabels) {
   if (!Array.isArray(labelCatalog) || labelCatalog.length === 0) {
     return "<p class=\"empty-state\">No labels configured.</p>";
@@ -92,7 +97,7 @@ export function updatePersistentTrackHeader(data, refs) {
   }
 
   const displayTitle = getDisplayTitle(data) || "Untitled Track";
-  const nextSrc = `/api/tracks/${encodeURIComponent(trackId)}/audio`;
+  const nextSrc = getTrackAudioSrc(trackId, selectedTrackPlayer.dataset.audioQuality);
   const currentSrc = selectedTrackPlayer.getAttribute("src") || "";
 
   persistentTrackHeader.hidden = false;
@@ -143,6 +148,9 @@ export function renderDetails(data, contentPanelBody) {
   const modelName = data.model_name ?? "";
   const personaName = data.persona_name ?? "";
   const prompt = data.prompt ?? "";
+  // false only when the artifact manifest knows the file is missing.
+  const hasImage = data.has_image !== false;
+  const hasSpectrogram = data.has_spectrogram !== false;
   const labels = Array.isArray(data.labels) ? data.labels : [];
   const labelCatalog = Array.isArray(data.label_catalog) ? data.label_catalog : [];
   const displayTitle = getDisplayTitle(data) || "Untitled Track";
@@ -185,19 +193,23 @@ export function renderDetails(data, contentPanelBody) {
         </form>
       </div>
       <div class="track-details">
-        <img
-          class="track-details-image"
-          src="${escapeHtml(getTrackImageSrc(trackId))}"
-          width="200"
-          height="200"
-        >
-        <img
-          class="track-details-spectrogram"
-          src="${escapeHtml(getTrackSpectrogramSrc(trackId))}"
-          alt="Spectrogram"
-          loading="lazy"
-          onerror="this.hidden = true;"
-        >
+        ${hasImage ? `
+          <img
+            class="track-details-image"
+            src="${escapeHtml(getTrackImageSrc(trackId))}"
+            width="200"
+            height="200"
+          >
+        ` : "<div class=\"track-details-image\" aria-hidden=\"true\"></div>"}
+        ${hasSpectrogram ? `
+          <img
+            class="track-details-spectrogram"
+            src="${escapeHtml(getTrackSpectrogramSrc(trackId))}"
+            alt="Spectrogram"
+            loading="lazy"
+            onerror="this.hidden = true;"
+          >
+        ` : ""}
         <p id="track-info-title">${escapeHtml(title || "-")}</p>
         <p id="track-info-id">${escapeHtml(trackId)}</p>
         <p id="track-info-url">${url ? `<a href="${escapeHtml(url)}" target="_blank" rel="noopener noreferrer">${escapeHtml(url)}</a>` : "-"}</p>
@@ -59,18 +59,94 @@ export function renderTrackItemTitle(trackItem, displayTitle, labelKeys, trackHa
   titleElement.innerHTML = `${escapeHtml(displayTitle)}${getTrackBadgesHtml(labelKeys, trackHasRemoteTags)}`;
 }
 
-export function updateTrackItemLabels(trackId, labelKeys, trackLabelByKey) {
-  const trackItem = document.querySelector(`.track-item[data-track-id="${CSS.escape(trackId)}"]`);
-  if (!(trackItem instanceof HTMLElement)) {
-    return;
+function getTrackItemImageHtml(record, coverSprites) {
+  const sheetUrl = record.coverSprite ? coverSprites?.sheet_urls?.[record.coverSprite[0]] : null;
+  if (sheetUrl) {
+    const [, column, row] = record.coverSprite;
+    const spriteStyle = [
+      `--sprite-url: url('${sheetUrl}')`,
+      `--sprite-col: ${column}`,
+      `--sprite-row: ${row}`,
+      `--sprite-columns: ${coverSprites.columns}`,
+      `--sprite-rows: ${coverSprites.rows}`,
+    ].join("; ");
+    return `<span class="track-item-image track-item-sprite" aria-hidden="true" style="${escapeHtml(spriteStyle)}"></span>`;
+  }
+  if (record.hasImage === false) {
+    return "<span class=\"track-item-image track-item-image-empty\" aria-hidden=\"true\"></span>";
   }
+  return `
+        <img
+          class="track-item-image"
+          src="/api/tracks/${encodeURIComponent(record.trackId)}/image"
+          width="50"
+          height="50"
+          loading="lazy"
+        >`;
+}
+
+export function renderTrackItemHtml(
+  record,
+  { isActive = false, rowIndex = 0, style = "", coverSprites = null } = {},
+) {
+  const trackId = escapeHtml(record.trackId);
+  const labelsText = record.labels.length > 0 ? record.labels.join(", ") : "-";
+  const classNames = [
+    "track-item",
+    rowIndex % 2 === 1 ? "is-even-row" : "",
+    isActive ? "is-active" : "",
+  ].filter(Boolean).join(" ");
+  return `
+    <li
+      class="${classNames}"
+      data-track-id="${trackId}"
+      data-label-keys="${escapeHtml(record.labelKeys.join(","))}"
+      data-display-title="${escapeHtml(record.displayTitle)}"
+      data-has-remote-tags="${record.hasRemoteTags ? "1" : "0"}"
+      style="${escapeHtml(style)}"
+      tabindex="0"
+    >
+      <div class="track-item-content">
+        ${getTrackItemImageHtml(record, coverSprites)}
+        <div class="track-item-body">
+          <h2 class="track-title" data-track-item-title>${escapeHtml(record.displayTitle)}${getTrackBadgesHtml(record.labelKeys, record.hasRemoteTags)}</h2>
+          <p class="track-id">${trackId}</p>
+          <p class="track-meta track-item-labels" data-track-item-labels>${escapeHtml(labelsText)}</p>
+          <div class="track-meta-block">
+            <p class="track-meta" data-track-item-display-title>${escapeHtml(record.displayTitle)}</p>
+            <p class="track-meta" data-track-item-tags>${escapeHtml(toTrackMetaText(record.tags))}</p>
+            <p class="track-meta" data-track-item-notes>${escapeHtml(toTrackMetaText(record.notes))}</p>
+          </div>
+        </div>
+        <button
+          class="track-item-queue-btn"
+          type="button"
+          title="Play queue from this track"
+          aria-label="Play queue from this track"
+        >
+          ▶Q
+        </button>
+      </div>
+    </li>
+  `;
+}
 
-  const normalizedKeys = Array.isArray(labelKeys)
+function normalizeTrackLabelKeys(labelKeys) {
+  return Array.isArray(labelKeys)
     ? labelKeys
       .filter((key) => typeof key === "string" && key)
       .map((key) => key.trim())
       .filter(Boolean)
     : [];
+}
+
+export function updateTrackItemLabels(trackId, labelKeys, trackLabelByKey) {
+  const trackItem = document.querySelector(`.track-item[data-track-id="${CSS.escape(trackId)}"]`);
+  if (!(trackItem instanceof HTMLElement)) {
+    return;
+  }
+
+  const normalizedKeys = normalizeTrackLabelKeys(labelKeys);
   trackItem.dataset.labelKeys = normalizedKeys.join(",");
 
   const labelsElement = trackItem.querySelector("[data-track-item-labels]");
@@ -86,13 +162,9 @@ export function updateTrackItemLabels(trackId, labelKeys, trackLabelByKey) {
   renderTrackItemTitle(trackItem, displayTitle, normalizedKeys, trackHasRemoteTags);
 }
 
-function getTrackItemLabelKeys(item) {
-  return new Set(parseLabelKeys(item.dataset.labelKeys));
-}
-
-function getTrackItemLabelCategories(item) {
+function getLabelKeyCategories(labelKeys) {
   const categories = new Set();
-  parseLabelKeys(item.dataset.labelKeys).forEach((labelKey) => {
+  labelKeys.forEach((labelKey) => {
     const category = labelKey.split(".", 1)[0];
     if (category) {
       categories.add(category);
@@ -295,17 +367,50 @@ export function updateTracksFilterSummary({
   }
 }
 
-function updateTracksFilterCount(trackItems, tracksFilterCount) {
+function updateTracksFilterCount(trackEntries, tracksFilterCount) {
   if (!(tracksFilterCount instanceof HTMLElement)) {
     return;
   }
-  const total = trackItems.length;
-  const matched = trackItems.filter((item) => !item.hidden).length;
+  const total = trackEntries.length;
+  const matched = trackEntries.filter((entry) => !entry.hidden).length;
   tracksFilterCount.textContent = `${matched}/${total} tracks`;
 }
 
+function getTrackRecordHaystack(record) {
+  return [
+    record.displayTitle,
+    record.trackId,
+    record.labels.join(", "),
+    record.displayTitle,
+    record.tags,
+    record.notes,
+  ].join(" ");
+}
+
+function trackMatchesFilters({
+  haystack,
+  labelKeys,
+  query,
+  selectedTrackFilterLabelKeys,
+  selectedMissingTrackFilterCategories,
+  matchMode,
+}) {
+  const textMatches = query ? haystack.toLocaleLowerCase().includes(query) : true;
+  const labelsMatch = trackMatchesSelectedLabels(
+    new Set(labelKeys),
+    selectedTrackFilterLabelKeys,
+    matchMode
+  );
+  const trackLabelCategories = getLabelKeyCategories(labelKeys);
+  const missingCategoryMatches = Array.from(selectedMissingTrackFilterCategories).every(
+    (category) => !trackLabelCategories.has(category)
+  );
+  return textMatches && labelsMatch && missingCategoryMatches;
+}
+
 export function applyTracksFilter({
   trackItems,
+  trackRecords = null,
   tracksFilterInput,
   tracksFilterCount,
   selectedTrackFilterLabelKeys,
@@ -320,23 +425,32 @@ export function applyTracksFilter({
     .trim()
     .toLocaleLowerCase();
   const matchMode = labelFilterMatchMode === "and" ? "and" : "or";
-  trackItems.forEach((item) => {
-    const trackMetaBlock = item.querySelector(".track-meta-block");
-    const haystack = `${item.textContent || ""} ${trackMetaBlock?.textContent || ""}`.toLocaleLowerCase();
-    const textMatches = query ? haystack.includes(query) : true;
-    const trackLabelKeys = getTrackItemLabelKeys(item);
-    const labelsMatch = trackMatchesSelectedLabels(
-      trackLabelKeys,
-      selectedTrackFilterLabelKeys,
-      matchMode
-    );
-    const trackLabelCategories = getTrackItemLabelCategories(item);
-    const missingCategoryMatches = Array.from(selectedMissingTrackFilterCategories).every(
-      (category) => !trackLabelCategories.has(category)
-    );
-    item.hidden = !(textMatches && labelsMatch && missingCategoryMatches);
-  });
-  updateTracksFilterCount(trackItems, tracksFilterCount);
+  const filterOptions = {
+    query,
+    selectedTrackFilterLabelKeys,
+    selectedMissingTrackFilterCategories,
+    matchMode,
+  };
+  if (Array.isArray(trackRecords)) {
+    trackRecords.forEach((record) => {
+      record.hidden = !trackMatchesFilters({
+        ...filterOptions,
+        haystack: getTrackRecordHaystack(record),
+        labelKeys: record.labelKeys,
+      });
+    });
+    updateTracksFilterCount(trackRecords, tracksFilterCount);
+  } else {
+    trackItems.forEach((item) => {
+      const trackMetaBlock = item.querySelector(".track-meta-block");
+      item.hidden = !trackMatchesFilters({
+        ...filterOptions,
+        haystack: `${item.textContent || ""} ${trackMetaBlock?.textContent || ""}`,
+        labelKeys: parseLabelKeys(item.dataset.labelKeys),
+      });
+    });
+    updateTracksFilterCount(trackItems, tracksFilterCount);
+  }
   updateTracksFilterSummary({
     tracksLabelFilterSummary,
     tracksSelectedLabels,
@@ -385,6 +499,15 @@ export function getVisibleTrackIds(trackItems) {
     .filter(Boolean);
 }
 
+export function getVisibleTrackRecordIds(trackRecords) {
+  if (!Array.isArray(trackRecords)) {
+    return [];
+  }
+  return trackRecords
+    .filter((record) => !record.hidden)
+    .map((record) => record.trackId);
+}
+
 export function renderQueueDrawer({
   queueTrackIds,
   queueIndex,
@@ -395,6 +518,7 @@ export function renderQueueDrawer({
   queueNoticeText,
   selectedTrackPlayer,
   activeTrackId,
+  getTrackTitle = (trackId) => getTrackItemDisplayTitle(getTrackItemById(trackId)),
 }) {
   if (!(queueList instanceof HTMLElement)) {
     return;
@@ -423,8 +547,7 @@ export function renderQueueDrawer({
     ? !selectedTrackPlayer.paused
     : false;
   const listHtml = queueTrackIds.map((trackId, index) => {
-    const item = getTrackItemById(trackId);
-    const title = getTrackItemDisplayTitle(item);
+    const title = getTrackTitle(trackId);
     const isQueuedCurrent = index === queueIndex;
     const isPlaying = isPlayerRunning && playingTrackId === trackId;
     const isShowing = activeTrackId === trackId;
@@ -483,15 +606,31 @@ export function renderQueueDrawer({
 }
 
 export function renderTrackListItem(trackId, data, deps) {
-  const { trackLabelByKey, applyFilter } = deps;
+  const { trackLabelByKey, applyFilter, trackStore = null } = deps;
+  const displayTitle = getDisplayTitle(data);
+  const trackHasRemoteTags = hasRemoteTags(data.tags);
+
+  const record = trackStore?.byId.get(trackId);
+  if (record) {
+    const labelKeys = normalizeTrackLabelKeys(data.labels);
+    record.displayTitle = displayTitle;
+    record.hasRemoteTags = trackHasRemoteTags;
+    record.tags = String(data.tags ?? "");
+    record.notes = String(data.notes ?? "");
+    record.labelKeys = labelKeys;
+    record.labels = labelKeys.map((key) => trackLabelByKey.get(key) || key);
+  }
+
   const trackItem = document.querySelector(`.track-item[data-track-id="${CSS.escape(trackId)}"]`);
   if (!(trackItem instanceof HTMLElement)) {
+    if (record) {
+      applyFilter();
+    }
     return;
   }
 
-  const displayTitle = getDisplayTitle(data);
   trackItem.dataset.displayTitle = displayTitle;
-  trackItem.dataset.hasRemoteTags = hasRemoteTags(data.tags) ? "1" : "0";
+  trackItem.dataset.hasRemoteTags = trackHasRemoteTags ? "1" : "0";
 
   const trackMetaTitle = trackItem.querySelector("[data-track-item-display-title]");
   if (trackMetaTitle instanceof HTMLElement) {
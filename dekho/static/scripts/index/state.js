@@ -11,6 +11,92 @@ export function readLabelCatalog() {
   }
 }
 
+export function readCoverSprites() {
+  const coverSpritesElement = document.getElementById("cover-sprites-data");
+  if (!(coverSpritesElement instanceof HTMLScriptElement)) {
+    return null;
+  }
+  try {
+    const parsedSprites = JSON.parse(coverSpritesElement.textContent || "null");
+    return Array.isArray(parsedSprites?.sheet_urls) ? parsedSprites : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+function toCoverSprite(value) {
+  return Array.isArray(value) && value.length === 3 && value.every(Number.isInteger) ? value : null;
+}
+
+// Artifact flags are null until a scan has recorded the artifact manifest.
+function toOptionalFlag(value) {
+  return value === null || value === undefined ? null : Boolean(value);
+}
+
+function readColumn(columns, name, count) {
+  const values = Array.isArray(columns?.[name]) ? columns[name] : [];
+  return Array.from({ length: count }, (_, index) => values[index]);
+}
+
+function toStringList(value) {
+  return Array.isArray(value) ? value.filter((entry) => typeof entry === "string" && entry) : [];
+}
+
+export function readTracksBootstrap() {
+  const tracksBootstrapElement = document.getElementById("tracks-bootstrap-data");
+  if (!(tracksBootstrapElement instanceof HTMLScriptElement)) {
+    return [];
+  }
+  let parsedBootstrap = null;
+  try {
+    parsedBootstrap = JSON.parse(tracksBootstrapElement.textContent || "{}");
+  } catch (error) {
+    return [];
+  }
+  const columns = parsedBootstrap?.columns;
+  const count = Array.isArray(columns?.track_id) ? columns.track_id.length : 0;
+  const trackIds = readColumn(columns, "track_id", count);
+  const displayTitles = readColumn(columns, "display_title", count);
+  const titles = readColumn(columns, "title", count);
+  const notes = readColumn(columns, "notes", count);
+  const tags = readColumn(columns, "tags", count);
+  const labels = readColumn(columns, "labels", count);
+  const labelKeys = readColumn(columns, "label_keys", count);
+  const hasRemoteTags = readColumn(columns, "has_remote_tags", count);
+  const hasImages = readColumn(columns, "has_image", count);
+  const coverSprites = readColumn(columns, "cover_sprite", count);
+
+  const records = [];
+  for (let index = 0; index < count; index += 1) {
+    const trackId = typeof trackIds[index] === "string" ? trackIds[index] : "";
+    if (!trackId) {
+      continue;
+    }
+    records.push({
+      trackId,
+      displayTitle: String(displayTitles[index] || "Unknown"),
+      title: String(titles[index] || ""),
+      notes: String(notes[index] || ""),
+      tags: String(tags[index] || ""),
+      labels: toStringList(labels[index]),
+      labelKeys: toStringList(labelKeys[index]),
+      hasRemoteTags: Boolean(hasRemoteTags[index]),
+      hasImage: toOptionalFlag(hasImages[index]),
+      coverSprite: toCoverSprite(coverSprites[index]),
+      hidden: false,
+    });
+  }
+  return records;
+}
+
+export function createTrackStore(records) {
+  const normalizedRecords = Array.isArray(records) ? records : [];
+  return {
+    records: normalizedRecords,
+    byId: new Map(normalizedRecords.map((record) => [record.trackId, record])),
+  };
+}
+
 export function createTrackLabelMap(tracksLabelCatalog) {
   const trackLabelByKey = new Map();
   if (!Array.isArray(tracksLabelCatalog)) {
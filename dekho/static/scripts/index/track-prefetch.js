@@ -0,0 +1,93 @@
+import { fetchTracksBatch } from "./api.js";
+import { getTrackAudioSrc, getTrackImageSrc, getTrackSpectrogramSrc } from "./render-track-details.js";
+
+// Details, cover and spectrogram for the next few queue tracks; audio for the next one.
+export const QUEUE_PREFETCH_COUNT = 3;
+const MAX_CACHED_DETAILS = 20;
+
+function warmImage(src) {
+  if (!src) {
+    return;
+  }
+  const image = new Image();
+  image.decoding = "async";
+  image.src = src;
+}
+
+export function createTrackPrefetcher() {
+  const detailsById = new Map();
+  const pendingIds = new Set();
+  const warmedImageSrcs = new Set();
+  const audioWarmer = new Audio();
+  audioWarmer.preload = "auto";
+  audioWarmer.muted = true;
+
+  function rememberDetails(details) {
+    detailsById.delete(details.track_id);
+    detailsById.set(details.track_id, details);
+    while (detailsById.size > MAX_CACHED_DETAILS) {
+      detailsById.delete(detailsById.keys().next().value);
+    }
+  }
+
+  function warmArtifacts(details) {
+    const trackId = details.track_id;
+    const imageSrcs = [
+      details.has_image === false ? "" : getTrackImageSrc(trackId),
+      details.has_spectrogram === false ? "" : getTrackSpectrogramSrc(trackId),
+    ];
+    imageSrcs.forEach((src) => {
+      if (src && !warmedImageSrcs.has(src)) {
+        warmedImageSrcs.add(src);
+        warmImage(src);
+      }
+    });
+  }
+
+  async function prefetchDetails(trackIds) {
+    const missingIds = trackIds.filter(
+      (trackId) => trackId && !detailsById.has(trackId) && !pendingIds.has(trackId),
+    );
+    if (missingIds.length === 0) {
+      return;
+    }
+    missingIds.forEach((trackId) => pendingIds.add(trackId));
+    try {
+      const payload = await fetchTracksBatch(missingIds);
+      const labelCatalog = Array.isArray(payload.label_catalog) ? payload.label_catalog : [];
+      (Array.isArray(payload.tracks) ? payload.tracks : []).forEach((details) => {
+        rememberDetails({ ...details, label_catalog: labelCatalog });
+        warmArtifacts(details);
+      });
+    } catch (error) {
+      // Prefetching is best effort; loadTrackDetails fetches on a miss.
+    } finally {
+      missingIds.forEach((trackId) => pendingIds.delete(trackId));
+    }
+  }
+
+  function warmAudio(trackId, audioQuality) {
+    const src = trackId ? getTrackAudioSrc(trackId, audioQuality) : "";
+    if (!src || audioWarmer.getAttribute("src") === src) {
+      return;
+    }
+    audioWarmer.setAttribute("src", src);
+    audioWarmer.load();
+  }
+
+  return {
+    prefetchQueue(upcomingTrackIds, audioQuality) {
+      const trackIds = upcomingTrackIds.slice(0, QUEUE_PREFETCH_COUNT);
+      warmAudio(trackIds[0] || "", audioQuality);
+      return prefetchDetails(trackIds);
+    },
+    takeDetails(trackId) {
+      const details = detailsById.get(trackId) || null;
+      detailsById.delete(trackId);
+      return details;
+    },
+    invalidate(trackId) {
+      detailsById.delete(trackId);
+    },
+  };
+}
@@ -0,0 +1,91 @@
+export const VIRTUAL_TRACK_ROW_HEIGHT_PX = 150;
+const VIRTUAL_TRACK_OVERSCAN_ROWS = 6;
+
+export function createVirtualTrackList({
+  scrollContainer,
+  listElement,
+  renderRowHtml,
+  rowHeight = VIRTUAL_TRACK_ROW_HEIGHT_PX,
+}) {
+  let rows = [];
+  let renderedRange = null;
+  let isRenderScheduled = false;
+
+  function getWindowRange() {
+    const scrollTop = Math.max(0, scrollContainer.scrollTop);
+    const viewportHeight = scrollContainer.clientHeight || rowHeight;
+    const start = Math.max(0, Math.floor(scrollTop / rowHeight) - VIRTUAL_TRACK_OVERSCAN_ROWS);
+    const end = Math.min(
+      rows.length,
+      Math.ceil((scrollTop + viewportHeight) / rowHeight) + VIRTUAL_TRACK_OVERSCAN_ROWS
+    );
+    return { start, end };
+  }
+
+  function render(force = false) {
+    const { start, end } = getWindowRange();
+    if (!force && renderedRange && renderedRange.start === start && renderedRange.end === end) {
+      return;
+    }
+    renderedRange = { start, end };
+
+    const focusedTrackId = document.activeElement instanceof HTMLElement
+      && listElement.contains(document.activeElement)
+      ? (document.activeElement.closest(".track-item")?.dataset.trackId || "")
+      : "";
+
+    listElement.style.height = `${rows.length * rowHeight}px`;
+    listElement.innerHTML = rows.slice(start, end).map((record, offset) => {
+      const rowIndex = start + offset;
+      return renderRowHtml(record, {
+        rowIndex,
+        style: `top: ${rowIndex * rowHeight}px; height: ${rowHeight}px;`,
+      });
+    }).join("");
+
+    if (focusedTrackId) {
+      const focusedRow = listElement.querySelector(
+        `.track-item[data-track-id="${CSS.escape(focusedTrackId)}"]`
+      );
+      if (focusedRow instanceof HTMLElement) {
+        focusedRow.focus({ preventScroll: true });
+      }
+    }
+  }
+
+  function scheduleRender() {
+    if (isRenderScheduled) {
+      return;
+    }
+    isRenderScheduled = true;
+    window.requestAnimationFrame(() => {
+      isRenderScheduled = false;
+      render();
+    });
+  }
+
+  scrollContainer.addEventListener("scroll", scheduleRender, { passive: true });
+  window.addEventListener("resize", scheduleRender);
+
+  return {
+    setRows(nextRows) {
+      rows = Array.isArray(nextRows) ? nextRows : [];
+      render(true);
+    },
+    refresh() {
+      render(true);
+    },
+    scrollToTrack(trackId) {
+      const rowIndex = rows.findIndex((record) => record.trackId === trackId);
+      if (rowIndex < 0) {
+        return;
+      }
+      const rowTop = rowIndex * rowHeight;
+      const viewportHeight = scrollContainer.clientHeight;
+      if (rowTop < scrollContainer.scrollTop || rowTop + rowHeight > scrollContainer.scrollTop + viewportHeight) {
+        scrollContainer.scrollTop = Math.max(0, rowTop - Math.floor((viewportHeight - rowHeight) / 2));
+      }
+      render(true);
+    },
+  };
+}
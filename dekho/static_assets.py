@@ -0,0 +1,67 @@
+"""Content-fingerprinted URLs for files under `dekho/static`.
+
+Inputs:
+- The Flask app static folder.
+
+Outputs:
+- `asset_url(filename)` template helper returning `/static/v/<fingerprint>/<filename>`.
+- A route serving those URLs with `Cache-Control: immutable`.
+
+Side effects:
+- Hashes static file contents at startup (and per page render in debug mode).
+
+One fingerprint covers the whole static tree, so relative ES module imports in
+`scripts/index/*.js` resolve under the same fingerprinted prefix.
+"""
+
+import hashlib
+from pathlib import Path
+
+from flask import Flask, send_from_directory, url_for
+
+STATIC_ASSET_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
+STATIC_FINGERPRINT_LENGTH = 12
+
+
+def compute_static_fingerprint(static_root: Path) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(static_root.rglob("*")):
+        if not path.is_file():
+            continue
+        digest.update(path.relative_to(static_root).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:STATIC_FINGERPRINT_LENGTH]
+
+
+def register_static_assets(app: Flask) -> None:
+    static_root = Path(app.static_folder or "static")
+    fingerprint = {"value": compute_static_fingerprint(static_root)}
+
+    def current_fingerprint() -> str:
+        # The dev server reloads on Python changes only; rehash so edited
+        # JS/CSS never hides behind an immutable URL.
+        if app.debug:
+            fingerprint["value"] = compute_static_fingerprint(static_root)
+        return fingerprint["value"]
+
+    @app.get("/static/v/<fingerprint_value>/<path:filename>")
+    def fingerprinted_static(fingerprint_value: str, filename: str):
+        response = send_from_directory(static_root, filename)
+        if fingerprint_value == fingerprint["value"]:
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_ASSET_MAX_AGE_SECONDS
+            response.cache_control.immutable = True
+        else:
+            # Stale page referencing an older build: serve current bytes, uncached.
+            response.cache_control.no_cache = True
+            response.cache_control.max_age = None
+        return response
+
+    @app.template_global()
+    def asset_url(filename: str) -> str:
+        return url_for(
+            "fingerprinted_static",
+            fingerprint_value=current_fingerprint(),
+            filename=filename,
+        )
@@ -1,18 +1,54 @@
 """Export playlist-labeled tracks for Auxio.
 
 Usage:
-    uv run export_auxio.py
+    uv run export_auxio.py          # rebuild the output directory from scratch
+    uv run export_auxio.py --sync   # update it in place
+    uv run export_auxio.py --workers 4
+    uv run export_auxio.py --sync --profile opus-96   # smaller files for the phone
+
+Sync mode keeps `.dekho-sync.json` in the output directory: per exported file
+the source fingerprint (path, size, mtime, profile) and the title written into
+its tags, per playlist the content hash. Unchanged tracks are skipped, retitled
+tracks only get new tags, removed tracks and playlists are deleted, and
+playlists are only rewritten when their content changes.
+
+Profiles other than `original` transcode with ffmpeg in a process pool. Each
+transcode is cached untagged under `./export_transcodes/<profile>/`, keyed by
+the source fingerprint, so later exports (including full rebuilds) only copy
+and tag; the cache can be deleted at any time.
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import inspect
+import json
+import os
 import shutil
 import sqlite3
+import subprocess
 import sys
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 
-from mutagen.id3 import ID3, ID3NoHeaderError, TALB, TIT2, TPE1
+from mutagen.id3 import ID3, ID3NoHeaderError, TALB, TIT2, TPE1, MakeID3v1
+from mutagen.oggopus import OggOpus
+
+try:
+    # Private mutagen API used by the single-pass copy, as is `ID3._prepare_data`
+    # (pyproject pins the mutagen versions this was checked against).
+    from mutagen.id3._id3v1 import find_id3v1
+except ImportError:
+    find_id3v1 = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: no reflinks, always a plain copy.
+    fcntl = None
 
 DB_PATH = Path("dekho.sqlite3")
 MUSIC_ROOT = Path("music")
@@ -22,6 +58,47 @@ PLAYLISTS_DIR_NAME = "Playlists"
 ARTIST_NAME = "My Recordings"
 ALBUM_NAME = "Unpublished Music"
 FORBIDDEN_FILENAME_CHARS = str.maketrans("", "", r'/\:*?"<>|')
+SYNC_MANIFEST_NAME = ".dekho-sync.json"
+SYNC_MANIFEST_VERSION = 2
+# mutagen is pure Python and holds the GIL while rendering tags; only the file
+# reads, writes and clones release it, so more threads than a few only contend.
+DEFAULT_EXPORT_WORKERS = min(4, os.cpu_count() or 1)
+# linux/fs.h `_IOW(0x94, 9, int)`.
+FICLONE = 0x40049409
+COPY_CHUNK_BYTES = 1024 * 1024
+TRANSCODE_CACHE_ROOT = Path("./export_transcodes")
+# ffmpeg is CPU-bound: one transcode per core.
+DEFAULT_TRANSCODE_WORKERS = os.cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class ExportProfile:
+    name: str
+    extension: str
+    # ffmpeg output options; None exports the original file.
+    ffmpeg_args: tuple[str, ...] | None = None
+    # Ogg containers take Vorbis comments instead of ID3 tags.
+    vorbis_tags: bool = False
+
+
+EXPORT_PROFILES = {
+    profile.name: profile
+    for profile in (
+        ExportProfile("original", "mp3"),
+        ExportProfile(
+            "mp3-128", "mp3", ("-codec:a", "libmp3lame", "-b:a", "128k", "-f", "mp3")
+        ),
+        ExportProfile(
+            "opus-96",
+            "opus",
+            ("-codec:a", "libopus", "-b:a", "96k", "-f", "opus"),
+            vorbis_tags=True,
+        ),
+    )
+}
+DEFAULT_EXPORT_PROFILE = EXPORT_PROFILES["original"]
+# Sync only deletes exported tracks; other files in `Tracks/` are left alone.
+EXPORT_EXTENSIONS = sorted({profile.extension for profile in EXPORT_PROFILES.values()})
 
 
 def normalize_music_relative_path(filepath: str) -> str:
@@ -58,9 +135,9 @@ def allocate_unique_filenames(names: list[str]) -> dict[str, str]:
     return allocated
 
 
-def stable_track_filename(track_id: str) -> str:
+def stable_track_filename(track_id: str, extension: str = "mp3") -> str:
     safe_id = filesystem_safe_name(track_id) or "track"
-    return f"{safe_id}.mp3"
+    return f"{safe_id}.{extension}"
 
 
 def song_display_name(title: str | None, title_new: str | None, track_id: str) -> str:
@@ -122,12 +199,7 @@ def fetch_playlist_export_data(
     return list(tracks_by_id.values()), playlists
 
 
-def write_id3_tags(path: Path, song_name: str) -> None:
-    try:
-        tags = ID3(path)
-    except ID3NoHeaderError:
-        tags = ID3()
-
+def _apply_export_tags(tags: ID3, song_name: str) -> None:
     tags.delall("TIT2")
     tags.delall("TPE1")
     tags.delall("TALB")
@@ -135,9 +207,26 @@ def write_id3_tags(path: Path, song_name: str) -> None:
     tags.add(TPE1(encoding=3, text=ARTIST_NAME))
     tags.add(TALB(encoding=3, text=ALBUM_NAME))
     tags.update_to_v23()
+
+
+def write_id3_tags(path: Path, song_name: str) -> None:
+    try:
+        tags = ID3(path)
+    except ID3NoHeaderError:
+        tags = ID3()
+
+    _apply_export_tags(tags, song_name)
     tags.save(path, v2_version=3)
 
 
+def write_opus_tags(path: Path, song_name: str) -> None:
+    audio = OggOpus(path)
+    audio.tags["title"] = song_name
+    audio.tags["artist"] = ARTIST_NAME
+    audio.tags["album"] = ALBUM_NAME
+    audio.save()
+
+
 def resolve_source_path(filepath: str, music_root: Path) -> Path | None:
     if not filepath:
         return None
@@ -148,60 +237,386 @@ def resolve_source_path(filepath: str, music_root: Path) -> Path | None:
     return None
 
 
-def build_m3u8_contents(track_ids: list[str]) -> str:
+def build_m3u8_contents(track_ids: list[str], extension: str = "mp3") -> str:
     lines = ["#EXTM3U"]
     for track_id in track_ids:
-        lines.append(f"../{TRACKS_DIR_NAME}/{stable_track_filename(track_id)}")
+        lines.append(f"../{TRACKS_DIR_NAME}/{stable_track_filename(track_id, extension)}")
     return "\n".join(lines) + "\n"
 
 
+@dataclass
+class SyncCounts:
+    written: int = 0
+    retagged: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    transcoded: int = 0
+
+
+def load_sync_manifest(output_dir: Path) -> dict[str, dict[str, object]]:
+    """Return `{"tracks": {...}, "playlists": {...}}`; empty if missing or outdated."""
+    empty: dict[str, dict[str, object]] = {"tracks": {}, "playlists": {}}
+    try:
+        manifest = json.loads((output_dir / SYNC_MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return empty
+    version = manifest.get("version")
+    if version not in (1, SYNC_MANIFEST_VERSION):
+        return empty
+    tracks = manifest.get("tracks", {})
+    if version == 1:
+        # Version 1 predates export profiles: everything was an original copy.
+        for entry in tracks.values():
+            if isinstance(entry, dict):
+                entry["profile"] = "original"
+    return {"tracks": tracks, "playlists": manifest.get("playlists", {})}
+
+
+def save_sync_manifest(output_dir: Path, manifest: dict[str, dict[str, object]]) -> None:
+    manifest_path = output_dir / SYNC_MANIFEST_NAME
+    temporary_path = output_dir / f"{SYNC_MANIFEST_NAME}.part"
+    temporary_path.write_text(
+        json.dumps({"version": SYNC_MANIFEST_VERSION, **manifest}, indent=1, sort_keys=True),
+        encoding="utf-8",
+    )
+    temporary_path.replace(manifest_path)
+
+
+def _source_fingerprint(source: Path) -> dict[str, object]:
+    stat = source.stat()
+    return {"source": str(source), "source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+
+
+def _exported_file_state(path: Path) -> dict[str, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _remove_unlisted_files(directory: Path, pattern: str, keep: set[str]) -> int:
+    removed = 0
+    for path in directory.glob(pattern):
+        if path.name not in keep and path.is_file():
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def _try_reflink(source_file: BinaryIO, destination_file: BinaryIO) -> bool:
+    if fcntl is None:
+        return False
+    if os.fstat(source_file.fileno()).st_dev != os.fstat(destination_file.fileno()).st_dev:
+        return False
+    try:
+        fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+    except OSError:
+        return False  # No reflink support (ext4, tmpfs, ...).
+    return True
+
+
+def _has_single_pass_helpers() -> bool:
+    """Whether the private mutagen helpers exist with the signatures used below."""
+    try:
+        prepare_parameters = list(inspect.signature(ID3._prepare_data).parameters)
+        find_parameters = list(inspect.signature(find_id3v1).parameters)
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return (
+        prepare_parameters
+        == ["self", "fileobj", "start", "available", "v2_version", "v23_sep", "pad_func"]
+        and find_parameters[:1] == ["fileobj"]
+    )
+
+
+# Checked once; otherwise `copy_with_export_tags` is copy then tag.
+SINGLE_PASS_TAGGING = _has_single_pass_helpers()
+
+
+def _render_export_tags(
+    source_file: BinaryIO, song_name: str
+) -> tuple[bytes, int, int, bytes]:
+    """`ID3.save()` minus the in-place write: `(header, old_header_size, audio_end, id3v1)`."""
+    try:
+        tags = ID3(source_file)
+    except ID3NoHeaderError:
+        tags = ID3()
+    _apply_export_tags(tags, song_name)
+    old_header_size = tags.size
+    # The padding depends on the file size, hence the source file.
+    header = tags._prepare_data(source_file, 0, old_header_size, 3, "/", None)
+    id3v1, id3v1_offset = find_id3v1(source_file)
+    file_size = source_file.seek(0, os.SEEK_END)
+    audio_end = file_size + id3v1_offset if id3v1 is not None else file_size
+    id3v1_bytes = MakeID3v1(tags) if id3v1 is not None else b""
+    return header, old_header_size, audio_end, id3v1_bytes
+
+
+def copy_with_export_tags(source: Path, destination: Path, song_name: str) -> None:
+    """Write `source` to `destination` with the export tags, reading the source once.
+
+    The result is byte-identical to `shutil.copy2()` followed by
+    `write_id3_tags()`: the new ID3v2.3 header is rendered in memory with the
+    padding `ID3.save()` would choose, the audio after the old header is
+    streamed behind it, and a trailing ID3v1 tag is regenerated from the new
+    frames. When the header keeps its size and the filesystem supports it,
+    the file is cloned (`FICLONE`) and only the header and ID3v1 bytes are
+    written. Hardlinks are never used, as they would share the rewrite with
+    the library file. If the private mutagen helpers this needs are missing
+    or changed (`SINGLE_PASS_TAGGING`), it is exactly `shutil.copy2()`
+    followed by `write_id3_tags()`.
+    """
+    if not SINGLE_PASS_TAGGING:
+        shutil.copy2(source, destination)
+        write_id3_tags(destination, song_name)
+        return
+
+    with open(source, "rb") as source_file:
+        header, old_header_size, audio_end, id3v1_bytes = _render_export_tags(
+            source_file, song_name
+        )
+        with open(destination, "wb") as destination_file:
+            if len(header) == old_header_size and _try_reflink(source_file, destination_file):
+                destination_file.seek(0)
+                destination_file.write(header)
+                destination_file.seek(audio_end)
+                destination_file.write(id3v1_bytes)
+            else:
+                destination_file.write(header)
+                source_file.seek(old_header_size)
+                remaining = audio_end - old_header_size
+                while remaining > 0:
+                    chunk = source_file.read(min(COPY_CHUNK_BYTES, remaining))
+                    if not chunk:
+                        break
+                    destination_file.write(chunk)
+                    remaining -= len(chunk)
+                destination_file.write(id3v1_bytes)
+                # A legacy over-long ID3v1 region keeps its tail, as with `ID3.save()`.
+                source_file.seek(audio_end + len(id3v1_bytes))
+                shutil.copyfileobj(source_file, destination_file, COPY_CHUNK_BYTES)
+    shutil.copymode(source, destination)
+
+
+def transcode_cache_path(
+    source: Path, profile: ExportProfile, cache_root: Path = TRANSCODE_CACHE_ROOT
+) -> Path:
+    """Cache location of `source` transcoded with `profile`, keyed by its fingerprint."""
+    key_data = json.dumps(
+        [profile.name, profile.ffmpeg_args, _source_fingerprint(source.resolve())]
+    )
+    key = hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+    return cache_root / profile.name / key[:2] / f"{key}.{profile.extension}"
+
+
+def transcode_to_cache(source: Path, cache_path: Path, ffmpeg_args: tuple[str, ...]) -> Path:
+    """Run ffmpeg into `cache_path` (atomically, via a temporary file); tags are stripped."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = cache_path.with_name(f".{cache_path.name}.part")
+    command = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-y",
+        "-i",
+        str(source),
+        "-vn",
+        "-map_metadata",
+        "-1",
+        *ffmpeg_args,
+        str(temporary_path),
+    ]
+    try:
+        subprocess.run(command, capture_output=True, check=True)
+        temporary_path.replace(cache_path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+    return cache_path
+
+
+def transcode_missing(
+    jobs: dict[Path, Path], profile: ExportProfile, workers: int = DEFAULT_TRANSCODE_WORKERS
+) -> dict[Path, str]:
+    """Transcode each `source -> cache_path` not cached yet; return `{source: error}`.
+
+    ffmpeg is only needed when something is missing from the cache.
+    """
+    missing = {
+        source: cache_path for source, cache_path in jobs.items() if not cache_path.is_file()
+    }
+    if not missing:
+        return {}
+    if shutil.which("ffmpeg") is None:
+        return {source: "ffmpeg not found on PATH" for source in missing}
+
+    failed: dict[Path, str] = {}
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as executor:
+        futures = {
+            executor.submit(transcode_to_cache, source, cache_path, profile.ffmpeg_args): source
+            for source, cache_path in missing.items()
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except subprocess.CalledProcessError as error:
+                message = error.stderr.decode("utf-8", "replace").strip() if error.stderr else ""
+                failed[futures[future]] = message or str(error)
+            except OSError as error:
+                failed[futures[future]] = str(error)
+    return failed
+
+
+def _export_track_file(
+    source: Path, destination: Path, title: str, copy: bool, profile: ExportProfile
+) -> dict[str, int] | None:
+    if profile.vorbis_tags:
+        if copy:
+            shutil.copyfile(source, destination)
+        write_opus_tags(destination, title)
+    elif copy:
+        copy_with_export_tags(source, destination, title)
+    else:
+        write_id3_tags(destination, title)
+    return _exported_file_state(destination)
+
+
 def export_tracks(
     tracks: list[dict[str, object]],
     tracks_dir: Path,
     music_root: Path,
-) -> tuple[int, list[str]]:
-    copied = 0
+    manifest_tracks: dict[str, object],
+    workers: int = DEFAULT_EXPORT_WORKERS,
+    profile: ExportProfile = DEFAULT_EXPORT_PROFILE,
+    cache_root: Path = TRANSCODE_CACHE_ROOT,
+    transcode_workers: int = DEFAULT_TRANSCODE_WORKERS,
+) -> tuple[SyncCounts, list[str], dict[str, str]]:
+    """Bring `tracks_dir` in line with `tracks`, updating `manifest_tracks` in place.
+
+    A file is copied when its source fingerprint or the profile changed, or
+    the exported file was modified or deleted since the last run; otherwise
+    only a changed title is written. Transcodes missing from the cache run on
+    `transcode_workers` processes first; copy and tag work then runs on
+    `workers` threads. Files of tracks that left every playlist are deleted;
+    files whose source is missing right now are kept.
+
+    Returns the counts, the missing sources and `{filepath: error}` of failed
+    transcodes.
+    """
+    counts = SyncCounts()
     missing: list[str] = []
+    keep: set[str] = set()
+    pending: list[tuple[str, Path, str, dict[str, object], bool]] = []
 
     for track in tracks:
         track_id = str(track["track_id"])
         filepath = str(track.get("filepath") or "")
+        filename = stable_track_filename(track_id, profile.extension)
+        destination = tracks_dir / filename
+        keep.add(filename)
         source = resolve_source_path(filepath, music_root)
         if source is None:
             missing.append(filepath or track_id)
             continue
 
-        destination = tracks_dir / stable_track_filename(track_id)
-        shutil.copy2(source, destination)
-        write_id3_tags(destination, str(track["title"]))
-        copied += 1
+        title = str(track["title"])
+        fingerprint = {**_source_fingerprint(source), "profile": profile.name}
+        entry = manifest_tracks.get(filename)
+        up_to_date = (
+            isinstance(entry, dict)
+            and all(entry.get(key) == value for key, value in fingerprint.items())
+            and _exported_file_state(destination)
+            == {"size": entry.get("size"), "mtime_ns": entry.get("mtime_ns")}
+        )
+        if up_to_date and entry.get("title") == title:
+            counts.unchanged += 1
+            continue
+        pending.append((filename, source, title, fingerprint, not up_to_date))
+
+    failed: dict[str, str] = {}
+    if profile.ffmpeg_args is not None:
+        cached = {
+            source: transcode_cache_path(source, profile, cache_root)
+            for _, source, _, _, copy in pending
+            if copy
+        }
+        uncached = sum(1 for cache_path in cached.values() if not cache_path.is_file())
+        errors = transcode_missing(cached, profile, transcode_workers)
+        counts.transcoded = uncached - len(errors)
+        failed = {str(source): error for source, error in errors.items()}
+        pending = [
+            (filename, cached[source] if copy else source, title, fingerprint, copy)
+            for filename, source, title, fingerprint, copy in pending
+            if str(source) not in failed
+        ]
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {
+            executor.submit(
+                _export_track_file, source, tracks_dir / filename, title, copy, profile
+            ): (filename, title, fingerprint, copy)
+            for filename, source, title, fingerprint, copy in pending
+        }
+        for future in as_completed(futures):
+            filename, title, fingerprint, copy = futures[future]
+            manifest_tracks[filename] = {**fingerprint, "title": title, **future.result()}
+            if copy:
+                counts.written += 1
+            else:
+                counts.retagged += 1
+    finally:
+        # On an error or Ctrl+C drop queued files; finished ones stay in the manifest.
+        executor.shutdown(wait=True, cancel_futures=True)
 
-    return copied, missing
+    for filename in [name for name in manifest_tracks if name not in keep]:
+        del manifest_tracks[filename]
+    # Every profile's extension: switching profiles replaces `.mp3` files with `.opus` ones.
+    counts.removed = sum(
+        _remove_unlisted_files(tracks_dir, f"*.{extension}", keep)
+        for extension in EXPORT_EXTENSIONS
+    )
+    return counts, missing, failed
 
 
 def export_playlists(
     playlists: OrderedDict[str, list[str]],
     playlists_dir: Path,
-) -> int:
+    manifest_playlists: dict[str, object],
+    extension: str = "mp3",
+) -> SyncCounts:
+    """Write `.m3u8` files whose content hash changed and delete removed playlists."""
     filename_stems = allocate_unique_filenames(list(playlists.keys()))
-    written = 0
+    counts = SyncCounts()
+    keep: set[str] = set()
 
     for playlist_name, track_ids in playlists.items():
-        stem = filename_stems[playlist_name]
-        output_path = playlists_dir / f"{stem}.m3u8"
-        output_path.write_text(build_m3u8_contents(track_ids), encoding="utf-8")
-        written += 1
+        filename = f"{filename_stems[playlist_name]}.m3u8"
+        keep.add(filename)
+        output_path = playlists_dir / filename
+        contents = build_m3u8_contents(track_ids, extension)
+        content_hash = hashlib.sha256(contents.encode("utf-8")).hexdigest()
+        if manifest_playlists.get(filename) == content_hash and output_path.is_file():
+            counts.unchanged += 1
+            continue
+        output_path.write_text(contents, encoding="utf-8")
+        manifest_playlists[filename] = content_hash
+        counts.written += 1
 
-    return written
+    for filename in [name for name in manifest_playlists if name not in keep]:
+        del manifest_playlists[filename]
+    counts.removed = _remove_unlisted_files(playlists_dir, "*.m3u8", keep)
+    return counts
 
 
-def prepare_output_dirs(output_dir: Path) -> tuple[Path, Path]:
-    if output_dir.exists():
+def prepare_output_dirs(output_dir: Path, sync: bool = False) -> tuple[Path, Path]:
+    """Create the output layout; without `sync` any previous export is removed first."""
+    if output_dir.exists() and not sync:
         shutil.rmtree(output_dir)
     tracks_dir = output_dir / TRACKS_DIR_NAME
     playlists_dir = output_dir / PLAYLISTS_DIR_NAME
-    tracks_dir.mkdir(parents=True)
-    playlists_dir.mkdir(parents=True)
+    tracks_dir.mkdir(parents=True, exist_ok=True)
+    playlists_dir.mkdir(parents=True, exist_ok=True)
     return tracks_dir, playlists_dir
 
 
@@ -209,36 +624,107 @@ def export_auxio(
     db_path: Path = DB_PATH,
     music_root: Path = MUSIC_ROOT,
     output_dir: Path = OUTPUT_DIR,
+    sync: bool = False,
+    workers: int = DEFAULT_EXPORT_WORKERS,
+    profile: ExportProfile = DEFAULT_EXPORT_PROFILE,
+    cache_root: Path = TRANSCODE_CACHE_ROOT,
+    transcode_workers: int = DEFAULT_TRANSCODE_WORKERS,
 ) -> int:
     if not db_path.exists():
         print(f"Database not found: {db_path.resolve()}", file=sys.stderr)
         return 1
-
     connection = sqlite3.connect(db_path)
     try:
         tracks, playlists = fetch_playlist_export_data(connection)
     finally:
         connection.close()
 
-    tracks_dir, playlists_dir = prepare_output_dirs(output_dir)
-    copied, missing = export_tracks(tracks, tracks_dir, music_root)
-    playlist_count = export_playlists(playlists, playlists_dir)
-
-    print(f"Exported to {output_dir.resolve()}")
-    print(f"  tracks: {copied}")
-    print(f"  playlists: {playlist_count}")
+    tracks_dir, playlists_dir = prepare_output_dirs(output_dir, sync=sync)
+    # A full export also writes the manifest, so the next `--sync` is incremental.
+    manifest = load_sync_manifest(output_dir)
+    try:
+        track_counts, missing, failed = export_tracks(
+            tracks,
+            tracks_dir,
+            music_root,
+            manifest["tracks"],
+            workers,
+            profile,
+            cache_root,
+            transcode_workers,
+        )
+        playlist_counts = export_playlists(
+            playlists, playlists_dir, manifest["playlists"], profile.extension
+        )
+    finally:
+        # Entries are only updated once a file is complete, so an interrupted
+        # sync resumes where it stopped.
+        save_sync_manifest(output_dir, manifest)
+
+    print(f"Exported to {output_dir.resolve()} ({profile.name})")
+    if profile.ffmpeg_args is not None:
+        print(f"  transcoded: {track_counts.transcoded} (others from {cache_root.resolve()})")
+    if sync:
+        print(
+            f"  tracks: {track_counts.written} copied, {track_counts.retagged} retagged,"
+            f" {track_counts.unchanged} unchanged, {track_counts.removed} removed"
+        )
+        print(
+            f"  playlists: {playlist_counts.written} written,"
+            f" {playlist_counts.unchanged} unchanged, {playlist_counts.removed} removed"
+        )
+    else:
+        print(f"  tracks: {track_counts.written}")
+        print(f"  playlists: {playlist_counts.written}")
 
     if missing:
         print(f"Missing {len(missing)} source files:", file=sys.stderr)
         for relative in missing:
             print(f"  {relative}", file=sys.stderr)
+    if failed:
+        print(f"Failed to transcode {len(failed)} files:", file=sys.stderr)
+        for source, error in failed.items():
+            print(f"  {source}: {error}", file=sys.stderr)
+    if missing or failed:
         return 1
 
     return 0
 
 
 def main() -> None:
-    sys.exit(export_auxio())
+    parser = argparse.ArgumentParser(description="Export playlist-labeled tracks for Auxio.")
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Update the output directory in place instead of rebuilding it.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_EXPORT_WORKERS,
+        help="Tracks copied and tagged in parallel.",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=EXPORT_PROFILES,
+        default=DEFAULT_EXPORT_PROFILE.name,
+        help="original copies (default), or transcodes: mp3-128, opus-96 (need ffmpeg).",
+    )
+    parser.add_argument(
+        "--transcode-workers",
+        type=int,
+        default=DEFAULT_TRANSCODE_WORKERS,
+        help="ffmpeg processes run in parallel (default: one per CPU).",
+    )
+    args = parser.parse_args()
+    sys.exit(
+        export_auxio(
+            sync=args.sync,
+            workers=args.workers,
+            profile=EXPORT_PROFILES[args.profile],
+            transcode_workers=args.transcode_workers,
+        )
+    )
 
 
 if __name__ == "__main__":
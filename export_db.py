@@ -1,16 +1,55 @@
-"""Export the SQLite database to CSV files for external analysis."""
+"""Export the SQLite database to CSV, JSONL or Parquet files for external analysis.
+
+Usage:
+    uv run export_db.py                                   # every table as CSV
+    uv run export_db.py --format parquet                  # needs the `export` extra
+    uv run export_db.py --format jsonl --tables track_events,tracks_file_data
+    uv run export_db.py --since 2026-10-01                # only rows added/changed since
+    uv run export_db.py --delta                           # only rows changed since last run
+
+Rows are streamed in `fetchmany` batches, so memory stays flat however large
+a table is. `--since` filters the change-tracked tables on `updated_at`
+(stamped on every insert and real update) and the tables in `SINCE_COLUMNS`
+on their timestamp column; other tables are exported in full.
+
+`--delta` keeps a watermark (the last exported `row_changes.seq`) in the
+output directory. The first run exports everything into the output
+directory; later runs write `delta-<from>-<to>/` with the change-tracked rows
+whose `change_seq` is newer, the matching `row_changes` entries (including
+deletes) and the untracked tables in full. The watermark covers every table,
+so `--delta` always exports all of them and rejects `--tables`. If the log was
+pruned past the watermark, or the watermark is ahead of the log (the database
+was replaced), the run falls back to a full export.
+"""
 
 from __future__ import annotations
 
 import argparse
 import csv
+import json
 import sqlite3
 import sys
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
 from pathlib import Path
 
 
 DB_PATH = Path("dekho.sqlite3")
 DEFAULT_OUTPUT_DIR = Path("export")
+FETCH_BATCH_ROWS = 5000
+OUTPUT_FORMATS = ("csv", "jsonl", "parquet")
+# Timestamp column `--since` compares against in tables without change capture;
+# change-tracked tables (those with `change_seq`) use CHANGE_TIMESTAMP_COLUMN.
+SINCE_COLUMNS = {
+    "track_events": "created_at",
+    "remote_page_cache": "fetched_at",
+}
+CHANGE_TIMESTAMP_COLUMN = "updated_at"
+# INTEGER columns holding 0/1 are typed as booleans in JSONL and Parquet.
+FLAG_COLUMN_PREFIXES = ("has_", "is_")
+PARQUET_COMPRESSION = "zstd"
+WATERMARK_NAME = ".export_watermark.json"
+CHANGE_LOG_TABLE = "row_changes"
 
 
 def _get_user_tables(connection: sqlite3.Connection) -> list[str]:
@@ -26,52 +65,282 @@ def _get_user_tables(connection: sqlite3.Connection) -> list[str]:
     return [row[0] for row in rows]
 
 
-def _export_table(connection: sqlite3.Connection, table_name: str, output_path: Path) -> int:
-    cursor = connection.execute(f'SELECT * FROM "{table_name}"')
-    column_names = [description[0] for description in cursor.description]
-    rows = cursor.fetchall()
+def _get_column_types(connection: sqlite3.Connection, table_name: str) -> dict[str, str]:
+    """Column name -> `bool`, `int`, `float`, `bytes` or `str`, from the declared types."""
+    column_types: dict[str, str] = {}
+    for row in connection.execute(f'PRAGMA table_info("{table_name}")'):
+        name, declared = row[1], (row[2] or "").upper()
+        if "INT" in declared:
+            column_types[name] = "bool" if name.startswith(FLAG_COLUMN_PREFIXES) else "int"
+        elif any(token in declared for token in ("REAL", "FLOA", "DOUB")):
+            column_types[name] = "float"
+        elif "BLOB" in declared:
+            column_types[name] = "bytes"
+        else:
+            column_types[name] = "str"
+    return column_types
+
+
+def _select_rows(
+    connection: sqlite3.Connection,
+    table_name: str,
+    since: str | None = None,
+    after_seq: int | None = None,
+) -> sqlite3.Cursor:
+    """`SELECT *` filtered by `--since` and, for change-tracked tables, by change sequence."""
+    conditions: list[str] = []
+    parameters: list[object] = []
+    since_column = _since_column(connection, table_name)
+    if since is not None and since_column is not None:
+        conditions.append(f'"{since_column}" >= ?')
+        parameters.append(since)
+    seq_column = _change_seq_column(connection, table_name)
+    if after_seq is not None and seq_column is not None:
+        conditions.append(f'"{seq_column}" > ?')
+        parameters.append(after_seq)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return connection.execute(f'SELECT * FROM "{table_name}"{where}', parameters)
+
+
+def _since_column(connection: sqlite3.Connection, table_name: str) -> str | None:
+    if table_name != CHANGE_LOG_TABLE and _change_seq_column(connection, table_name):
+        return CHANGE_TIMESTAMP_COLUMN
+    return SINCE_COLUMNS.get(table_name)
+
+
+def _change_seq_column(connection: sqlite3.Connection, table_name: str) -> str | None:
+    if table_name == CHANGE_LOG_TABLE:
+        return "seq"
+    columns = {row[1] for row in connection.execute(f'PRAGMA table_info("{table_name}")')}
+    return "change_seq" if "change_seq" in columns else None
+
+
+def read_watermark(output_dir: Path) -> int | None:
+    try:
+        return int(json.loads((output_dir / WATERMARK_NAME).read_text())["seq"])
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_watermark(output_dir: Path, seq: int) -> None:
+    temporary_path = output_dir / f"{WATERMARK_NAME}.part"
+    temporary_path.write_text(
+        json.dumps({"seq": seq, "exported_at": datetime.now(UTC).isoformat()})
+    )
+    temporary_path.replace(output_dir / WATERMARK_NAME)
+
+
+def _get_change_bounds(connection: sqlite3.Connection) -> tuple[int, int]:
+    row = connection.execute(
+        f"""
+        SELECT
+            (SELECT MIN(seq) FROM {CHANGE_LOG_TABLE}),
+            (SELECT MAX(seq) FROM {CHANGE_LOG_TABLE})
+        """
+    ).fetchone()
+    return int(row[0] or 0), int(row[1] or 0)
+
+
+def _iter_batches(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[list[tuple]]:
+    while rows := cursor.fetchmany(batch_size):
+        yield rows
+
 
+def _typed_rows(rows: list[tuple], column_types: list[str]) -> Iterator[list[object]]:
+    for row in rows:
+        yield [
+            bool(value) if kind == "bool" and value is not None else value
+            for value, kind in zip(row, column_types)
+        ]
+
+
+def _write_csv(
+    output_path: Path, columns: dict[str, str], batches: Iterator[list[tuple]]
+) -> int:
+    row_count = 0
     with output_path.open("w", newline="", encoding="utf-8") as handle:
         writer = csv.writer(handle)
-        writer.writerow(column_names)
-        writer.writerows(rows)
+        writer.writerow(columns)
+        for rows in batches:
+            writer.writerows(rows)
+            row_count += len(rows)
+    return row_count
+
 
-    return len(rows)
+def _write_jsonl(
+    output_path: Path, columns: dict[str, str], batches: Iterator[list[tuple]]
+) -> int:
+    names = list(columns)
+    column_types = list(columns.values())
+    row_count = 0
+    with output_path.open("w", encoding="utf-8") as handle:
+        for rows in batches:
+            for values in _typed_rows(rows, column_types):
+                handle.write(json.dumps(dict(zip(names, values)), ensure_ascii=False))
+                handle.write("\n")
+            row_count += len(rows)
+    return row_count
 
 
-def export_database(db_path: Path, output_dir: Path) -> None:
+def _write_parquet(
+    output_path: Path, columns: dict[str, str], batches: Iterator[list[tuple]]
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet export needs pyarrow: uv sync --extra export") from None
+
+    arrow_types = {
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bytes": pa.binary(),
+        "str": pa.string(),
+    }
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in columns.items()])
+    column_types = list(columns.values())
+    row_count = 0
+    # One row group per fetched batch; an empty table still gets its schema.
+    with pq.ParquetWriter(output_path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for rows in batches:
+            typed = list(_typed_rows(rows, column_types))
+            arrays = [
+                pa.array([row[index] for row in typed], type=field.type)
+                for index, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            row_count += len(rows)
+    return row_count
+
+
+WRITERS: dict[str, Callable[[Path, dict[str, str], Iterator[list[tuple]]], int]] = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "parquet": _write_parquet,
+}
+
+
+def _export_table(
+    connection: sqlite3.Connection,
+    table_name: str,
+    output_path: Path,
+    output_format: str = "csv",
+    since: str | None = None,
+    batch_size: int = FETCH_BATCH_ROWS,
+    after_seq: int | None = None,
+) -> int:
+    columns = _get_column_types(connection, table_name)
+    cursor = _select_rows(connection, table_name, since, after_seq)
+    return WRITERS[output_format](output_path, columns, _iter_batches(cursor, batch_size))
+
+
+def _parse_since(value: str) -> str:
+    """Accept an ISO date or datetime and return it as stored timestamps are written.
+
+    Stored timestamps are UTC ISO strings compared as text, so a datetime is
+    converted to UTC (naive ones are taken as UTC); a bare date is kept.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO date or datetime: {value!r}") from None
+    if "T" not in value and " " not in value.strip():
+        return parsed.date().isoformat()
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=UTC).isoformat()
+    return parsed.astimezone(UTC).isoformat()
+
+
+def export_database(
+    db_path: Path,
+    output_dir: Path,
+    output_format: str = "csv",
+    tables: list[str] | None = None,
+    since: str | None = None,
+    delta: bool = False,
+) -> None:
     if not db_path.exists():
         print(f"Database not found: {db_path.resolve()}", file=sys.stderr)
         sys.exit(1)
 
-    output_dir.mkdir(parents=True, exist_ok=True)
-
     connection = sqlite3.connect(db_path)
     try:
-        tables = _get_user_tables(connection)
-        if not tables:
+        available = _get_user_tables(connection)
+        unknown = sorted(set(tables or []) - set(available))
+        if unknown:
+            print(f"Unknown tables: {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(2)
+        if delta and tables is not None:
+            # One watermark covers every table; a partial delta would advance it past
+            # changes (and deletes) in the tables it left out.
+            print("--delta cannot be combined with --tables.", file=sys.stderr)
+            sys.exit(2)
+        selected = [name for name in available if tables is None or name in tables]
+        if not selected:
             print("No tables found in database.")
             return
 
-        print(f"Exporting {db_path.resolve()} -> {output_dir.resolve()}")
-        for table_name in tables:
-            output_path = output_dir / f"{table_name}.csv"
-            row_count = _export_table(connection, table_name, output_path)
-            print(f"  {table_name}.csv ({row_count:,} rows)")
+        # One read transaction: every table and the watermark see the same snapshot.
+        connection.execute("BEGIN")
+        after_seq = None
+        target_dir = output_dir
+        if delta and CHANGE_LOG_TABLE in available:
+            oldest_seq, latest_seq = _get_change_bounds(connection)
+            watermark = read_watermark(output_dir)
+            if watermark is not None and oldest_seq > watermark + 1:
+                print(f"Change log pruned past watermark {watermark}; exporting in full.")
+            elif watermark is not None and watermark > latest_seq:
+                print(
+                    f"Watermark {watermark} is ahead of the change log ({latest_seq}); "
+                    "the database was replaced, exporting in full."
+                )
+            elif watermark == latest_seq:
+                print(f"No changes since watermark {watermark}.")
+                return
+            elif watermark is not None:
+                after_seq = watermark
+                target_dir = output_dir / f"delta-{watermark}-{latest_seq}"
+
+        target_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Exporting {db_path.resolve()} -> {target_dir.resolve()}")
+        for table_name in selected:
+            output_name = f"{table_name}.{output_format}"
+            row_count = _export_table(
+                connection,
+                table_name,
+                target_dir / output_name,
+                output_format,
+                since,
+                after_seq=after_seq,
+            )
+            notes = []
+            if since is not None:
+                since_column = _since_column(connection, table_name)
+                notes.append(f"{since_column} >= {since}" if since_column else "full")
+            if after_seq is not None:
+                tracked = _change_seq_column(connection, table_name) is not None
+                notes.append(f"changed after {after_seq}" if tracked else "full")
+            note = "".join(f", {text}" for text in dict.fromkeys(notes))
+            print(f"  {output_name} ({row_count:,} rows{note})")
+
+        if delta and CHANGE_LOG_TABLE in available:
+            write_watermark(output_dir, latest_seq)
+        connection.commit()
     finally:
         connection.close()
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(
-        description="Export dekho SQLite tables to CSV files."
+        description="Export dekho SQLite tables to CSV, JSONL or Parquet files."
     )
     parser.add_argument(
         "-o",
         "--output-dir",
         type=Path,
         default=DEFAULT_OUTPUT_DIR,
-        help=f"Directory for CSV files (default: {DEFAULT_OUTPUT_DIR})",
+        help=f"Directory for exported files (default: {DEFAULT_OUTPUT_DIR})",
     )
     parser.add_argument(
         "--db",
@@ -79,8 +348,35 @@ def main() -> None:
         default=DB_PATH,
         help=f"Path to SQLite database (default: {DB_PATH})",
     )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="csv (default), jsonl, or zstd-compressed parquet (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--tables",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        default=None,
+        help="Comma-separated tables to export (default: all)",
+    )
+    parser.add_argument(
+        "--since",
+        type=_parse_since,
+        default=None,
+        help="Only rows added or changed at or after this ISO date/datetime "
+        "(converted to UTC)",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Only rows changed since the watermark of the previous --delta export "
+        "(all tables; not combinable with --tables)",
+    )
     args = parser.parse_args()
-    export_database(args.db, args.output_dir)
+    export_database(
+        args.db, args.output_dir, args.format, args.tables, args.since, args.delta
+    )
 
 
 if __name__ == "__main__":
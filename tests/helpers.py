@@ -0,0 +1,100 @@
+"""Shared test fixtures: tiny tagged MP3 files, a synthetic Suno page, a scratch workdir."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from mutagen.id3 import APIC, ID3, TIT2, WOAS
+
+import dekho.db as db
+
+# One MPEG-1 Layer III 128 kbps / 44.1 kHz frame; a few in a row let mutagen sync.
+MP3_FRAME = bytes.fromhex("fffb9064") + bytes(413)
+
+
+def write_tagged_mp3(
+    path: Path,
+    track_id: str | None = None,
+    cover: bytes | None = None,
+    title: str | None = None,
+    frames: int = 8,
+) -> None:
+    """Write `frames` silent MP3 frames with a Suno URL, cover and title tag as given."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(MP3_FRAME * frames)
+    tags = ID3()
+    if track_id is not None:
+        tags.add(WOAS(url=f"https://suno.com/song/{track_id}"))
+    if title is not None:
+        tags.add(TIT2(encoding=3, text=title))
+    if cover is not None:
+        tags.add(APIC(mime="image/jpeg", type=3, desc="cover", data=cover))
+    tags.save(path)
+
+
+SYNTHETIC_UI_CHUNKS = 400
+# Fraction of the page that precedes the clip payload in the synthetic page.
+SYNTHETIC_CLIP_POSITION = 0.3
+
+
+def _push_script(chunk: str) -> str:
+    return f"<script>self.__next_f.push([1,{json.dumps(chunk)}])</script>"
+
+
+def build_synthetic_page(ui_chunks: int = SYNTHETIC_UI_CHUNKS) -> str:
+    """A Flight page shaped like a track page: UI trees, one clip, its lyrics, related clips."""
+    items = [
+        ["$", "span", str(index), {"className": "text-sm", "children": f"Item {index}"}]
+        for index in range(40)
+    ]
+    ui_tree = json.dumps(["$", "div", None, {"className": "flex flex-col", "children": items}])
+    clip = {
+        "id": "clip-1",
+        "major_model_version": "v4",
+        "model_name": "chirp-v4",
+        "prompt": "$3e",
+        "tags": "folk, acoustic",
+        "negative_tags": "metal",
+        "cover_clip_id": None,
+        "persona": {"name": "Ada"},
+        "metadata": {"duration": 182.5, "type": "gen"},
+    }
+    lyrics = "\n".join(
+        f"[Verse {verse}]\n" + "\n".join(f"Line {line} of verse {verse}" for line in range(8))
+        for verse in range(1, 5)
+    )
+    related = [
+        {"id": f"related-{index}", "tags": "pop", "model_name": "chirp-v3"} for index in range(30)
+    ]
+    before = int(ui_chunks * SYNTHETIC_CLIP_POSITION)
+    chunks = [f"{index:x}:{ui_tree}" for index in range(before)]
+    chunks += ["2:" + json.dumps([clip]), f"3e:T{len(lyrics):x},", lyrics]
+    chunks += [f"{index:x}:{ui_tree}" for index in range(before, ui_chunks)]
+    chunks.append("4:" + json.dumps(related))
+    return "<html><body>" + "".join(_push_script(chunk) for chunk in chunks) + "</body></html>"
+
+
+class TempWorkdirTestCase(unittest.TestCase):
+    """Runs each test inside a temporary directory with its own database.
+
+    `self.root` is the directory (also the working directory, so relative
+    artifact, sprite and backup paths land in it); `self.music_dir` is
+    `root/music`.
+    """
+
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name).resolve()
+        os.chdir(self.root)
+        db.DB_PATH = self.root / "test.sqlite3"
+        db.init_db()
+        self.music_dir = self.root / "music"
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
@@ -1,7 +1,8 @@
+import json
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import dekho.db as db
 from dekho.app import create_app
@@ -35,6 +36,38 @@ class AppRouteContractTests(unittest.TestCase):
         self.assertIn("label_catalog", payload)
         self.assertIsInstance(payload["label_catalog"], list)
 
+    def test_batch_details_returns_tracks_in_request_order(self):
+        db.upsert_track(track_id="track-2", filepath="music/track-2.mp3", title="Track Two")
+        db.upsert_track_user_data("track-2", "Second", "", labels=["like.like2"])
+        statements = []
+
+        def observer(sql, parameters, elapsed):
+            statements.append(sql)
+
+        db.add_statement_observer(observer)
+        try:
+            response = self.client.get("/api/tracks:batch?ids=track-2,missing,track-1,track-2")
+        finally:
+            db.remove_statement_observer(observer)
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json()
+        self.assertEqual([track["track_id"] for track in payload["tracks"]], ["track-2", "track-1"])
+        self.assertEqual(payload["tracks"][0]["labels"], ["like.like2"])
+        self.assertEqual(payload["tracks"][0], db.get_track_details("track-2"))
+        self.assertEqual(payload["missing"], ["missing"])
+        self.assertIsInstance(payload["label_catalog"], list)
+        detail_queries = [sql for sql in statements if "FROM tracks_file_data AS tfd" in sql]
+        self.assertEqual(len(detail_queries), 1)
+
+    def test_batch_details_validates_ids(self):
+        self.assertEqual(self.client.get("/api/tracks:batch").status_code, 400)
+        self.assertEqual(self.client.get("/api/tracks:batch?ids=,,").status_code, 400)
+        too_many = ",".join(f"track-{index}" for index in range(51))
+        response = self.client.get(f"/api/tracks:batch?ids={too_many}")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"error": "At most 50 track IDs per batch."})
+
     def test_save_user_data_updates_payload_fields(self):
         response = self.client.post(
             "/api/tracks/track-1/user-data",
@@ -66,7 +99,9 @@ class AppRouteContractTests(unittest.TestCase):
             "model_name": "chirp-crow",
             "persona_name": "default",
         }
-        with patch("dekho.app.fetch_suno_track_metadata", return_value=remote_payload):
+        with patch(
+            "dekho.app.fetch_suno_track_metadata", return_value=remote_payload
+        ) as fetch:
             response = self.client.post("/api/tracks/track-1/remote-data")
 
         self.assertEqual(response.status_code, 200)
@@ -75,6 +110,76 @@ class AppRouteContractTests(unittest.TestCase):
         self.assertEqual(payload["tags"], "ambient")
         self.assertEqual(payload["model_name"], "chirp-crow")
         self.assertIn("label_catalog", payload)
+        fetch.assert_called_once_with(ANY, max_cache_age_seconds=0)
+
+    def test_health_reports_ok_without_unknown_labels(self):
+        response = self.client.get("/api/health")
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json()
+        self.assertEqual(payload["status"], "ok")
+        self.assertEqual(payload["unknown_label_assignments"], [])
+
+    def test_unknown_label_assignments_are_reported_from_startup_check(self):
+        db.upsert_track_user_data(
+            track_id="track-1",
+            title_new="Track One",
+            notes="",
+            labels=["like.like2"],
+        )
+        with db.get_connection() as connection:
+            connection.execute(
+                """
+                INSERT INTO label_definitions (key, category, label)
+                VALUES ('removed.label', 'removed', 'removed')
+                """
+            )
+            connection.execute(
+                """
+                INSERT INTO track_user_data_labels (track_id, label_id)
+                SELECT 'track-1', id FROM label_definitions WHERE key = 'removed.label'
+                """
+            )
+        client = create_app().test_client()
+
+        health = client.get("/api/health")
+        self.assertEqual(health.status_code, 503)
+        self.assertEqual(
+            health.get_json()["unknown_label_assignments"],
+            [{"track_id": "track-1", "label_key": "removed.label"}],
+        )
+
+        index = client.get("/")
+        self.assertEqual(index.status_code, 500)
+        self.assertIn("label_key=removed.label", index.get_data(as_text=True))
+
+    def test_index_virtual_mode_embeds_columnar_bootstrap(self):
+        db.upsert_track_user_data(
+            track_id="track-1",
+            title_new="Track One",
+            notes="",
+            labels=["like.like2"],
+        )
+        response = self.client.get("/?list=virtual")
+        self.assertEqual(response.status_code, 200)
+        html = response.get_data(as_text=True)
+        self.assertIn('data-list-mode="virtual"', html)
+        self.assertNotIn('class="track-item"', html)
+
+        bootstrap_json = html.split('<script id="tracks-bootstrap-data" type="application/json">', 1)[1]
+        bootstrap = json.loads(bootstrap_json.split("</script>", 1)[0])
+        self.assertEqual(bootstrap["count"], 1)
+        self.assertEqual(bootstrap["columns"]["track_id"], ["track-1"])
+        self.assertEqual(bootstrap["columns"]["display_title"], ["Track One"])
+        self.assertEqual(bootstrap["columns"]["label_keys"], [["like.like2"]])
+        self.assertEqual(bootstrap["columns"]["has_remote_tags"], [0])
+
+    def test_index_defaults_to_server_rendered_rows(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        html = response.get_data(as_text=True)
+        self.assertIn('data-list-mode="dom"', html)
+        self.assertIn('data-track-id="track-1"', html)
+        self.assertNotIn("tracks-bootstrap-data", html)
 
     def test_overview_page_renders_feature_icons(self):
         db.upsert_track_user_data(
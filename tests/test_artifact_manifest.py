@@ -0,0 +1,110 @@
+import hashlib
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import dekho.db as db
+from dekho.app import create_app
+from dekho.scan import export_track_spectrogram_image, run_scan
+from tests.helpers import TempWorkdirTestCase, write_tagged_mp3
+
+COVER_BYTES = b"\xff\xd8\xff\xe0fake jpeg\xff\xd9"
+
+
+class ArtifactManifestTests(TempWorkdirTestCase):
+    def test_scan_records_covers_and_missing_covers(self):
+        write_tagged_mp3(self.music_dir / "with-cover.mp3", "track-1", cover=COVER_BYTES)
+        write_tagged_mp3(self.music_dir / "no-cover.mp3", "track-2")
+        run_scan(self.music_dir)
+
+        self.assertEqual(
+            db.get_track_artifact("track-1", db.ARTIFACT_TYPE_IMAGE),
+            {
+                "exists": True,
+                "size": len(COVER_BYTES),
+                "content_hash": hashlib.sha256(COVER_BYTES).hexdigest(),
+                "generator_version": 1,
+            },
+        )
+        self.assertFalse(db.get_track_artifact("track-2", db.ARTIFACT_TYPE_IMAGE)["exists"])
+
+        rows = {row["track_id"]: row for row in db.get_all_tracks_file_data()}
+        self.assertTrue(rows["track-1"]["has_image"])
+        self.assertFalse(rows["track-2"]["has_image"])
+        details = db.get_track_details("track-2")
+        self.assertFalse(details["has_image"])
+
+    def test_flags_are_unknown_without_manifest_rows(self):
+        db.upsert_track(track_id="track-1", filepath="song.mp3", title="Song")
+
+        [row] = db.get_all_tracks_file_data()
+        self.assertIsNone(row["has_image"])
+        self.assertIsNone(row["has_spectrogram"])
+        self.assertIsNone(db.get_track_details("track-1")["has_spectrogram"])
+
+    def test_routes_answer_known_missing_artifacts_without_touching_disk(self):
+        db.upsert_track(track_id="track-1", filepath="song.mp3", title="Song")
+        db.upsert_track_artifact("track-1", db.ARTIFACT_TYPE_IMAGE, None, None, 1)
+        db.upsert_track_artifact("track-1", db.ARTIFACT_TYPE_SPECTROGRAM, None, None, 1)
+        client = create_app().test_client()
+
+        with mock.patch.object(Path, "is_file", side_effect=AssertionError("disk probe")):
+            image = client.get("/api/tracks/track-1/image")
+            spectrogram = client.get("/api/tracks/track-1/spectrogram")
+
+        self.assertEqual(image.status_code, 404)
+        self.assertEqual(image.get_json(), {"error": "Track image not found."})
+        self.assertEqual(spectrogram.status_code, 404)
+
+    def test_image_route_backfills_manifest_and_notices_deleted_files(self):
+        db.upsert_track(track_id="track-1", filepath="song.mp3", title="Song")
+        image_path = self.root / "images" / "t" / "track-1.jpg"
+        image_path.parent.mkdir(parents=True)
+        image_path.write_bytes(COVER_BYTES)
+        client = create_app().test_client()
+
+        response = client.get("/api/tracks/track-1/image")
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        self.assertTrue(db.get_track_artifact("track-1", db.ARTIFACT_TYPE_IMAGE)["exists"])
+
+        image_path.unlink()
+        self.assertEqual(client.get("/api/tracks/track-1/image").status_code, 404)
+        self.assertFalse(db.get_track_artifact("track-1", db.ARTIFACT_TYPE_IMAGE)["exists"])
+
+        # Files of unknown tracks are served but not written into the manifest.
+        stray_path = self.root / "images" / "u" / "unknown.jpg"
+        stray_path.parent.mkdir(parents=True)
+        stray_path.write_bytes(COVER_BYTES)
+        response = client.get("/api/tracks/unknown/image")
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        self.assertIsNone(db.get_track_artifact("unknown", db.ARTIFACT_TYPE_IMAGE))
+
+    def test_existing_spectrogram_is_recorded_without_regenerating(self):
+        db.upsert_track(track_id="track-1", filepath="song.mp3", title="Song")
+        spectrogram_path = self.root / "spectrograms" / "t" / "track-1.png"
+        spectrogram_path.parent.mkdir(parents=True)
+        spectrogram_path.write_bytes(b"png bytes")
+
+        with mock.patch("dekho.spectrograms.render_spectrogram_png", side_effect=AssertionError("rendered")):
+            export_track_spectrogram_image("track-1", self.root / "song.mp3")
+
+        artifact = db.get_track_artifact("track-1", db.ARTIFACT_TYPE_SPECTROGRAM)
+        self.assertEqual(artifact["size"], len(b"png bytes"))
+        self.assertEqual(artifact["generator_version"], 1)
+
+    def test_outdated_spectrogram_generator_version_is_regenerated(self):
+        db.upsert_track(track_id="track-1", filepath="song.mp3", title="Song")
+        spectrogram_path = self.root / "spectrograms" / "t" / "track-1.png"
+        spectrogram_path.parent.mkdir(parents=True)
+        spectrogram_path.write_bytes(b"old png")
+        db.upsert_track_artifact("track-1", db.ARTIFACT_TYPE_SPECTROGRAM, 7, "old", 0)
+
+        with mock.patch("dekho.spectrograms.render_spectrogram_png", side_effect=RuntimeError("rendered")):
+            with self.assertRaisesRegex(RuntimeError, "rendered"):
+                export_track_spectrogram_image("track-1", self.root / "song.mp3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import unittest
+from unittest import mock
+
+import dekho.db as db
+from dekho.app import create_app
+from dekho.scan import run_scan
+from tests.helpers import TempWorkdirTestCase, write_tagged_mp3
+
+
+class AudioPathIndexTests(TempWorkdirTestCase):
+    def test_scan_indexes_moves_and_drops_audio_paths(self):
+        first_path = self.music_dir / "a" / "song.mp3"
+        write_tagged_mp3(first_path, "track-1")
+        run_scan(self.music_dir)
+
+        indexed = db.get_track_audio_path("track-1")
+        self.assertIsNotNone(indexed)
+        self.assertEqual(indexed["path"], first_path)
+        self.assertEqual(indexed["size"], first_path.stat().st_size)
+        self.assertEqual(indexed["mtime_ns"], first_path.stat().st_mtime_ns)
+
+        moved_path = self.music_dir / "b" / "song.mp3"
+        moved_path.parent.mkdir()
+        first_path.rename(moved_path)
+        run_scan(self.music_dir)
+        self.assertEqual(db.get_track_audio_path("track-1")["path"], moved_path)
+
+        moved_path.unlink()
+        run_scan(self.music_dir)
+        self.assertIsNone(db.get_track_audio_path("track-1"))
+
+    def test_audio_route_serves_indexed_path_and_recovers_from_stale_entry(self):
+        audio_path = self.music_dir / "song.mp3"
+        write_tagged_mp3(audio_path, "track-1")
+        run_scan(self.music_dir)
+        client = create_app().test_client()
+
+        response = client.get("/api/tracks/track-1/audio")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(), audio_path.read_bytes())
+        response.close()
+
+        # Moved outside of a scan: the stale entry is replaced on next request.
+        moved_path = self.music_dir / "renamed.mp3"
+        audio_path.rename(moved_path)
+        with db.get_connection() as connection:
+            connection.execute(
+                "UPDATE tracks_file_data SET filepath = 'renamed.mp3' WHERE track_id = 'track-1'"
+            )
+
+        response = client.get("/api/tracks/track-1/audio")
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        self.assertEqual(db.get_track_audio_path("track-1")["path"], moved_path)
+
+    def test_audio_route_reindexes_a_replaced_file(self):
+        audio_path = self.music_dir / "song.mp3"
+        write_tagged_mp3(audio_path, "track-1")
+        run_scan(self.music_dir)
+        client = create_app().test_client()
+
+        write_tagged_mp3(audio_path, "track-1", title="Replaced", frames=12)
+        indexed = db.get_track_audio_path("track-1")
+        os.utime(audio_path, ns=(indexed["mtime_ns"] + 1, indexed["mtime_ns"] + 1))
+        with mock.patch("dekho.app.delete_track_audio_paths") as delete_paths:
+            response = client.get("/api/tracks/track-1/audio")
+        self.assertEqual(response.get_data(), audio_path.read_bytes())
+        response.close()
+
+        delete_paths.assert_called_once_with(["track-1"])
+        reindexed = db.get_track_audio_path("track-1")
+        self.assertEqual(reindexed["size"], audio_path.stat().st_size)
+        self.assertEqual(reindexed["mtime_ns"], indexed["mtime_ns"] + 1)
+
+    def test_audio_route_backfills_index_for_unscanned_rows(self):
+        audio_path = self.music_dir / "song.mp3"
+        audio_path.parent.mkdir(parents=True)
+        audio_path.write_bytes(b"audio bytes")
+        db.upsert_track(track_id="track-1", filepath="song.mp3", title="Song")
+        client = create_app().test_client()
+
+        self.assertIsNone(db.get_track_audio_path("track-1"))
+        response = client.get("/api/tracks/track-1/audio")
+        self.assertEqual(response.get_data(), b"audio bytes")
+        response.close()
+        self.assertEqual(db.get_track_audio_path("track-1")["path"], audio_path)
+
+        missing = client.get("/api/tracks/unknown/audio")
+        self.assertEqual(missing.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import dekho.db as db
+import dekho.db_schema as db_schema
+from dekho.app import create_app
+
+
+class ChangeFeedTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        os.chdir(self._tempdir.name)
+        db.DB_PATH = Path(self._tempdir.name) / "test.sqlite3"
+        db.init_db()
+        db.upsert_track(track_id="t1", filepath="1.mp3", title="One")
+        self.client = create_app().test_client()
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def _tracked_row(self, track_id: str) -> tuple:
+        with db.get_connection() as connection:
+            return connection.execute(
+                """
+                SELECT row_version, change_seq, updated_at
+                FROM track_user_data
+                WHERE track_id = ?
+                """,
+                (track_id,),
+            ).fetchone()
+
+    def test_inserts_and_real_updates_are_logged_and_stamp_the_row(self):
+        # `upsert_track` inserted the user data row.
+        version, insert_seq, updated_at = self._tracked_row("t1")
+        self.assertEqual(version, 1)
+        self.assertIsNotNone(updated_at)
+
+        db.upsert_track_user_data("t1", "New", "")
+        version, change_seq, _ = self._tracked_row("t1")
+        self.assertEqual(version, 2)
+        self.assertGreater(change_seq, insert_seq)
+
+        db.upsert_track_user_data("t1", "New", "")
+        self.assertEqual(self._tracked_row("t1")[:2], (2, change_seq))
+
+        changes = [
+            change
+            for change in db.get_row_changes_after(0, 100)
+            if change["table"] == "track_user_data"
+        ]
+        self.assertEqual([change["seq"] for change in changes], [insert_seq, change_seq])
+        self.assertEqual(
+            [(change["track_id"], change["key"], change["op"]) for change in changes],
+            [("t1", ["t1"], "upsert"), ("t1", ["t1"], "upsert")],
+        )
+
+    def test_label_replacement_logs_deletes_with_composite_keys(self):
+        db.upsert_track_user_data("t1", "", "", labels=["like.like1"])
+        _, start = db.get_row_change_bounds()
+        db.upsert_track_user_data("t1", "", "", labels=[])
+
+        changes = db.get_row_changes_after(start, 100)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(
+            (changes[0]["table"], changes[0]["op"]), ("track_user_data_labels", "delete")
+        )
+        self.assertEqual(changes[0]["key"][0], "t1")
+        self.assertIsInstance(changes[0]["key"][1], int)
+
+    def test_new_columns_replace_the_triggers(self):
+        with db.get_connection() as connection:
+            connection.execute("ALTER TABLE track_user_data ADD COLUMN mood TEXT")
+        db.init_db()
+        db.upsert_track_user_data("t1", "", "")
+        _, start = db.get_row_change_bounds()
+        with db.get_connection() as connection:
+            connection.execute("UPDATE track_user_data SET mood = 'calm'")
+            triggers = connection.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name LIKE 'cdc_track_user_data_update_%'"
+            ).fetchone()[0]
+
+        self.assertEqual(triggers, 1)
+        self.assertEqual(len(db.get_row_changes_after(start, 100)), 1)
+
+    def test_log_is_pruned_to_the_retained_window(self):
+        with mock.patch.multiple(db_schema, ROW_CHANGES_RETAINED=5, ROW_CHANGES_PRUNE_EVERY=5):
+            with db.get_connection() as connection:
+                connection.execute("DROP TRIGGER row_changes_prune")
+            db.init_db()
+        for index in range(12):
+            db.upsert_track_user_data("t1", f"title {index}", "")
+
+        oldest, latest = db.get_row_change_bounds()
+        self.assertLessEqual(latest - oldest + 1, 10)
+        self.assertGreater(oldest, 1)
+
+    def test_api_pages_through_changes_and_flags_pruned_cursors(self):
+        db.upsert_track_user_data("t1", "New", "")
+        _, latest = db.get_row_change_bounds()
+
+        first = self.client.get("/api/changes?since=0&limit=1").get_json()
+        self.assertEqual(len(first["changes"]), 1)
+        self.assertEqual(first["next_since"], first["changes"][0]["seq"])
+        self.assertTrue(first["has_more"])
+        self.assertFalse(first["reset"])
+        rest = self.client.get(f"/api/changes?since={first['next_since']}").get_json()
+        self.assertEqual(rest["changes"][-1]["seq"], latest)
+        self.assertFalse(rest["has_more"])
+
+        with db.get_connection() as connection:
+            connection.execute("DELETE FROM row_changes WHERE seq < ?", (latest,))
+        self.assertTrue(self.client.get("/api/changes?since=0").get_json()["reset"])
+        self.assertEqual(self.client.get("/api/changes?since=abc").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+from dekho.cli import build_gunicorn_options, build_parser, main
+from dekho.remote_backfill import BackfillSummary
+
+
+class ServeCommandTests(unittest.TestCase):
+    def test_serve_defaults_preload_threaded_workers(self):
+        args = build_parser().parse_args(["serve"])
+        options = build_gunicorn_options(args)
+
+        self.assertEqual(options["bind"], "127.0.0.1:5000")
+        self.assertTrue(options["preload_app"])
+        self.assertEqual(options["worker_class"], "gthread")
+        self.assertGreater(options["max_requests"], 0)
+        self.assertGreaterEqual(options["graceful_timeout"], 600)
+
+    def test_serve_options_are_configurable(self):
+        args = build_parser().parse_args(
+            [
+                "serve",
+                "--host",
+                "0.0.0.0",
+                "--port",
+                "8000",
+                "--workers",
+                "4",
+                "--threads",
+                "8",
+                "--max-requests",
+                "0",
+                "--graceful-timeout",
+                "60",
+            ]
+        )
+        options = build_gunicorn_options(args)
+
+        self.assertEqual(options["bind"], "0.0.0.0:8000")
+        self.assertEqual(options["workers"], 4)
+        self.assertEqual(options["threads"], 8)
+        self.assertEqual(options["max_requests"], 0)
+        self.assertEqual(options["graceful_timeout"], 60)
+
+    def test_subcommand_is_required(self):
+        with self.assertRaises(SystemExit):
+            build_parser().parse_args([])
+
+
+class RemoteCommandTests(unittest.TestCase):
+    def test_unset_options_keep_the_library_defaults(self):
+        with mock.patch(
+            "dekho.remote_backfill.backfill_remote_data", return_value=BackfillSummary()
+        ) as backfill:
+            self.assertEqual(main(["backfill-remote", "--rate", "0.5", "--limit", "3"]), 0)
+
+        _, kwargs = backfill.call_args
+        self.assertEqual(kwargs["requests_per_second"], 0.5)
+        self.assertEqual(kwargs["limit"], 3)
+        self.assertNotIn("concurrency", kwargs)
+        self.assertNotIn("batch_size", kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,24 @@
+import json
+import os
+import shutil
 import sqlite3
+import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
-from mutagen.id3 import ID3
+from mutagen.id3 import APIC, ID3, TIT2
+from mutagen.oggopus import OggOpus
 
 import dekho.db as db
 import export_auxio
+from tests.helpers import MP3_FRAME
 
 
 def _write_minimal_mp3(path: Path) -> None:
-    # Minimal MPEG frame so mutagen can attach ID3 tags.
-    path.write_bytes(bytes.fromhex("fff340c4" + ("00" * 413)))
+    # One untagged frame; the exporter attaches the ID3 tags.
+    path.write_bytes(MP3_FRAME)
 
 
 class FilesystemSafeNameTests(unittest.TestCase):
@@ -189,6 +196,328 @@ class ExportAuxioIntegrationTests(unittest.TestCase):
             "#EXTM3U\n../Tracks/abc-123.mp3\n",
         )
 
+    def _export(self, sync: bool = True) -> int:
+        return export_auxio.export_auxio(
+            db_path=db.DB_PATH,
+            music_root=self.music_root,
+            output_dir=self.output_dir,
+            sync=sync,
+        )
+
+    def test_sync_only_touches_changed_tracks_and_playlists(self):
+        for name in ("one", "two"):
+            _write_minimal_mp3(self.music_root / f"{name}.mp3")
+            db.upsert_track(track_id=name, filepath=f"{name}.mp3", title=name.title())
+            db.upsert_track_user_data(
+                track_id=name, title_new="", notes="", remix_of="", labels=["playlist.retro"]
+            )
+        self.assertEqual(self._export(sync=False), 0)
+        retro = self.output_dir / "Playlists" / "retro.m3u8"
+
+        with mock.patch("export_auxio.copy_with_export_tags") as copy_file, mock.patch(
+            "export_auxio.write_id3_tags"
+        ) as write_tags:
+            self.assertEqual(self._export(), 0)
+        copy_file.assert_not_called()
+        write_tags.assert_not_called()
+
+        # Renamed: tags only. Removed from the playlist: deleted.
+        db.upsert_track_user_data(
+            track_id="one", title_new="Uno", notes="", remix_of="", labels=["playlist.retro"]
+        )
+        db.upsert_track_user_data(
+            track_id="two", title_new="", notes="", remix_of="", labels=[]
+        )
+        with mock.patch("export_auxio.copy_with_export_tags") as copy_file:
+            self.assertEqual(self._export(), 0)
+        copy_file.assert_not_called()
+        self.assertEqual(str(ID3(self.output_dir / "Tracks" / "one.mp3")["TIT2"]), "Uno")
+        self.assertFalse((self.output_dir / "Tracks" / "two.mp3").exists())
+        self.assertEqual(retro.read_text(encoding="utf-8"), "#EXTM3U\n../Tracks/one.mp3\n")
+
+        # Unchanged playlist content is not rewritten.
+        retro_mtime_ns = retro.stat().st_mtime_ns
+        self.assertEqual(self._export(), 0)
+        self.assertEqual(retro.stat().st_mtime_ns, retro_mtime_ns)
+
+    def test_sync_recopies_changed_sources_and_tampered_exports(self):
+        source = self.music_root / "song.mp3"
+        _write_minimal_mp3(source)
+        db.upsert_track(track_id="song", filepath="song.mp3", title="Song")
+        db.upsert_track_user_data(
+            track_id="song", title_new="", notes="", remix_of="", labels=["playlist.retro"]
+        )
+        self.assertEqual(self._export(), 0)
+        exported = self.output_dir / "Tracks" / "song.mp3"
+
+        source.write_bytes(source.read_bytes() + bytes(418))
+        self.assertEqual(self._export(), 0)
+        self.assertGreater(exported.stat().st_size, 418 * 2)
+
+        exported.unlink()
+        self.assertEqual(self._export(), 0)
+        self.assertEqual(str(ID3(exported)["TIT2"]), "Song")
+
+        # Unknown files left by other tools are removed; a missing source keeps its export.
+        stray = self.output_dir / "Playlists" / "old.m3u8"
+        stray.write_text("#EXTM3U\n", encoding="utf-8")
+        source.unlink()
+        self.assertEqual(self._export(), 1)
+        self.assertFalse(stray.exists())
+        self.assertTrue(exported.is_file())
+
+
+class CopyWithExportTagsTests(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def _source(self, name: str, tags: ID3 | None = None, v1: bool = False, **save) -> Path:
+        path = self.root / name
+        path.write_bytes(MP3_FRAME * 3 + b"audio end")
+        if tags is not None:
+            tags.save(path, v1=2 if v1 else 0, **save)
+        return path
+
+    def _reference(self, source: Path) -> bytes:
+        reference = self.root / f"reference-{source.name}"
+        shutil.copy2(source, reference)
+        export_auxio.write_id3_tags(reference, "Export Title")
+        return reference.read_bytes()
+
+    def _sources(self) -> list[Path]:
+        with_cover = ID3()
+        with_cover.add(TIT2(encoding=3, text="Old"))
+        with_cover.add(APIC(mime="image/jpeg", type=3, desc="cover", data=b"\xff\xd8" * 500))
+        small_header = ID3()
+        small_header.add(TIT2(encoding=3, text="x"))
+        v1_only = self._source("v1-only.mp3", ID3(), v1=True)
+        v1_only.write_bytes(v1_only.read_bytes()[10:])
+        return [
+            self._source("untagged.mp3"),
+            self._source("cover-v24.mp3", with_cover),
+            self._source("cover-v23-v1.mp3", with_cover, v1=True, v2_version=3),
+            self._source("no-padding.mp3", small_header, padding=lambda info: 0),
+            v1_only,
+        ]
+
+    def test_output_is_byte_identical_to_copy_then_tag(self):
+        for source in self._sources():
+            with self.subTest(source=source.name):
+                destination = self.root / f"single-pass-{source.name}"
+                export_auxio.copy_with_export_tags(source, destination, "Export Title")
+                self.assertEqual(destination.read_bytes(), self._reference(source))
+
+    def test_reflink_path_is_byte_identical_and_streams_nothing(self):
+        def fake_clone(destination_fd, request, source_fd):
+            os.write(destination_fd, os.pread(source_fd, 1 << 20, 0))
+
+        for source in self._sources():
+            with self.subTest(source=source.name):
+                destination = self.root / f"clone-{source.name}"
+                with mock.patch("export_auxio.fcntl") as fcntl:
+                    fcntl.ioctl.side_effect = fake_clone
+                    export_auxio.copy_with_export_tags(source, destination, "Export Title")
+                self.assertEqual(destination.read_bytes(), self._reference(source))
+
+    def test_detects_the_private_mutagen_helpers(self):
+        self.assertTrue(export_auxio.SINGLE_PASS_TAGGING)
+        with mock.patch("export_auxio.find_id3v1", None):
+            self.assertFalse(export_auxio._has_single_pass_helpers())
+        with mock.patch("export_auxio.find_id3v1", lambda data, version: None):
+            self.assertFalse(export_auxio._has_single_pass_helpers())
+
+    def test_falls_back_to_copy_then_tag_without_private_mutagen_helpers(self):
+        source = self._sources()[2]
+        destination = self.root / "fallback.mp3"
+        with (
+            mock.patch("export_auxio.SINGLE_PASS_TAGGING", False),
+            mock.patch("export_auxio._render_export_tags") as render,
+        ):
+            export_auxio.copy_with_export_tags(source, destination, "Export Title")
+        render.assert_not_called()
+        self.assertEqual(destination.read_bytes(), self._reference(source))
+
+    def test_reads_the_source_once(self):
+        source = self._sources()[1]
+        reads: list[int] = []
+        real_open = open
+
+        def counting_open(path, mode="r", *args, **kwargs):
+            handle = real_open(path, mode, *args, **kwargs)
+            if Path(path) == source and "r" in mode:
+                reads.append(1)
+            return handle
+
+        with mock.patch("builtins.open", side_effect=counting_open):
+            export_auxio.copy_with_export_tags(source, self.root / "out.mp3", "Export Title")
+        self.assertEqual(reads, [1])
+
+
+# Stands in for ffmpeg: copies MP3 input, writes a minimal Ogg Opus stream for
+# `-f opus`, fails for inputs named `broken*`, and logs each call.
+FAKE_FFMPEG = """#!{python}
+import struct, sys
+from pathlib import Path
+from mutagen.ogg import OggPage
+
+args = sys.argv[1:]
+source = Path(args[args.index("-i") + 1])
+output = Path(args[-1])
+with open(Path(__file__).with_name("calls.log"), "a") as log:
+    log.write(source.name + "\\n")
+if source.name.startswith("broken"):
+    sys.exit("Invalid data found when processing input")
+if args[args.index("-f") + 1] != "opus":
+    output.write_bytes(source.read_bytes())
+    sys.exit(0)
+pages = []
+head = b"OpusHead" + struct.pack("<BBHIhB", 1, 2, 312, 44100, 0, 0)
+tags = b"OpusTags" + struct.pack("<II", 0, 0)
+for sequence, packet in enumerate([head, tags, b"\\xfc" + bytes(20)]):
+    page = OggPage()
+    page.serial, page.sequence, page.packets = 1, sequence, [packet]
+    page.first, page.last, page.position = sequence == 0, sequence == 2, 960 * (sequence == 2)
+    pages.append(page.write())
+output.write_bytes(b"".join(pages))
+"""
+
+
+class ExportProfileTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        db.DB_PATH = self.root / "test.sqlite3"
+        db.init_db()
+        self.music_root = self.root / "music"
+        self.music_root.mkdir()
+        self.output_dir = self.root / "export_music"
+        self.cache_root = self.root / "export_transcodes"
+        bin_dir = self.root / "bin"
+        bin_dir.mkdir()
+        ffmpeg = bin_dir / "ffmpeg"
+        ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable), encoding="utf-8")
+        ffmpeg.chmod(0o755)
+        self.calls_log = bin_dir / "calls.log"
+        path_patch = mock.patch.dict(
+            os.environ, {"PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}
+        )
+        path_patch.start()
+        self.addCleanup(path_patch.stop)
+
+    def tearDown(self):
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def _add_track(self, name: str) -> None:
+        _write_minimal_mp3(self.music_root / f"{name}.mp3")
+        db.upsert_track(track_id=name, filepath=f"{name}.mp3", title=name.title())
+        db.upsert_track_user_data(
+            track_id=name, title_new="", notes="", remix_of="", labels=["playlist.retro"]
+        )
+
+    def _export(self, profile: str, sync: bool = False) -> int:
+        return export_auxio.export_auxio(
+            db_path=db.DB_PATH,
+            music_root=self.music_root,
+            output_dir=self.output_dir,
+            sync=sync,
+            profile=export_auxio.EXPORT_PROFILES[profile],
+            cache_root=self.cache_root,
+            transcode_workers=2,
+        )
+
+    def _ffmpeg_calls(self) -> list[str]:
+        if not self.calls_log.exists():
+            return []
+        return sorted(self.calls_log.read_text(encoding="utf-8").split())
+
+    def test_opus_profile_tags_transcodes_and_reuses_the_cache(self):
+        self._add_track("one")
+        self._add_track("two")
+
+        self.assertEqual(self._export("opus-96"), 0)
+
+        self.assertEqual(self._ffmpeg_calls(), ["one.mp3", "two.mp3"])
+        tags = OggOpus(self.output_dir / "Tracks" / "one.opus").tags
+        self.assertEqual(
+            (tags["title"], tags["artist"], tags["album"]),
+            (["One"], ["My Recordings"], ["Unpublished Music"]),
+        )
+        self.assertEqual(
+            (self.output_dir / "Playlists" / "retro.m3u8").read_text(encoding="utf-8"),
+            "#EXTM3U\n../Tracks/one.opus\n../Tracks/two.opus\n",
+        )
+
+        # A full rebuild copies from the cache; a changed source is transcoded again.
+        source = self.music_root / "two.mp3"
+        source.write_bytes(source.read_bytes() + bytes(418))
+        self.assertEqual(self._export("opus-96"), 0)
+        self.assertEqual(self._ffmpeg_calls(), ["one.mp3", "two.mp3", "two.mp3"])
+        self.assertTrue((self.output_dir / "Tracks" / "one.opus").is_file())
+
+        # Switching back to originals replaces every file.
+        self.assertEqual(self._export("original", sync=True), 0)
+        self.assertEqual(
+            sorted(path.name for path in (self.output_dir / "Tracks").iterdir()),
+            ["one.mp3", "two.mp3"],
+        )
+
+    def test_failed_transcodes_are_reported_and_retried(self):
+        self._add_track("good")
+        self._add_track("broken")
+
+        self.assertEqual(self._export("mp3-128", sync=True), 1)
+
+        exported = self.output_dir / "Tracks" / "good.mp3"
+        self.assertEqual(str(ID3(exported)["TIT2"]), "Good")
+        self.assertFalse((self.output_dir / "Tracks" / "broken.mp3").exists())
+        self.assertEqual(self._export("mp3-128", sync=True), 1)
+        self.assertEqual(self._ffmpeg_calls(), ["broken.mp3", "broken.mp3", "good.mp3"])
+
+    def test_ffmpeg_is_only_needed_for_uncached_transcodes(self):
+        self._add_track("one")
+        with mock.patch("export_auxio.shutil.which", return_value=None):
+            self.assertEqual(self._export("opus-96"), 1)
+        self.assertEqual(self._ffmpeg_calls(), [])
+        self.assertFalse((self.output_dir / "Tracks" / "one.opus").exists())
+
+        self.assertEqual(self._export("opus-96"), 0)
+        with mock.patch("export_auxio.shutil.which", return_value=None):
+            self.assertEqual(self._export("opus-96"), 0)
+        self.assertEqual(self._ffmpeg_calls(), ["one.mp3"])
+        self.assertEqual(
+            OggOpus(self.output_dir / "Tracks" / "one.opus").tags["title"], ["One"]
+        )
+
+    def test_sync_only_removes_exported_track_files(self):
+        self._add_track("one")
+        self.assertEqual(self._export("opus-96", sync=True), 0)
+        notes = self.output_dir / "Tracks" / "notes.txt"
+        notes.write_text("kept\n", encoding="utf-8")
+        stale = self.output_dir / "Tracks" / "old.mp3"
+        _write_minimal_mp3(stale)
+
+        self.assertEqual(self._export("opus-96", sync=True), 0)
+
+        self.assertTrue(notes.is_file())
+        self.assertFalse(stale.exists())
+
+    def test_version_1_manifests_are_original_exports(self):
+        self.output_dir.mkdir()
+        (self.output_dir / export_auxio.SYNC_MANIFEST_NAME).write_text(
+            json.dumps({"version": 1, "tracks": {"one.mp3": {"title": "One"}}, "playlists": {}}),
+            encoding="utf-8",
+        )
+
+        manifest = export_auxio.load_sync_manifest(self.output_dir)
+
+        self.assertEqual(manifest["tracks"]["one.mp3"]["profile"], "original")
+
 
 if __name__ == "__main__":
     unittest.main()
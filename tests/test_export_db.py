@@ -0,0 +1,191 @@
+import contextlib
+import csv
+import io
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import dekho.db as db
+import export_db
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+class ExportDatabaseTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        db.DB_PATH = self.root / "test.sqlite3"
+        db.init_db()
+        self.output_dir = self.root / "export"
+        db.upsert_track(track_id="t1", filepath="1.mp3", title="One", duration=61.5)
+        db.upsert_track(track_id="t2", filepath="2.mp3", title="Two", duration=None)
+        db.upsert_track_remote_data("t1", "lyrics", "rock", None, True, "v4", "chirp", None)
+        with db.get_connection() as connection:
+            connection.execute(
+                "UPDATE tracks_file_data SET updated_at = '2026-01-01T00:00:00+00:00' "
+                "WHERE track_id = 't1'"
+            )
+
+    def tearDown(self):
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def _export(self, *args, **kwargs) -> str:
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            export_db.export_database(db.DB_PATH, self.output_dir, *args, **kwargs)
+        return stdout.getvalue()
+
+    def test_csv_streams_rows_in_batches(self):
+        connection = sqlite3.connect(db.DB_PATH)
+        try:
+            row_count = export_db._export_table(
+                connection, "tracks_file_data", self.root / "tracks.csv", batch_size=1
+            )
+        finally:
+            connection.close()
+
+        self.assertEqual(row_count, 2)
+        with (self.root / "tracks.csv").open(newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual([row["track_id"] for row in rows], ["t1", "t2"])
+        self.assertEqual(rows[0]["duration"], "61.5")
+
+    def test_jsonl_types_flags_and_durations(self):
+        self._export("jsonl", tables=["track_remote_data", "tracks_file_data"])
+
+        self.assertEqual(
+            sorted(path.name for path in self.output_dir.iterdir()),
+            ["track_remote_data.jsonl", "tracks_file_data.jsonl"],
+        )
+        lines = (self.output_dir / "track_remote_data.jsonl").read_text().splitlines()
+        remote = json.loads(lines[0])
+        self.assertIs(remote["has_cover_clip_id"], True)
+        self.assertEqual(remote["attempts"], 0)
+        tracks = [
+            json.loads(line)
+            for line in (self.output_dir / "tracks_file_data.jsonl").read_text().splitlines()
+        ]
+        self.assertEqual([track["duration"] for track in tracks], [61.5, None])
+
+    def test_since_filters_timestamped_tables_and_keeps_the_rest(self):
+        output = self._export(
+            "csv",
+            tables=["tracks_file_data", "track_user_data", "label_definitions"],
+            since="2026-06-01",
+        )
+
+        with (self.output_dir / "tracks_file_data.csv").open(encoding="utf-8") as handle:
+            self.assertEqual([row["track_id"] for row in csv.DictReader(handle)], ["t2"])
+        self.assertIn("tracks_file_data.csv (1 rows, updated_at >= 2026-06-01)", output)
+        self.assertIn("track_user_data.csv (2 rows, updated_at >= 2026-06-01)", output)
+        self.assertRegex(output, r"label_definitions\.csv \(\d+ rows, full\)")
+
+    def test_since_includes_edited_tracks(self):
+        db.upsert_track(track_id="t1", filepath="1.mp3", title="One, edited", duration=61.5)
+
+        self._export("csv", tables=["tracks_file_data"], since="2026-06-01")
+
+        with (self.output_dir / "tracks_file_data.csv").open(encoding="utf-8") as handle:
+            track_ids = sorted(row["track_id"] for row in csv.DictReader(handle))
+        self.assertEqual(track_ids, ["t1", "t2"])
+
+    def test_since_is_converted_to_utc(self):
+        self.assertEqual(
+            export_db._parse_since("2026-06-01T02:30:00+02:00"), "2026-06-01T00:30:00+00:00"
+        )
+        self.assertEqual(
+            export_db._parse_since("2026-06-01T02:30:00"), "2026-06-01T02:30:00+00:00"
+        )
+        self.assertEqual(export_db._parse_since("2026-06-01"), "2026-06-01")
+
+    def test_unknown_table_exits_with_error(self):
+        with self.assertRaises(SystemExit) as raised, contextlib.redirect_stderr(io.StringIO()):
+            self._export("csv", tables=["tracks_file_data", "nope"])
+        self.assertEqual(raised.exception.code, 2)
+        self.assertFalse(self.output_dir.exists())
+
+    def test_delta_exports_changes_since_the_watermark(self):
+        self._export("jsonl", delta=True)
+        _, first_seq = db.get_row_change_bounds()
+        self.assertEqual(export_db.read_watermark(self.output_dir), first_seq)
+        self.assertTrue((self.output_dir / "tracks_file_data.jsonl").exists())
+
+        self.assertIn("No changes", self._export("jsonl", delta=True))
+
+        db.upsert_track(track_id="t2", filepath="2.mp3", title="Two again", duration=None)
+        with db.get_connection() as connection:
+            connection.execute("DELETE FROM track_remote_data WHERE track_id = 't1'")
+        output = self._export("jsonl", delta=True)
+        _, second_seq = db.get_row_change_bounds()
+
+        delta_dir = self.output_dir / f"delta-{first_seq}-{second_seq}"
+        self.assertIn(f"changed after {first_seq}", output)
+        self.assertIn("label_definitions.jsonl", output)
+        tracks = [
+            json.loads(line)
+            for line in (delta_dir / "tracks_file_data.jsonl").read_text().splitlines()
+        ]
+        self.assertEqual(
+            [(track["track_id"], track["title"]) for track in tracks], [("t2", "Two again")]
+        )
+        changes = [
+            json.loads(line)
+            for line in (delta_dir / "row_changes.jsonl").read_text().splitlines()
+        ]
+        self.assertIn(
+            ("track_remote_data", "t1", "delete"),
+            [(change["table_name"], change["track_id"], change["op"]) for change in changes],
+        )
+        self.assertEqual(export_db.read_watermark(self.output_dir), second_seq)
+
+    def test_delta_falls_back_to_full_export_when_the_log_was_pruned(self):
+        self.output_dir.mkdir()
+        export_db.write_watermark(self.output_dir, 0)
+        with db.get_connection() as connection:
+            connection.execute("DELETE FROM row_changes WHERE seq < 3")
+
+        output = self._export("csv", delta=True)
+
+        self.assertIn("exporting in full", output)
+        self.assertIn("tracks_file_data.csv (2 rows)", output)
+        self.assertTrue((self.output_dir / "tracks_file_data.csv").exists())
+
+    def test_delta_falls_back_to_full_export_when_the_watermark_is_ahead(self):
+        self.output_dir.mkdir()
+        _, latest_seq = db.get_row_change_bounds()
+        export_db.write_watermark(self.output_dir, latest_seq + 50)
+
+        output = self._export("csv", delta=True)
+
+        self.assertIn("exporting in full", output)
+        self.assertIn("tracks_file_data.csv (2 rows)", output)
+        self.assertEqual(export_db.read_watermark(self.output_dir), latest_seq)
+
+    def test_delta_rejects_a_table_subset(self):
+        with self.assertRaises(SystemExit) as raised, contextlib.redirect_stderr(io.StringIO()):
+            self._export("csv", tables=["tracks_file_data"], delta=True)
+        self.assertEqual(raised.exception.code, 2)
+        self.assertFalse(self.output_dir.exists())
+
+    @unittest.skipIf(pq is None, "pyarrow is not installed")
+    def test_parquet_has_typed_columns(self):
+        self._export("parquet", tables=["tracks_file_data", "track_remote_data"])
+
+        tracks = pq.read_table(self.output_dir / "tracks_file_data.parquet")
+        self.assertEqual(str(tracks.schema.field("duration").type), "double")
+        self.assertEqual(tracks.column("duration").to_pylist(), [61.5, None])
+        remote = pq.read_table(self.output_dir / "track_remote_data.parquet")
+        self.assertEqual(str(remote.schema.field("has_cover_clip_id").type), "bool")
+        self.assertEqual(str(remote.schema.field("attempts").type), "int64")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import gzip
+import os
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+import dekho.compression as compression
+import dekho.db as db
+from dekho.app import create_app
+
+
+class HttpCachingTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        os.chdir(self.root)
+        db.DB_PATH = self.root / "test.sqlite3"
+        db.init_db()
+        db.upsert_track(
+            track_id="track-1",
+            filepath="track-1.mp3",
+            title="Track One",
+        )
+        self.app = create_app()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def test_index_html_is_gzip_compressed_when_accepted(self):
+        response = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        html = gzip.decompress(response.get_data()).decode("utf-8")
+        self.assertIn("Track One", html)
+
+    def test_json_is_not_compressed_without_accept_encoding(self):
+        response = self.client.get("/api/labels", headers={"Accept-Encoding": ""})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("label_catalog", response.get_json())
+
+    @unittest.skipIf(compression.brotli is None, "brotli is not installed")
+    def test_json_prefers_brotli_when_available(self):
+        response = self.client.get(
+            "/api/labels", headers={"Accept-Encoding": "gzip, deflate, br"}
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        body = compression.brotli.decompress(response.get_data())
+        self.assertIn(b"label_catalog", body)
+
+    def test_static_assets_use_fingerprinted_immutable_urls(self):
+        html = self.client.get("/").get_data(as_text=True)
+        match = re.search(r'src="(/static/v/[0-9a-f]+/scripts/index/main\.js)"', html)
+        self.assertIsNotNone(match)
+
+        response = self.client.get(match.group(1))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.cache_control.immutable)
+        self.assertTrue(response.cache_control.public)
+        self.assertGreaterEqual(response.cache_control.max_age, 365 * 24 * 60 * 60)
+        response.close()
+
+        sibling_module = match.group(1).replace("main.js", "api.js")
+        sibling = self.client.get(sibling_module)
+        self.assertEqual(sibling.status_code, 200)
+        self.assertTrue(sibling.cache_control.immutable)
+        sibling.close()
+
+    def test_stale_fingerprint_is_served_without_long_caching(self):
+        response = self.client.get("/static/v/000000000000/scripts/index/main.js")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.cache_control.immutable)
+        self.assertTrue(response.cache_control.no_cache)
+        response.close()
+
+    def test_cover_image_has_etag_and_long_max_age(self):
+        image_path = self.root / "images" / "t" / "track-1.jpg"
+        image_path.parent.mkdir(parents=True)
+        image_path.write_bytes(b"\xff\xd8\xff\xe0cover")
+
+        response = self.client.get("/api/tracks/track-1/image")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        self.assertTrue(etag)
+        self.assertGreaterEqual(response.cache_control.max_age, 30 * 24 * 60 * 60)
+        response.close()
+
+        revalidated = self.client.get(
+            "/api/tracks/track-1/image", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        revalidated.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import gzip
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.error import HTTPError
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import dekho.db as db
+import dekho.remote_metadata as rm
+from dekho.http_client import HttpConnectionPool
+
+PAGE = '<html><script>self.__next_f.push([1,"0:[{\\"tags\\":\\"rock\\"}]"])</script></html>'
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    block_on_close = False
+
+    def handle_error(self, request, client_address):
+        # Timed-out clients hang up mid-response; that is the point of those tests.
+        pass
+
+
+class StandInServer:
+    """HTTP/1.1 keep-alive server for `/page`, `/slow`, `/redirect` and `/missing`."""
+
+    def __init__(self) -> None:
+        self.page = PAGE
+        self.etag = '"v1"'
+        self.connections: set[tuple[str, int]] = set()
+        self.request_headers: list[dict[str, str]] = []
+        self.statuses: list[int] = []
+        self.drop_next_connection = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.connections.add(self.client_address)
+                server.request_headers.append(dict(self.headers))
+                path, _, query = self.path.partition("?")
+                if path == "/slow":
+                    time.sleep(1)
+                if path == "/redirect":
+                    self._send(302, b"", {"Location": "/page"})
+                elif path == "/missing":
+                    self._send(404, b"missing")
+                elif self.headers.get("If-None-Match") == server.etag:
+                    self._send(304, b"", {"ETag": server.etag})
+                else:
+                    body = server.page.encode()
+                    headers = {"ETag": server.etag, "Content-Type": "text/html; charset=utf-8"}
+                    if query == "encoding=br":
+                        body, headers["Content-Encoding"] = brotli.compress(body), "br"
+                    elif "gzip" in self.headers.get("Accept-Encoding", ""):
+                        body, headers["Content-Encoding"] = gzip.compress(body), "gzip"
+                    self._send(200, body, headers)
+                if server.drop_next_connection:
+                    # Close without `Connection: close`, like a server-side idle timeout.
+                    server.drop_next_connection = False
+                    self.close_connection = True
+
+            def _send(self, status, body, headers=None):
+                server.statuses.append(status)
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = QuietHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class HttpConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer()
+        self.pool = HttpConnectionPool(read_timeout=0.3)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.close()
+
+    def test_reuses_connections_and_decodes_gzip(self):
+        responses = [self.pool.get(f"{self.server.base_url}/page") for _ in range(3)]
+
+        self.assertEqual([response.text() for response in responses], [PAGE] * 3)
+        self.assertEqual(responses[0].headers["Content-Encoding"], "gzip")
+        self.assertEqual(len(self.server.connections), 1)
+
+    @unittest.skipIf(brotli is None, "brotli extra not installed")
+    def test_requests_and_decodes_brotli(self):
+        response = self.pool.get(f"{self.server.base_url}/page?encoding=br")
+
+        self.assertEqual(response.text(), PAGE)
+        self.assertIn("br", self.server.request_headers[0]["Accept-Encoding"])
+
+    def test_passes_the_final_body_text_on_while_reading(self):
+        pieces = []
+        with mock.patch("dekho.http_client.READ_CHUNK_BYTES", 16):
+            response = self.pool.get(f"{self.server.base_url}/redirect", on_text=pieces.append)
+
+        self.assertEqual(response.text(), PAGE)
+        self.assertEqual("".join(pieces), PAGE)
+        self.assertGreater(len([piece for piece in pieces if piece]), 1)
+
+    def test_retries_once_on_a_connection_the_server_dropped(self):
+        self.server.drop_next_connection = True
+        self.pool.get(f"{self.server.base_url}/page")
+        response = self.pool.get(f"{self.server.base_url}/page")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(self.server.connections), 2)
+
+    def test_follows_redirects_and_raises_for_error_statuses(self):
+        response = self.pool.get(f"{self.server.base_url}/redirect")
+        self.assertEqual(response.url, f"{self.server.base_url}/page")
+
+        with self.assertRaises(HTTPError) as raised:
+            self.pool.get(f"{self.server.base_url}/missing")
+        self.assertEqual(raised.exception.code, 404)
+
+    def test_read_timeout_raises_instead_of_hanging(self):
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            self.pool.get(f"{self.server.base_url}/slow")
+        self.assertLess(time.monotonic() - started, 0.9)
+
+
+class RemotePageRevalidationTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        os.chdir(self._tempdir.name)
+        db.DB_PATH = Path(self._tempdir.name) / "test.sqlite3"
+        self.server = StandInServer()
+        self.url = f"{self.server.base_url}/page"
+
+    def tearDown(self):
+        self.server.close()
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def test_fresh_pages_come_from_cache_and_stale_ones_are_revalidated(self):
+        self.assertEqual(rm._read_html(self.url), PAGE)
+        self.assertEqual(rm._read_html(self.url), PAGE)
+        self.assertEqual(self.server.statuses, [200])
+        first_fetched_at = db.get_remote_page_cache_entry(self.url)["fetched_at"]
+
+        self.assertEqual(rm._read_html(self.url, max_cache_age_seconds=0), PAGE)
+        self.assertEqual(self.server.statuses, [200, 304])
+        self.assertEqual(self.server.request_headers[-1]["If-None-Match"], '"v1"')
+        refreshed = db.get_remote_page_cache_entry(self.url)
+        self.assertGreater(refreshed["fetched_at"], first_fetched_at)
+
+        self.server.page, self.server.etag = PAGE.replace("rock", "jazz"), '"v2"'
+        self.assertIn("jazz", rm._read_html(self.url, max_cache_age_seconds=0))
+        self.assertEqual(db.get_remote_page_cache_entry(self.url)["etag"], '"v2"')
+
+    def test_downloaded_pages_are_parsed_while_they_arrive(self):
+        url = f"{self.server.base_url}/song/track-1"
+        feed = rm.FlightPageParser.feed
+        fed = []
+
+        def recording_feed(parser, text):
+            fed.append(text)
+            feed(parser, text)
+
+        with (
+            mock.patch("dekho.http_client.READ_CHUNK_BYTES", 16),
+            mock.patch.object(rm.FlightPageParser, "feed", recording_feed),
+        ):
+            self.assertEqual(rm.fetch_suno_track_metadata(url)["tags"], "rock")
+            self.assertGreater(len(fed), 2)
+
+            # The whole page is cached and parsed in one piece next time.
+            fed.clear()
+            self.assertEqual(rm.fetch_suno_track_metadata(url)["tags"], "rock")
+            self.assertEqual(fed, [PAGE])
+
+
+if __name__ == "__main__":
+    unittest.main()
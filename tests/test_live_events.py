@@ -0,0 +1,135 @@
+import json
+import unittest
+from unittest import mock
+
+import dekho.db as db
+from dekho.app import create_app
+from dekho.live_events import stream_track_events
+from dekho.scan import run_scan
+from tests.helpers import TempWorkdirTestCase, write_tagged_mp3
+
+
+def _parse_stream(body: str) -> list[dict[str, object]]:
+    messages = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in fields:
+            messages.append(
+                {"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])}
+            )
+    return messages
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class LiveEventsTests(TempWorkdirTestCase):
+    def setUp(self):
+        super().setUp()
+        db.upsert_track(track_id="track-1", filepath="song.mp3", title="Song")
+        self.app = create_app()
+        self.app.config.update(EVENTS_POLL_INTERVAL_SECONDS=0.01, EVENTS_STREAM_MAX_SECONDS=0.05)
+        self.client = self.app.test_client()
+
+    def _read_stream(self, *args, **kwargs) -> list[dict[str, object]]:
+        response = self.client.get(*args, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        body = response.get_data(as_text=True)
+        self.assertTrue(body.startswith("retry: "))
+        return _parse_stream(body)
+
+    def test_saving_user_data_and_fetching_remote_data_publish_events(self):
+        self.client.post(
+            "/api/tracks/track-1/user-data",
+            json={"title_new": "New", "notes": "", "remix_of": "", "labels": ["like.like1"]},
+        )
+        with mock.patch(
+            "dekho.app.fetch_suno_track_metadata", return_value={"tags": "rock"}
+        ):
+            db.upsert_track(track_id="track-1", filepath="song.mp3", url="https://suno.com/song/track-1")
+            self.client.post("/api/tracks/track-1/remote-data")
+
+        messages = self._read_stream("/api/events?after=0")
+        self.assertEqual(
+            [(message["event"], message["data"]) for message in messages],
+            [
+                ("track_user_data_changed", {"track_id": "track-1"}),
+                ("track_remote_data_fetched", {"track_id": "track-1"}),
+            ],
+        )
+
+    def test_new_streams_start_at_latest_event_and_resume_from_last_event_id(self):
+        db.record_track_event(db.TRACK_EVENT_UPSERTED, "track-1")
+        self.assertEqual(self._read_stream("/api/events"), [])
+
+        db.record_track_event(db.TRACK_EVENT_USER_DATA_CHANGED, "track-1")
+        messages = self._read_stream("/api/events", headers={"Last-Event-ID": "1"})
+        self.assertEqual([message["id"] for message in messages], [2])
+
+        invalid = self.client.get("/api/events?after=abc")
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_pruned_backlog_sends_reset(self):
+        with mock.patch.object(db, "TRACK_EVENTS_RETAINED", 2):
+            for _ in range(5):
+                db.record_track_event(db.TRACK_EVENT_UPSERTED, "track-1")
+        self.assertEqual(db.get_track_event_bounds(), (4, 5))
+
+        messages = self._read_stream("/api/events?after=1")
+        self.assertEqual(messages, [{"id": 5, "event": "reset", "data": {}}])
+
+    def test_stream_sends_heartbeats_and_stops_after_max_duration(self):
+        clock = FakeClock()
+        chunks = list(
+            stream_track_events(
+                0, poll_interval_seconds=5, max_seconds=40, sleep=clock.sleep, clock=clock
+            )
+        )
+        self.assertEqual(chunks.count(": keepalive\n\n"), 2)
+        self.assertEqual(clock.now, 40)
+
+    def test_scan_publishes_upserts_and_progress(self):
+        for index in range(3):
+            write_tagged_mp3(self.music_dir / f"song-{index}.mp3", f"scanned-{index}")
+
+        with mock.patch("dekho.scan.SCAN_EVENT_BATCH_SIZE", 2):
+            run_scan(self.music_dir)
+
+        events = [
+            (event["event_type"], event["track_id"], event["data"])
+            for event in db.get_track_events_after(0, 100)
+        ]
+        self.assertEqual(
+            events,
+            [
+                ("scan_progress", None, {"processed": 0, "total": 3}),
+                ("track_upserted", "scanned-0", {}),
+                ("track_upserted", "scanned-1", {}),
+                ("scan_progress", None, {"processed": 2, "total": 3}),
+                ("track_upserted", "scanned-2", {}),
+                ("scan_progress", None, {"processed": 3, "total": 3}),
+                ("scan_finished", None, {"stored": 3, "skipped": 0, "missing_from_folder": 1}),
+            ],
+        )
+
+        # Rescanning unchanged files publishes progress only.
+        last_id = db.get_track_event_bounds()[1]
+        with mock.patch("dekho.scan.SCAN_EVENT_BATCH_SIZE", 2):
+            run_scan(self.music_dir)
+        self.assertNotIn(
+            "track_upserted",
+            [event["event_type"] for event in db.get_track_events_after(last_id, 100)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
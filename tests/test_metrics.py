@@ -0,0 +1,129 @@
+import os
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import dekho.db as db
+from dekho.app import create_app
+
+
+def _sample_value(body: str, metric: str, labels: str) -> float:
+    match = re.search(rf"^{re.escape(metric + labels)} (\S+)$", body, re.MULTILINE)
+    if match is None:
+        raise AssertionError(f"{metric}{labels} not found in metrics output")
+    return float(match.group(1))
+
+
+class MetricsEndpointTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._tempdir = tempfile.TemporaryDirectory()
+        db.DB_PATH = Path(self._tempdir.name) / "test.sqlite3"
+        db.init_db()
+        db.upsert_track(track_id="track-1", filepath="track-1.mp3", title="Track One")
+        self.app = create_app()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def test_records_route_latency_sql_template_and_size(self):
+        self.assertEqual(self.client.get("/").status_code, 200)
+        self.assertEqual(self.client.get("/api/tracks/track-1").status_code, 200)
+        self.assertEqual(self.client.get("/api/tracks/missing").status_code, 404)
+
+        response = self.client.get("/api/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        body = response.get_data(as_text=True)
+
+        self.assertEqual(
+            _sample_value(
+                body,
+                "dekho_http_request_duration_seconds_count",
+                '{route="/",method="GET",status="200"}',
+            ),
+            1,
+        )
+        self.assertEqual(
+            _sample_value(
+                body,
+                "dekho_http_request_duration_seconds_count",
+                '{route="/api/tracks/<track_id>",method="GET",status="404"}',
+            ),
+            1,
+        )
+        self.assertEqual(
+            _sample_value(
+                body,
+                "dekho_http_request_duration_seconds_bucket",
+                '{route="/",method="GET",status="200",le="+Inf"}',
+            ),
+            1,
+        )
+        self.assertGreater(
+            _sample_value(body, "dekho_http_request_sql_statements_sum", '{route="/"}'), 0
+        )
+        self.assertGreater(
+            _sample_value(body, "dekho_http_request_sql_duration_seconds_sum", '{route="/"}'),
+            0,
+        )
+        self.assertGreater(
+            _sample_value(body, "dekho_http_response_size_bytes_sum", '{route="/"}'), 0
+        )
+        self.assertEqual(
+            _sample_value(
+                body, "dekho_template_render_duration_seconds_count", '{template="index.html"}'
+            ),
+            1,
+        )
+
+    def test_metrics_can_be_disabled(self):
+        with patch.dict(os.environ, {"FLASK_METRICS_ENABLED": "false"}):
+            client = create_app().test_client()
+        self.assertEqual(client.get("/api/metrics").status_code, 404)
+
+
+class StatementObserverTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._tempdir = tempfile.TemporaryDirectory()
+        db.DB_PATH = Path(self._tempdir.name) / "test.sqlite3"
+        db.init_db()
+        self.statements: list[tuple[str, float]] = []
+        db.add_statement_observer(self._observe)
+
+    def tearDown(self):
+        db.remove_statement_observer(self._observe)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def _observe(self, sql: str, parameters: object, elapsed: float) -> None:
+        self.statements.append((" ".join(sql.split()), elapsed))
+
+    def test_reports_each_statement_once_after_rows_are_fetched(self):
+        with db.get_connection() as connection:
+            self.statements.clear()
+            rows = connection.execute("SELECT key FROM label_definitions").fetchall()
+            connection.execute("SELECT 1").fetchone()
+            connection.executemany(
+                "UPDATE label_definitions SET label = label WHERE id = ?", [(1,), (2,)]
+            )
+
+        self.assertTrue(rows)
+        self.assertEqual(
+            [sql for sql, _elapsed in self.statements],
+            [
+                "SELECT key FROM label_definitions",
+                "SELECT 1",
+                "UPDATE label_definitions SET label = label WHERE id = ?",
+            ],
+        )
+        self.assertTrue(all(elapsed >= 0 for _sql, elapsed in self.statements))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import dekho.db as db
+from dekho.page_cache import PAGE_CACHE_ROOT, load_cached_page, store_page
+
+URL = "https://suno.com/song/track-1"
+PAGE = '<html><script>self.__next_f.push([1,"0:[{\\"tags\\":\\"rock\\"}]"])</script></html>'
+
+
+class PageCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        os.chdir(self._tempdir.name)
+        db.DB_PATH = Path(self._tempdir.name) / "test.sqlite3"
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def test_pages_are_stored_compressed_by_content_hash(self):
+        content_hash = store_page(URL, PAGE * 50)
+        store_page("https://suno.com/song/track-2", PAGE * 50)
+
+        [blob] = PAGE_CACHE_ROOT.rglob("*.html.gz")
+        self.assertEqual(blob.name, f"{content_hash}.html.gz")
+        self.assertLess(blob.stat().st_size, len(PAGE * 50) // 10)
+        self.assertEqual(load_cached_page(URL, max_age_seconds=60), PAGE * 50)
+        self.assertEqual(db.get_remote_page_cache_entry(URL)["size"], len(PAGE * 50))
+
+    def test_expired_entries_miss_unless_any_age_is_accepted(self):
+        store_page(URL, PAGE)
+        week_later = datetime.now(UTC) + timedelta(days=7, seconds=1)
+        with mock.patch("dekho.page_cache.datetime") as fake_datetime:
+            fake_datetime.now.return_value = week_later
+            fake_datetime.fromisoformat = datetime.fromisoformat
+            self.assertIsNone(load_cached_page(URL, max_age_seconds=7 * 24 * 3600))
+            self.assertEqual(load_cached_page(URL, max_age_seconds=None), PAGE)
+
+    def test_replaced_pages_delete_unreferenced_blobs(self):
+        store_page(URL, PAGE)
+        store_page("https://suno.com/song/track-2", PAGE)
+        store_page(URL, PAGE + "<!-- changed -->")
+        self.assertEqual(len(list(PAGE_CACHE_ROOT.rglob("*.html.gz"))), 2)
+
+        store_page("https://suno.com/song/track-2", PAGE + "<!-- changed -->")
+        self.assertEqual(len(list(PAGE_CACHE_ROOT.rglob("*.html.gz"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
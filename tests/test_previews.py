@@ -0,0 +1,120 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import dekho.db as db
+import dekho.previews as previews
+from dekho.app import create_app
+
+
+class PreviewTranscoderTests(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        self.source = self.root / "source.mp3"
+        self.source.write_bytes(b"original audio")
+        self.transcoder = previews.PreviewTranscoder(previews_root=self.root / "previews")
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+    def tearDown(self):
+        self.transcoder.shutdown()
+        self._tempdir.cleanup()
+
+    def _fake_transcode(self, source_path: Path, output_path: Path) -> Path:
+        with self._calls_lock:
+            self.calls += 1
+        time.sleep(0.05)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(b"preview audio")
+        return output_path
+
+    def test_concurrent_requests_share_one_transcode(self):
+        results: list[Path] = []
+        with patch.object(previews, "transcode_preview", side_effect=self._fake_transcode):
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(
+                        self.transcoder.get_preview("track-1", self.source)
+                    )
+                )
+                for _ in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(results[0], self.root / "previews" / "t" / "track-1.mp3")
+
+    def test_fresh_preview_is_reused_and_stale_preview_is_rebuilt(self):
+        with patch.object(previews, "transcode_preview", side_effect=self._fake_transcode):
+            first = self.transcoder.get_preview("track-1", self.source)
+            second = self.transcoder.get_preview("track-1", self.source)
+            self.assertEqual(first, second)
+            self.assertEqual(self.calls, 1)
+
+            newer = first.stat().st_mtime_ns + 1_000_000_000
+            os.utime(self.source, ns=(newer, newer))
+            self.transcoder.get_preview("track-1", self.source)
+            self.assertEqual(self.calls, 2)
+
+
+class PreviewAudioRouteTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        os.chdir(self.root)
+        db.DB_PATH = self.root / "test.sqlite3"
+        db.init_db()
+        (self.root / "music").mkdir()
+        (self.root / "music" / "track-1.mp3").write_bytes(b"original audio")
+        db.upsert_track(track_id="track-1", filepath="track-1.mp3", title="Track One")
+        self.client = create_app().test_client()
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def test_preview_quality_serves_transcoded_file(self):
+        def fake_transcode(source_path: Path, output_path: Path) -> Path:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_bytes(b"preview audio")
+            return output_path
+
+        with patch.object(previews, "transcode_preview", side_effect=fake_transcode):
+            response = self.client.get("/api/tracks/track-1/audio?quality=preview")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(), b"preview audio")
+        response.close()
+
+        original = self.client.get("/api/tracks/track-1/audio")
+        self.assertEqual(original.get_data(), b"original audio")
+        original.close()
+
+    def test_preview_falls_back_to_original_when_ffmpeg_is_missing(self):
+        with patch.object(
+            previews, "transcode_preview", side_effect=FileNotFoundError("ffmpeg")
+        ):
+            response = self.client.get("/api/tracks/track-1/audio?quality=preview")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(), b"original audio")
+        response.close()
+
+    def test_unknown_quality_is_rejected(self):
+        response = self.client.get("/api/tracks/track-1/audio?quality=lossless")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
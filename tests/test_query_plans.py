@@ -0,0 +1,104 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import dekho.db as db
+from benchmark_queries import (
+    SYNTHETIC_TRACK_COUNT,
+    build_query_calls,
+    capture_statements,
+    explain_query_plan,
+    find_plan_problems,
+    seed_synthetic_db,
+)
+
+
+class QueryPlanRegressionTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._original_db_path = db.DB_PATH
+        cls._tempdir = tempfile.TemporaryDirectory()
+        cls.db_path = Path(cls._tempdir.name) / "synthetic.sqlite3"
+        cls.track_ids = seed_synthetic_db(cls.db_path, SYNTHETIC_TRACK_COUNT)
+        db.DB_PATH = cls.db_path
+        cls.calls = {call.name: call for call in build_query_calls(cls.track_ids[0])}
+
+    @classmethod
+    def tearDownClass(cls):
+        db.DB_PATH = cls._original_db_path
+        cls._tempdir.cleanup()
+
+    def _plans(self, call_name: str) -> list[str]:
+        statements = capture_statements(self.calls[call_name])
+        return [detail for statement in statements for detail in statement.plan]
+
+    def test_hot_queries_avoid_large_scans_and_unindexed_sorts(self):
+        for call in self.calls.values():
+            with self.subTest(call=call.name):
+                statements = capture_statements(call)
+                problems = [
+                    problem
+                    for statement in statements
+                    for problem in find_plan_problems(call, statement)
+                ]
+                self.assertEqual(problems, [])
+
+    def test_track_list_reads_in_index_order(self):
+        plans = self._plans("get_all_tracks_file_data")
+        self.assertIn("SCAN tfd USING INDEX idx_tracks_file_data_date_created_filepath", plans)
+        self.assertIn("SCAN ld USING INDEX idx_label_definitions_category_label", plans)
+
+    def test_label_lookups_use_label_id_index(self):
+        for call_name in ("get_unknown_label_assignments", "export_auxio.fetch_playlist_export_data"):
+            with self.subTest(call=call_name):
+                self.assertTrue(
+                    any(
+                        "idx_track_user_data_labels_label_id_track_id (label_id=?)" in detail
+                        for detail in self._plans(call_name)
+                    )
+                )
+
+    def test_export_filters_search_their_indexes(self):
+        self.assertIn(
+            "SEARCH tracks_file_data USING INDEX idx_tracks_file_data_change_seq (change_seq>?)",
+            self._plans("export_db.delta:tracks_file_data"),
+        )
+        self.assertIn(
+            "SEARCH row_changes USING INTEGER PRIMARY KEY (rowid>?)",
+            self._plans("export_db.delta:row_changes"),
+        )
+        self.assertIn(
+            "SEARCH track_events USING INDEX idx_track_events_created_at (created_at>?)",
+            self._plans("export_db.since:track_events"),
+        )
+        self.assertIn(
+            "SEARCH tracks_file_data USING INDEX idx_tracks_file_data_updated_at (updated_at>?)",
+            self._plans("export_db.since:tracks_file_data"),
+        )
+
+    def test_checker_reports_dropped_index(self):
+        call = self.calls["get_all_tracks_file_data"]
+        statements = capture_statements(call)
+        connection = sqlite3.connect(self.db_path)
+        try:
+            connection.execute("DROP INDEX idx_tracks_file_data_date_created_filepath")
+            for statement in statements:
+                statement.plan = explain_query_plan(
+                    connection, statement.sql, statement.parameters
+                )
+        finally:
+            connection.close()
+            db.init_db()
+
+        problems = [
+            problem for statement in statements for problem in find_plan_problems(call, statement)
+        ]
+        self.assertIn(
+            "get_all_tracks_file_data: sort without an index: USE TEMP B-TREE FOR ORDER BY",
+            problems,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
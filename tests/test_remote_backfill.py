@@ -0,0 +1,190 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import dekho.db as db
+from dekho.remote_backfill import (
+    HostRateLimiter,
+    backfill_remote_data,
+    reparse_cached_remote_data,
+)
+
+
+def _flight_html(track_id: str) -> bytes:
+    metadata = {"prompt": f"[Verse]\nSong {track_id}", "tags": "rock", "model_name": "chirp"}
+    chunk = "0:" + json.dumps([{"metadata": metadata}])
+    script = f"<script>self.__next_f.push([1,{json.dumps(chunk)}])</script>"
+    return f"<html><body>{script}</body></html>".encode()
+
+
+class FakeSunoServer:
+    """Serves `/song/<id>` pages; IDs listed in `failures` get those statuses first."""
+
+    def __init__(self, failures: dict[str, list[int]] | None = None) -> None:
+        self.failures = {track_id: list(codes) for track_id, codes in (failures or {}).items()}
+        self.requests: list[str] = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                track_id = self.path.rsplit("/", 1)[-1]
+                with server.lock:
+                    server.requests.append(track_id)
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                    pending = server.failures.get(track_id)
+                    status = pending.pop(0) if pending else 200
+                try:
+                    body = _flight_html(track_id) if status == 200 else b"error"
+                    self.send_response(status)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class RemoteBackfillTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        os.chdir(self._tempdir.name)
+        db.DB_PATH = Path(self._tempdir.name) / "test.sqlite3"
+        db.init_db()
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def _add_tracks(self, base_url: str, count: int) -> list[str]:
+        track_ids = [f"track-{index}" for index in range(count)]
+        for track_id in track_ids:
+            db.upsert_track(
+                track_id=track_id, filepath=f"{track_id}.mp3", url=f"{base_url}/song/{track_id}"
+            )
+        return track_ids
+
+    def test_fetches_missing_tracks_concurrently_and_writes_in_batches(self):
+        with FakeSunoServer() as server:
+            track_ids = self._add_tracks(server.base_url, 7)
+            db.upsert_track(track_id="no-url", filepath="no-url.mp3")
+            db.upsert_track_remote_data(track_ids[0], "kept", None, None, False, None, None, None)
+
+            batch_sizes: list[int] = []
+            upsert = db.upsert_tracks_remote_data
+            with mock.patch(
+                "dekho.remote_backfill.upsert_tracks_remote_data",
+                side_effect=lambda rows: (batch_sizes.append(len(rows)), upsert(rows)),
+            ):
+                summary = backfill_remote_data(
+                    concurrency=3, requests_per_second=0, batch_size=4
+                )
+
+        self.assertEqual((summary.total, summary.stored, summary.failed), (6, 6, {}))
+        self.assertEqual(sorted(server.requests), track_ids[1:])
+        self.assertLessEqual(server.max_active, 3)
+        self.assertEqual(batch_sizes, [4, 2])
+        self.assertEqual(db.get_track_remote_data(track_ids[0])["prompt"], "kept")
+        remote = db.get_track_remote_data("track-3")
+        self.assertEqual(
+            (remote["prompt"], remote["tags"], remote["model_name"]),
+            ("[Verse]\nSong track-3", "rock", "chirp"),
+        )
+        self.assertEqual(db.get_tracks_missing_remote_data(), [])
+        events = db.get_track_events_after(0, 100)
+        self.assertEqual(sorted(event["track_id"] for event in events), track_ids[1:])
+
+    def test_retries_transient_errors_and_reports_permanent_ones(self):
+        delays: list[float] = []
+        failures = {"track-0": [503, 429], "track-1": [404], "track-2": [503] * 5}
+        with FakeSunoServer(failures) as server:
+            self._add_tracks(server.base_url, 3)
+            summary = backfill_remote_data(
+                concurrency=2, requests_per_second=0, max_attempts=3, sleep=delays.append
+            )
+
+        self.assertEqual(summary.stored, 1)
+        self.assertEqual(sorted(summary.failed), ["track-1", "track-2"])
+        self.assertIn("404", summary.failed["track-1"])
+        self.assertEqual(server.requests.count("track-0"), 3)
+        self.assertEqual(server.requests.count("track-1"), 1)
+        self.assertEqual(server.requests.count("track-2"), 3)
+        self.assertEqual(sorted(delays), [1.0, 1.0, 2.0, 2.0])
+        # Failed tracks wait for their backoff, then the next backfill retries them.
+        self.assertEqual(db.get_tracks_missing_remote_data(), [])
+        failed = db.get_track_remote_data("track-2")
+        self.assertEqual((failed["status"], failed["attempts"]), (db.REMOTE_STATUS_ERROR, 1))
+        self.assertIn("503", failed["last_error"])
+        self.assertEqual(
+            sorted(track["track_id"] for track in db.get_tracks_missing_remote_data(now="9999")),
+            ["track-1", "track-2"],
+        )
+
+    def test_interrupted_run_resumes_with_remaining_tracks(self):
+        with FakeSunoServer() as server:
+            self._add_tracks(server.base_url, 5)
+            first = backfill_remote_data(concurrency=1, requests_per_second=0, limit=2)
+            second = backfill_remote_data(concurrency=2, requests_per_second=0)
+
+        self.assertEqual((first.stored, second.total, second.stored), (2, 3, 3))
+        self.assertEqual(sorted(server.requests), [f"track-{index}" for index in range(5)])
+
+    def test_reparse_re_extracts_cached_pages_without_network(self):
+        with FakeSunoServer() as server:
+            self._add_tracks(server.base_url, 3)
+            backfill_remote_data(concurrency=2, requests_per_second=0)
+        db.upsert_track(track_id="uncached", filepath="uncached.mp3", url="https://suno.com/song/x")
+        db.upsert_track_remote_data("track-1", "stale", None, None, False, None, None, None)
+
+        with mock.patch(
+            "dekho.remote_metadata.http_get", side_effect=AssertionError("network")
+        ) as http_get:
+            summary = reparse_cached_remote_data(batch_size=2)
+
+        http_get.assert_not_called()
+
+        self.assertEqual((summary.total, summary.stored, summary.failed), (3, 3, {}))
+        self.assertEqual(db.get_track_remote_data("track-1")["prompt"], "[Verse]\nSong track-1")
+        self.assertIsNone(db.get_track_remote_data("uncached"))
+
+    def test_rate_limiter_spaces_requests_per_host(self):
+        now = [0.0]
+        waits: list[float] = []
+        limiter = HostRateLimiter(2.0, clock=lambda: now[0], sleep=waits.append)
+
+        for _ in range(3):
+            limiter.wait("https://suno.com/song/a")
+        limiter.wait("https://other.example/song/b")
+
+        self.assertEqual(waits, [0.5, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
+import gzip
 import json
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
 import dekho.remote_metadata as rm
+from benchmark_remote_parse import MODES as PARSE_MODES
+from tests.helpers import build_synthetic_page
 
 
 class FetchSunoTrackMetadataTests(unittest.TestCase):
@@ -110,6 +113,72 @@ class FetchSunoTrackMetadataTests(unittest.TestCase):
                         )
 
 
+def _push_script(chunk: str) -> str:
+    return f"<script>self.__next_f.push([1,{json.dumps(chunk)}])</script>"
+
+
+COMPLETE_CLIP_CHUNK = "0:" + json.dumps(
+    [
+        {
+            "prompt": "$3e",
+            "tags": "folk",
+            "negative_tags": "metal",
+            "cover_clip_id": None,
+            "persona": {"name": "Ada"},
+            "major_model_version": "v4",
+            "model_name": "chirp",
+        }
+    ]
+)
+LYRICS = "[Verse]\nDown by the harbor lights\nWe sang until the dawn\n[Chorus]\nHold on"
+
+
+class FlightPageParserTests(unittest.TestCase):
+    def test_chunked_input_matches_whole_page(self):
+        chunks = [
+            '1:["$","div",null,{"className":"layout"}]',
+            '0:[{"metadata":{"prompt":"$3e","tags":"acoustic"},"model_name":"chirp"}]',
+            "3e:T50,",
+            "[Verse]\nLine one of the verse\nLine two of the verse\n[Chorus]\nSing",
+            "[Verse]\nA longer stray lyric block that only the fallback would ever see\n"
+            "Second line here\nThird line here\n[Chorus]\nEnd",
+        ]
+        html = "<html>" + "".join(_push_script(chunk) for chunk in chunks) + "</html>"
+        expected = rm.parse_suno_track_html(html)
+
+        for size in (1, 7, 64, 1000):
+            with self.subTest(size=size):
+                pieces = [html[index : index + size] for index in range(0, len(html), size)]
+                self.assertEqual(rm.parse_suno_track_chunks(pieces), expected)
+
+    def test_stops_reading_once_result_is_final(self):
+        def pages():
+            yield _push_script(COMPLETE_CLIP_CHUNK) + _push_script("3e:T40," + LYRICS)
+            raise AssertionError("read past the complete result")
+
+        result = rm.parse_suno_track_chunks(pages())
+
+        self.assertEqual(result["prompt"], LYRICS)
+        self.assertEqual(result["persona_name"], "Ada")
+        self.assertEqual(result["model_name"], "chirp")
+
+    def test_keeps_reading_while_prompt_is_unresolved(self):
+        parser = rm.FlightPageParser()
+        parser.feed(_push_script(COMPLETE_CLIP_CHUNK))
+        self.assertFalse(parser.done)
+
+        parser.feed(_push_script("3e:T40,"))
+        parser.feed(_push_script(LYRICS))
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.result()["prompt"], LYRICS)
+
+    def test_benchmark_modes_agree_on_synthetic_page(self):
+        compressed = gzip.compress(build_synthetic_page(ui_chunks=40).encode())
+        results = [parse(compressed) for parse in PARSE_MODES.values()]
+        self.assertEqual(results[0]["persona_name"], "Ada")
+        self.assertTrue(all(result == results[0] for result in results))
+
+
 class ResolvePromptReferenceTests(unittest.TestCase):
     def test_resolves_existing_ref(self):
         self.assertEqual(
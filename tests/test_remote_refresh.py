@@ -0,0 +1,202 @@
+import os
+import tempfile
+import unittest
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from urllib.error import HTTPError
+
+import dekho.db as db
+from dekho.app import create_app
+from dekho.db_schema import next_attempt_at_sql
+from dekho.remote_refresh import (
+    REFRESH_LEASE_NAME,
+    RemoteRefreshJob,
+    refresh_remote_data,
+    retry_backoff_seconds,
+    select_due_tracks,
+)
+
+
+def _metadata(url: str) -> dict[str, object]:
+    return {"prompt": f"[Verse]\n{url.rsplit('/', 1)[-1]}", "tags": "rock"}
+
+
+class RemoteRefreshTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        os.chdir(self._tempdir.name)
+        db.DB_PATH = Path(self._tempdir.name) / "test.sqlite3"
+        db.init_db()
+        self.now = datetime.now(UTC)
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def _add_track(self, track_id: str, fetched_days_ago: float | None, prompt="lyrics") -> None:
+        db.upsert_track(
+            track_id=track_id, filepath=f"{track_id}.mp3", url=f"https://suno.com/song/{track_id}"
+        )
+        fetched_at = (
+            None
+            if fetched_days_ago is None
+            else (self.now - timedelta(days=fetched_days_ago)).isoformat()
+        )
+        db.upsert_tracks_remote_data(
+            [{"track_id": track_id, "prompt": prompt, "fetched_at": fetched_at}]
+        )
+        if fetched_at is None:
+            with db.get_connection() as connection:
+                connection.execute(
+                    "UPDATE track_remote_data SET fetched_at = NULL WHERE track_id = ?",
+                    (track_id,),
+                )
+            self._reschedule(track_id)
+
+    def _reschedule(self, track_id: str) -> None:
+        with db.get_connection() as connection:
+            connection.execute(
+                "UPDATE track_remote_data SET next_attempt_at = "
+                + next_attempt_at_sql("fetched_at", "status", "attempts")
+                + " WHERE track_id = ?",
+                (track_id,),
+            )
+
+    def _fail(self, track_id: str, attempts: int, hours_ago: float) -> None:
+        with db.get_connection() as connection:
+            connection.execute(
+                """
+                UPDATE track_remote_data
+                SET status = 'error', attempts = ?, fetched_at = ?
+                WHERE track_id = ?
+                """,
+                (attempts, (self.now - timedelta(hours=hours_ago)).isoformat(), track_id),
+            )
+        self._reschedule(track_id)
+
+    def test_selects_stale_unknown_and_backed_off_failed_rows_within_budget(self):
+        self._add_track("fresh", 1)
+        self._add_track("stale", 40)
+        self._add_track("unknown", None)
+        self._add_track("failed-waiting", 1)
+        self._fail("failed-waiting", attempts=3, hours_ago=3)
+        self._add_track("failed-due", 1)
+        self._fail("failed-due", attempts=3, hours_ago=5)
+        self._add_track("no-lyrics", 40, prompt="failed")
+
+        # Most overdue first: never fetched, then by `next_attempt_at`.
+        due = [track["track_id"] for track in select_due_tracks(10, now=self.now)]
+        self.assertEqual(due, ["unknown", "no-lyrics", "stale", "failed-due"])
+        self.assertEqual(
+            [track["track_id"] for track in select_due_tracks(2, now=self.now)],
+            ["unknown", "no-lyrics"],
+        )
+
+    def test_backoff_doubles_per_failure_and_is_capped(self):
+        self.assertEqual([retry_backoff_seconds(n) for n in (1, 2, 3)], [3600, 7200, 14400])
+        self.assertEqual(retry_backoff_seconds(50), 30 * 24 * 3600)
+
+    def test_refresh_keeps_data_on_failure_and_resets_attempts_on_success(self):
+        self._add_track("ok", 40)
+        self._add_track("broken", 40)
+        requested: list[str] = []
+
+        def fetch(url: str) -> dict[str, object]:
+            requested.append(url)
+            if url.endswith("broken"):
+                raise HTTPError(url, 503, "Unavailable", None, None)
+            return _metadata(url)
+
+        summary = refresh_remote_data(budget=5, requests_per_second=0, fetch=fetch)
+
+        self.assertEqual((summary.total, summary.stored, list(summary.failed)), (2, 1, ["broken"]))
+        self.assertEqual(len(requested), 2)
+        broken = db.get_track_remote_data("broken")
+        self.assertEqual(
+            (broken["prompt"], broken["status"], broken["attempts"]),
+            ("lyrics", db.REMOTE_STATUS_ERROR, 1),
+        )
+        self.assertIn("503", broken["last_error"])
+        retry_at = datetime.fromisoformat(broken["fetched_at"]) + timedelta(
+            seconds=retry_backoff_seconds(1)
+        )
+        self.assertAlmostEqual(
+            datetime.fromisoformat(broken["next_attempt_at"]),
+            retry_at,
+            delta=timedelta(milliseconds=1),
+        )
+        refreshed = db.get_track_remote_data("ok")
+        self.assertEqual((refreshed["prompt"], refreshed["status"]), ("[Verse]\nok", "ok"))
+        self.assertGreater(refreshed["fetched_at"], (self.now - timedelta(minutes=1)).isoformat())
+
+        # The failed row now waits an hour; nothing else is due.
+        self.assertEqual(refresh_remote_data(budget=5, fetch=fetch).total, 0)
+
+        self._fail("broken", attempts=1, hours_ago=2)
+        refresh_remote_data(budget=5, requests_per_second=0, fetch=_metadata)
+        recovered = db.get_track_remote_data("broken")
+        self.assertEqual((recovered["status"], recovered["attempts"]), ("ok", 0))
+        self.assertIsNone(recovered["last_error"])
+
+    def test_legacy_failed_prompts_migrate_to_prompt_failed_status(self):
+        self._add_track("legacy", 1, prompt="failed")
+        with db.get_connection() as connection:
+            # Databases from before these columns also predate the change triggers.
+            for (trigger,) in connection.execute(
+                "SELECT name FROM sqlite_master WHERE name LIKE 'cdc_track_remote_data_%'"
+            ).fetchall():
+                connection.execute(f"DROP TRIGGER {trigger}")
+            connection.execute("DROP INDEX idx_track_remote_data_next_attempt_at")
+            for column in ("status", "fetched_at", "attempts", "last_error", "next_attempt_at"):
+                connection.execute(f"ALTER TABLE track_remote_data DROP COLUMN {column}")
+        db.init_db()
+
+        remote = db.get_track_remote_data("legacy")
+        self.assertEqual(
+            (remote["status"], remote["fetched_at"], remote["next_attempt_at"]),
+            ("prompt_failed", None, ""),
+        )
+        self.assertEqual(select_due_tracks(10)[0]["track_id"], "legacy")
+
+    def test_lease_lets_only_one_worker_refresh(self):
+        runs: list[int] = []
+        job = RemoteRefreshJob(60, budget=7, refresh=lambda budget: runs.append(budget))
+
+        self.assertTrue(db.try_acquire_job_lease(REFRESH_LEASE_NAME, "other:1", 60))
+        self.assertIsNone(job.run_once())
+        self.assertEqual(runs, [])
+
+        with db.get_connection() as connection:
+            connection.execute(
+                "UPDATE job_leases SET expires_at = ?",
+                ((self.now - timedelta(seconds=1)).isoformat(),),
+            )
+        job.run_once()
+        job.run_once()
+        self.assertEqual(runs, [7, 7])
+        self.assertFalse(db.try_acquire_job_lease(REFRESH_LEASE_NAME, "other:1", 60))
+
+    def test_failed_runs_are_logged_and_the_schedule_continues(self):
+        def refresh(budget: int) -> None:
+            job.stop()
+            raise RuntimeError("database is locked")
+
+        job = RemoteRefreshJob(0, refresh=refresh)
+        with self.assertLogs("dekho.remote_refresh", level="ERROR") as logs:
+            job._run()
+        self.assertIn("database is locked", "\n".join(logs.output))
+
+    def test_background_job_is_off_by_default(self):
+        app = create_app()
+        self.assertEqual(app.config["REMOTE_REFRESH_INTERVAL_SECONDS"], 0)
+        self.assertNotIn(
+            "_start_remote_refresh",
+            [func.__name__ for func in app.before_request_funcs.get(None, [])],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,19 +3,23 @@ import unittest
 from pathlib import Path
 
 import dekho.db as db
+import dekho.sprites as sprites
 from dekho.scan import run_scan
 
 
 class ScanEdgeCaseTests(unittest.TestCase):
     def setUp(self):
         self._original_db_path = db.DB_PATH
+        self._original_sprites_root = sprites.SPRITES_ROOT
         self._tempdir = tempfile.TemporaryDirectory()
         self.root = Path(self._tempdir.name)
         db.DB_PATH = self.root / "test.sqlite3"
+        sprites.SPRITES_ROOT = self.root / "sprites"
         db.init_db()
 
     def tearDown(self):
         db.DB_PATH = self._original_db_path
+        sprites.SPRITES_ROOT = self._original_sprites_root
         self._tempdir.cleanup()
 
     def test_run_scan_reports_db_rows_missing_from_music_folder(self):
@@ -36,6 +40,7 @@ class ScanEdgeCaseTests(unittest.TestCase):
         self.assertEqual(warning["track_id"], "missing-track")
         self.assertEqual(warning["missing_identifier"], "yes")
         self.assertEqual(warning["missing_path"], "yes")
+        self.assertTrue((self.root / "sprites" / "covers.json").exists())
 
 
 if __name__ == "__main__":
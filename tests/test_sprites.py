@@ -0,0 +1,175 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+import dekho.db as db
+import dekho.sprites as sprites
+from dekho.app import create_app
+from dekho.sprites import (
+    SPRITE_COLUMNS,
+    SPRITE_ROWS,
+    SPRITE_TILE_SIZE,
+    build_cover_sprites,
+    get_cover_sprite_tile,
+    load_cover_sprite_manifest,
+)
+
+
+def _write_cover(images_root: Path, track_id: str, color: tuple[int, int, int]) -> None:
+    cover_path = images_root / track_id[0] / f"{track_id}.jpg"
+    cover_path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (300, 200), color).save(cover_path, "JPEG")
+
+
+class CoverSpriteBuilderTests(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        self.images_root = self.root / "images"
+        self.output_root = self.root / "sprites"
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_packs_covers_and_maps_missing_covers_to_placeholder(self):
+        _write_cover(self.images_root, "a-track", (255, 0, 0))
+        _write_cover(self.images_root, "b-track", (0, 0, 255))
+
+        manifest = build_cover_sprites(
+            ["a-track", "no-cover", "b-track"], self.images_root, self.output_root
+        )
+
+        self.assertEqual(len(manifest["sheets"]), 1)
+        self.assertEqual(manifest["tracks"], {"a-track": [0, 1], "b-track": [0, 2]})
+        self.assertEqual(get_cover_sprite_tile(manifest, "no-cover"), [0, 0, 0])
+        self.assertEqual(get_cover_sprite_tile(manifest, "b-track"), [0, 2, 0])
+
+        with Image.open(self.output_root / manifest["sheets"][0]) as sheet:
+            self.assertEqual(
+                sheet.size,
+                (SPRITE_COLUMNS * SPRITE_TILE_SIZE, SPRITE_ROWS * SPRITE_TILE_SIZE),
+            )
+            red, green, blue = sheet.getpixel((SPRITE_TILE_SIZE + 32, 32))
+            self.assertGreater(red, 200)
+            self.assertLess(blue, 60)
+
+        on_disk = json.loads((self.output_root / "covers.json").read_text())
+        self.assertEqual(on_disk["sheets"], manifest["sheets"])
+
+    def test_unchanged_covers_skip_rebuild_and_changes_replace_sheets(self):
+        _write_cover(self.images_root, "a-track", (255, 0, 0))
+        first = build_cover_sprites(["a-track"], self.images_root, self.output_root)
+        sheet_path = self.output_root / first["sheets"][0]
+        sheet_mtime = sheet_path.stat().st_mtime_ns
+
+        second = build_cover_sprites(["a-track"], self.images_root, self.output_root)
+        self.assertEqual(second["sheets"], first["sheets"])
+        self.assertEqual(sheet_path.stat().st_mtime_ns, sheet_mtime)
+
+        _write_cover(self.images_root, "a-track", (0, 255, 0))
+        third = build_cover_sprites(["a-track"], self.images_root, self.output_root)
+        self.assertNotEqual(third["sheets"], first["sheets"])
+        self.assertFalse(sheet_path.exists())
+
+    def test_spills_into_additional_sheets(self):
+        track_ids = [f"t{index:04d}" for index in range(SPRITE_COLUMNS * SPRITE_ROWS + 3)]
+        for track_id in track_ids:
+            _write_cover(self.images_root, track_id, (10, 20, 30))
+
+        manifest = build_cover_sprites(track_ids, self.images_root, self.output_root)
+
+        self.assertEqual(len(manifest["sheets"]), 2)
+        self.assertEqual(manifest["tracks"][track_ids[-1]], [1, 3])
+
+    def test_new_and_removed_covers_only_rewrite_their_sheet(self):
+        with mock.patch.multiple(sprites, SPRITE_COLUMNS=2, SPRITE_ROWS=2):
+            track_ids = [f"t{index}" for index in range(6)]
+            for track_id in track_ids:
+                _write_cover(self.images_root, track_id, (10, 20, 30))
+            first = build_cover_sprites(track_ids, self.images_root, self.output_root)
+            self.assertEqual(len(first["sheets"]), 2)
+            first_sheet = self.output_root / first["sheets"][0]
+            sheet_mtime = first_sheet.stat().st_mtime_ns
+
+            # A new track sorting first in the sidebar lands in the last sheet.
+            _write_cover(self.images_root, "a-new", (200, 0, 0))
+            second = build_cover_sprites(
+                ["a-new", *track_ids], self.images_root, self.output_root
+            )
+            self.assertEqual(second["sheets"][0], first["sheets"][0])
+            self.assertEqual(first_sheet.stat().st_mtime_ns, sheet_mtime)
+            self.assertEqual(second["tracks"]["a-new"], [1, 3])
+            self.assertEqual(
+                {track_id: second["tracks"][track_id] for track_id in track_ids},
+                first["tracks"],
+            )
+
+            # A removed track frees its tile for the next new cover.
+            _write_cover(self.images_root, "b-new", (0, 200, 0))
+            third = build_cover_sprites(
+                ["a-new", "b-new", *track_ids[1:]], self.images_root, self.output_root
+            )
+            self.assertEqual(third["tracks"]["b-new"], first["tracks"]["t0"])
+            self.assertNotEqual(third["sheets"][0], first["sheets"][0])
+            self.assertEqual(third["sheets"][1], second["sheets"][1])
+
+
+class CoverSpriteRouteTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._original_cwd = Path.cwd()
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        os.chdir(self.root)
+        db.DB_PATH = self.root / "test.sqlite3"
+        db.init_db()
+        (self.root / "music").mkdir()
+        db.upsert_track(track_id="a-track", filepath="a.mp3", title="Track A")
+        db.upsert_track(track_id="b-track", filepath="b.mp3", title="Track B")
+        _write_cover(Path("images"), "a-track", (255, 0, 0))
+        self.manifest = build_cover_sprites(["a-track", "b-track"])
+        self.client = create_app().test_client()
+
+    def tearDown(self):
+        os.chdir(self._original_cwd)
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def test_sidebar_uses_sprite_tiles_instead_of_per_track_images(self):
+        html = self.client.get("/").get_data(as_text=True)
+
+        sheet_url = f"/api/sprites/{self.manifest['sheets'][0]}"
+        self.assertIn(f"--sprite-url: url('{sheet_url}'); --sprite-col: 1;", html)
+        self.assertIn("--sprite-col: 0; --sprite-row: 0;", html)
+        self.assertNotIn('src="/api/tracks/a-track/image"', html)
+        self.assertNotIn('src="/api/tracks/b-track/image"', html)
+
+    def test_virtual_bootstrap_carries_sprite_tiles(self):
+        html = self.client.get("/?list=virtual").get_data(as_text=True)
+        self.assertIn('"cover_sprite": [[0, 1, 0], [0, 0, 0]]', html)
+        self.assertIn('id="cover-sprites-data"', html)
+
+    def test_sheet_route_serves_immutable_sheets_and_rejects_unknown_names(self):
+        response = self.client.get(f"/api/sprites/{self.manifest['sheets'][0]}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "image/jpeg")
+        self.assertTrue(response.cache_control.immutable)
+        response.close()
+
+        self.assertEqual(self.client.get("/api/sprites/covers.json").status_code, 404)
+        self.assertEqual(self.client.get("/api/sprites/..%2Ftest.sqlite3").status_code, 404)
+
+    def test_sidebar_falls_back_to_images_without_manifest(self):
+        (Path("sprites") / "covers.json").unlink()
+        self.assertIsNone(load_cover_sprite_manifest())
+        html = self.client.get("/").get_data(as_text=True)
+        self.assertIn('src="/api/tracks/a-track/image"', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import dekho.db as db
+from dekho.sql_trace import disable_sql_trace, enable_sql_trace
+
+
+class SqlTraceTests(unittest.TestCase):
+    def setUp(self):
+        self._original_db_path = db.DB_PATH
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tempdir.name)
+        db.DB_PATH = self.root / "test.sqlite3"
+        db.init_db()
+        db.upsert_track(track_id="track-1", filepath="track-1.mp3", title="Track One")
+        self.log_path = self.root / "logs" / "slow_sql.log"
+
+    def tearDown(self):
+        disable_sql_trace()
+        db.DB_PATH = self._original_db_path
+        self._tempdir.cleanup()
+
+    def test_logs_statement_with_caller_and_query_plan(self):
+        enable_sql_trace(self.log_path, threshold_ms=0)
+        db.get_all_tracks_file_data()
+        disable_sql_trace()
+
+        log_text = self.log_path.read_text(encoding="utf-8")
+        self.assertIn("in dekho.db.get_all_tracks_file_data (from ", log_text)
+        self.assertIn("FROM tracks_file_data AS tfd", log_text)
+        self.assertIn("plan:", log_text)
+        self.assertIn("SCAN tfd USING INDEX idx_tracks_file_data_date_created_filepath", log_text)
+
+    def test_statements_below_threshold_are_not_logged(self):
+        enable_sql_trace(self.log_path, threshold_ms=60_000)
+        db.get_all_tracks_file_data()
+        disable_sql_trace()
+
+        self.assertEqual(self.log_path.read_text(encoding="utf-8"), "")
+
+    def test_disabled_trace_stops_logging(self):
+        enable_sql_trace(self.log_path, threshold_ms=0)
+        disable_sql_trace()
+        db.get_all_tracks_file_data()
+
+        self.assertEqual(self.log_path.read_text(encoding="utf-8"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import unittest
+
+from benchmark_startup import (
+    STARTUP_IMPORT_BUDGET_MS,
+    find_eager_lazy_modules,
+    measure_imports,
+    total_import_ms,
+)
+
+
+class StartupImportTests(unittest.TestCase):
+    def test_app_startup_does_not_import_scan_or_analysis_stacks(self):
+        timings = measure_imports("dekho.app")
+        self.assertEqual(find_eager_lazy_modules(timings), [])
+
+    def test_scan_import_defers_spectrogram_stack(self):
+        timings = measure_imports("dekho.scan")
+        self.assertEqual(
+            find_eager_lazy_modules(timings, ("dekho.spectrograms", "matplotlib", "numpy")),
+            [],
+        )
+
+    def test_cli_import_defers_remote_fetch_stack(self):
+        timings = measure_imports("dekho.cli")
+        self.assertEqual(
+            find_eager_lazy_modules(
+                timings, ("dekho.remote_backfill", "dekho.remote_metadata", "dekho.http_client")
+            ),
+            [],
+        )
+
+    # Wall-clock timing depends on the machine, so the budget is checked by
+    # `benchmark_startup.py --budget-ms`; this test runs only when opted in.
+    @unittest.skipUnless(
+        os.environ.get("DEKHO_STARTUP_BUDGET_TEST"), "set DEKHO_STARTUP_BUDGET_TEST=1 to run"
+    )
+    def test_app_startup_import_time_within_budget(self):
+        # Best of three keeps a busy machine from failing the guard.
+        best_ms = min(total_import_ms(measure_imports("dekho.app")) for _ in range(3))
+        self.assertLess(best_ms, STARTUP_IMPORT_BUDGET_MS)
+
+    def test_checker_reports_eagerly_imported_modules(self):
+        timings = measure_imports("dekho.spectrograms")
+        self.assertEqual(
+            find_eager_lazy_modules(timings, ("matplotlib", "numpy", "mutagen")),
+            ["matplotlib", "numpy"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()